@@ -1,149 +1,173 @@
-from flask import Flask, render_template, request, jsonify, send_file
-from datetime import datetime, timedelta
+from flask import Flask, render_template, request, jsonify, send_file, make_response
+from datetime import datetime, timedelta, timezone
 import sqlite3
 import pandas as pd
 import re
 import os
+import gzip
+import hashlib
 import io
 import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 import json
 
+try:
+    import brotli  # 선택 설치 (없으면 gzip만 사용)
+except ImportError:
+    brotli = None
+
+import database
+from database import get_db, reset_thread_db, get_data_version, bump_data_version
+from exporters import parse_export_columns, parse_export_format, export_store_key, stored_export_response
+
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 app.config['SECRET_KEY'] = 'voc-management-secret-key'
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
 
+# DB 연결 풀 (요청 종료 시 연결 반납)
+database.init_app(app)
+
 # 업로드 폴더 생성
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-def read_excel_with_drm(file_storage):
-    """DRM 우회 엑셀 읽기 함수"""
-    temp_file_path = None
-    last_error = None
+# 내보내기 파일 보관소 (같은 조건 + 같은 데이터 버전이면 만들어 둔 파일 재사용)
+EXPORT_STORE_FOLDER = os.path.join(app.config['UPLOAD_FOLDER'], 'exports')
+
+# ========== 엑셀 읽기 (형식 판별 + DRM 처리) ==========
+
+OLE2_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # .xls (BIFF) / DRM 컨테이너
+ZIP_SIGNATURE = b'PK\x03\x04'                          # .xlsx / .xlsb
+SNIFFED_EXCEL_ENGINES = {'xlsx': 'openpyxl', 'xls': 'xlrd', 'xlsb': 'pyxlsb'}
+
+# 읽기 경로별 성공/실패 횟수와 소요 시간 (/api/metrics/excel-read)
+_excel_read_metrics = {
+    'sniffed': {},
+    'succeeded': {},
+    'failed': {},
+    'succeeded_seconds': 0.0,
+    'failed_seconds': 0.0
+}
+_excel_read_metrics_lock = threading.Lock()
+
+def record_excel_read_metric(kind, name, elapsed=0.0):
+    """엑셀 읽기 지표 기록 (kind: sniffed / succeeded / failed)"""
+    with _excel_read_metrics_lock:
+        counts = _excel_read_metrics[kind]
+        counts[name] = counts.get(name, 0) + 1
+        if kind != 'sniffed':
+            _excel_read_metrics[f'{kind}_seconds'] += elapsed
+
+def sniff_excel_format(data):
+    """매직 바이트로 실제 파일 형식 판별 (xlsx / xlsb / xls / html / csv, 알 수 없으면 None)"""
+    if data.startswith(ZIP_SIGNATURE):
+        try:
+            names = zipfile.ZipFile(io.BytesIO(data)).namelist()
+        except zipfile.BadZipFile:
+            return None
+        if 'xl/workbook.bin' in names:
+            return 'xlsb'
+        if 'xl/workbook.xml' in names:
+            return 'xlsx'
+        return None
     
-    # 방법 1: 메모리 스트림 (openpyxl)
-    try:
-        file_storage.seek(0)
-        file_bytes = io.BytesIO(file_storage.read())
-        df = pd.read_excel(file_bytes, engine='openpyxl')
-        print("DRM 처리 성공: 메모리 스트림 (openpyxl)")
-        return df
-    except Exception as e:
-        last_error = f"openpyxl 메모리 스트림 실패: {str(e)}"
-        print(f"방법 1 실패: {last_error}")
+    if data.startswith(OLE2_SIGNATURE):
+        return 'xls'
     
-    # 방법 2: xlrd 엔진 (메모리 스트림)
-    try:
-        file_storage.seek(0)
-        file_bytes = io.BytesIO(file_storage.read())
-        df = pd.read_excel(file_bytes, engine='xlrd')
-        print("DRM 처리 성공: 메모리 스트림 (xlrd)")
-        return df
-    except Exception as e:
-        last_error = f"xlrd 메모리 스트림 실패: {str(e)}"
-        print(f"방법 2 실패: {last_error}")
+    # 웹 시스템에서 내려받은 .xls가 실제로는 HTML/CSV인 경우
+    head = data[:2048].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if head.startswith(b'<') and (b'<html' in head or b'<table' in head):
+        return 'html'
+    if b'\x00' not in head and (b',' in head or b'\t' in head):
+        for encoding in ('utf-8', 'cp949'):
+            try:
+                head.decode(encoding)
+                return 'csv'
+            except UnicodeDecodeError:
+                continue
+    return None
+
+def read_text_table(data, file_format):
+    """HTML/CSV 형식 파일 읽기"""
+    if file_format == 'html':
+        return pd.read_html(io.BytesIO(data))[0]
     
-    # 방법 3: pyxlsb 엔진 (메모리 스트림)
-    try:
-        file_storage.seek(0)
-        file_bytes = io.BytesIO(file_storage.read())
-        df = pd.read_excel(file_bytes, engine='pyxlsb')
-        print("DRM 처리 성공: 메모리 스트림 (pyxlsb)")
-        return df
-    except Exception as e:
-        last_error = f"pyxlsb 메모리 스트림 실패: {str(e)}"
-        print(f"방법 3 실패: {last_error}")
+    last_error = None
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            return pd.read_csv(io.BytesIO(data), sep=None, engine='python', encoding=encoding)
+        except UnicodeDecodeError as e:
+            last_error = e
+    raise last_error
+
+def read_excel_with_drm(file_storage):
+    """DRM 우회 엑셀 읽기 함수
+
+    업로드 바이트를 한 번만 읽고 매직 바이트로 판별한 형식의 엔진을 먼저 시도한다.
+    실패하면 나머지 엔진(메모리 스트림) → 임시 파일(엔진별) 순으로 시도한다.
+    임시 파일은 DRM 에이전트가 파일 경로로 열 때만 복호화하는 경우를 위한 것으로, 한 번만 저장한다.
+    """
+    file_storage.seek(0)
+    data = file_storage.read()
     
-    # 방법 4: 임시 파일 저장 (openpyxl)
-    temp_file_path = None
-    try:
-        file_storage.seek(0)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
-            temp_file_path = temp_file.name
-            file_storage.save(temp_file)
-        
-        df = pd.read_excel(temp_file_path, engine='openpyxl')
-        print("DRM 처리 성공: 임시 파일 (openpyxl)")
-        return df
-    except Exception as e:
-        last_error = f"임시 파일 openpyxl 실패: {str(e)}"
-        print(f"방법 4 실패: {last_error}")
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
+    file_format = sniff_excel_format(data)
+    record_excel_read_metric('sniffed', file_format or 'unknown')
+    print(f"파일 형식 판별: {file_format or '알 수 없음'}")
     
-    # 방법 5: 임시 파일 저장 (xlrd)
-    temp_file_path = None
-    try:
-        file_storage.seek(0)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xls') as temp_file:
-            temp_file_path = temp_file.name
-            file_storage.save(temp_file)
-        
-        df = pd.read_excel(temp_file_path, engine='xlrd')
-        print("DRM 처리 성공: 임시 파일 (xlrd)")
-        return df
-    except Exception as e:
-        last_error = f"임시 파일 xlrd 실패: {str(e)}"
-        print(f"방법 5 실패: {last_error}")
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
+    # 판별된 형식의 엔진을 가장 먼저 시도
+    sniffed_engine = SNIFFED_EXCEL_ENGINES.get(file_format)
+    engines = ['openpyxl', 'xlrd', 'pyxlsb']
+    if sniffed_engine:
+        engines.remove(sniffed_engine)
+        engines.insert(0, sniffed_engine)
     
-    # 방법 6: 임시 파일 저장 (pyxlsb)
     temp_file_path = None
-    try:
-        file_storage.seek(0)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsb') as temp_file:
-            temp_file_path = temp_file.name
-            file_storage.save(temp_file)
-        
-        df = pd.read_excel(temp_file_path, engine='pyxlsb')
-        print("DRM 처리 성공: 임시 파일 (pyxlsb)")
-        return df
-    except Exception as e:
-        last_error = f"임시 파일 pyxlsb 실패: {str(e)}"
-        print(f"방법 6 실패: {last_error}")
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
     
-    # 방법 7: 기본 엔진 (메모리 스트림)
-    try:
-        file_storage.seek(0)
-        file_bytes = io.BytesIO(file_storage.read())
-        df = pd.read_excel(file_bytes)
-        print("DRM 처리 성공: 기본 엔진 (메모리 스트림)")
-        return df
-    except Exception as e:
-        last_error = f"기본 엔진 메모리 스트림 실패: {str(e)}"
-        print(f"방법 7 실패: {last_error}")
+    def get_temp_file_path():
+        nonlocal temp_file_path
+        if temp_file_path is None:
+            suffix = os.path.splitext(file_storage.filename or '')[1] or '.xlsx'
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+                temp_file_path = temp_file.name
+                temp_file.write(data)
+        return temp_file_path
+    
+    attempts = []
+    if file_format in ('html', 'csv'):
+        attempts.append((f'{file_format} (메모리 스트림)', lambda: read_text_table(data, file_format)))
+    for engine in engines:
+        attempts.append((f'메모리 스트림 ({engine})',
+                         lambda engine=engine: pd.read_excel(io.BytesIO(data), engine=engine)))
+    for engine in engines:
+        attempts.append((f'임시 파일 ({engine})',
+                         lambda engine=engine: pd.read_excel(get_temp_file_path(), engine=engine)))
+    attempts.append(('기본 엔진 (임시 파일)', lambda: pd.read_excel(get_temp_file_path())))
     
-    # 방법 8: 기본 엔진 (임시 파일)
-    temp_file_path = None
+    last_error = None
     try:
-        file_storage.seek(0)
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            file_storage.save(temp_file)
-        
-        df = pd.read_excel(temp_file_path)
-        print("DRM 처리 성공: 기본 엔진 (임시 파일)")
-        return df
-    except Exception as e:
-        last_error = f"기본 엔진 임시 파일 실패: {str(e)}"
-        print(f"방법 8 실패: {last_error}")
+        for i, (name, reader) in enumerate(attempts, 1):
+            started = time.perf_counter()
+            try:
+                df = reader()
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                record_excel_read_metric('failed', name, elapsed)
+                last_error = f"{name} 실패: {str(e)}"
+                print(f"방법 {i} 실패 ({elapsed:.2f}초): {last_error}")
+                continue
+            
+            record_excel_read_metric('succeeded', name, time.perf_counter() - started)
+            print(f"DRM 처리 성공: {name}")
+            return df
     finally:
         if temp_file_path and os.path.exists(temp_file_path):
             try:
@@ -166,7 +190,7 @@ def read_excel_with_drm(file_storage):
 
 def init_db():
     """데이터베이스 초기화"""
-    conn = sqlite3.connect('voc_data.db')
+    conn = get_db()
     c = conn.cursor()
     
     # 사내 VOC 테이블
@@ -199,6 +223,20 @@ def init_db():
         chipset TEXT NOT NULL
     )''')
     
+    # 모델명 별칭 테이블 (alias: 대문자 모델명 → model_name: 표시 모델명)
+    # 처음 만들 때만 기본 별칭을 넣음 (이후 삭제한 별칭이 재시작 때 되살아나지 않도록)
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'model_aliases'")
+    seed_model_aliases = c.fetchone() is None
+    c.execute('''CREATE TABLE IF NOT EXISTS model_aliases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        alias TEXT UNIQUE NOT NULL,
+        model_name TEXT NOT NULL
+    )''')
+    if seed_model_aliases:
+        c.executemany("INSERT INTO model_aliases (alias, model_name) VALUES (?, ?)",
+                      DEFAULT_MODEL_ALIASES.items())
+        print(f"모델명 별칭 기본값 등록: {len(DEFAULT_MODEL_ALIASES)}개")
+    
     # 3rd party 앱 키워드 테이블
     c.execute('''CREATE TABLE IF NOT EXISTS app_keywords (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -269,8 +307,494 @@ def init_db():
         UNIQUE(serial_number, log_id)
     )''')
     
+    # 데이터 버전 (응답 캐시 무효화용) / 조회 캐시 버전 (칩셋 매핑 / 앱 키워드 / 모델명 별칭)
+    c.execute('''CREATE TABLE IF NOT EXISTS app_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )''')
+    c.execute("INSERT OR IGNORE INTO app_meta (key, value) VALUES ('data_version', '0')")
+    c.execute("INSERT OR IGNORE INTO app_meta (key, value) VALUES ('lookups_version', '0')")
+    # 기존 DB: 마지막 업로드 일시를 최종 수정 시각 초기값으로 사용
+    c.execute('''INSERT OR IGNORE INTO app_meta (key, value)
+                 SELECT 'data_updated_at', MAX(uploaded_date) FROM internal_voc
+                 WHERE uploaded_date IS NOT NULL
+                 HAVING MAX(uploaded_date) IS NOT NULL''')
+    
+    # 사내 VOC 통계 조회용 인덱스
+    for index_sql in INTERNAL_VOC_INDEXES:
+        c.execute(index_sql)
+    
+    # 월/주 생성 열 추가 (기존 DB 마이그레이션)
+    migrate_generated_columns(c)
+    
+    # Q-data 숫자 S/N, log_id 정규화 ('123.0' → '123', 기존 DB 마이그레이션)
+    migrate_qdata_codes(c)
+    
+    # 통계용 일별 집계 테이블 + 트리거
+    init_rollups(c)
+    
+    # VOC 전문 검색 인덱스 + 트리거
+    init_voc_search(c)
+    
     conn.commit()
-    conn.close()
+
+# 사내 VOC 인덱스
+# - (created_date, X): 기간 필터 + 그룹핑을 인덱스만으로 처리 (created_date 단독 조회도 이 인덱스 사용)
+# - (model_name, created_date): 특정 모델의 기간 조회 / 기간 없는 모델별 집계
+# - chipset, third_party_app 단독: 기간 없는 칩셋/앱별 집계
+INTERNAL_VOC_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_created_model ON internal_voc(created_date, model_name)',
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_created_chipset ON internal_voc(created_date, chipset)',
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_created_app ON internal_voc(created_date, third_party_app)',
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_model_created ON internal_voc(model_name, created_date)',
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_chipset ON internal_voc(chipset)',
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_third_party_app ON internal_voc(third_party_app)',
+]
+
+# 기간 집계용 생성 열 (VIRTUAL: 행에는 저장하지 않고 인덱스에만 값이 저장됨)
+# created_week는 주별 메모(weekly_memos.week) 키와 맞추기 위해 ISO 주차가 아닌 %Y-%W 형식 유지
+GENERATED_COLUMNS = [
+    ('internal_voc', 'created_month', "strftime('%Y-%m', created_date)"),
+    ('internal_voc', 'created_week', "strftime('%Y-%W', created_date)"),
+    ('q_data', 'service_month', "strftime('%Y-%m', service_date)"),
+]
+GENERATED_COLUMN_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_month_model ON internal_voc(created_month, model_name)',
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_week ON internal_voc(created_week)',
+    'CREATE INDEX IF NOT EXISTS idx_internal_voc_model_month ON internal_voc(model_name, created_month)',
+    'CREATE INDEX IF NOT EXISTS idx_q_data_month_model ON q_data(service_month, model_name)',
+    'CREATE INDEX IF NOT EXISTS idx_q_data_model_month ON q_data(model_name, service_month)',
+]
+
+# SELECT * 대신 사용하는 컬럼 목록 (생성 열 제외, 내보내기 columns= 허용 목록으로도 사용)
+INTERNAL_VOC_SELECT_COLUMNS = '''id, case_code, title, model_name, model_no, chipset, build_version,
+    os_version, issue_type, problem, original_content, reproduction_path, resolver,
+    resolve_option, cause, solution, third_party_app, created_date, uploaded_date'''
+QDATA_SELECT_COLUMNS = '''id, service_date, process_type, repair_name, repair_detail, detail_content,
+    model_name, serial_number, log_id, sw_before, sw_after, uploaded_date'''
+INTERNAL_VOC_EXPORT_COLUMNS = [column.strip() for column in INTERNAL_VOC_SELECT_COLUMNS.split(',')]
+QDATA_EXPORT_COLUMNS = [column.strip() for column in QDATA_SELECT_COLUMNS.split(',')]
+
+def migrate_generated_columns(c):
+    """
+    월/주 생성 열 마이그레이션
+    - 없는 열만 ALTER TABLE로 추가 (VIRTUAL 열은 기존 행도 바로 계산됨)
+    - 인덱스 생성 시 기존 행의 값이 인덱스에 채워짐
+    """
+    for table, column, expression in GENERATED_COLUMNS:
+        c.execute(f"PRAGMA table_xinfo({table})")
+        if column in {row[1] for row in c.fetchall()}:
+            continue
+        c.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT GENERATED ALWAYS AS ({expression}) VIRTUAL")
+        print(f"생성 열 추가: {table}.{column}")
+    
+    for index_sql in GENERATED_COLUMN_INDEXES:
+        c.execute(index_sql)
+
+def migrate_qdata_codes(c):
+    """
+    Q-data S/N, log_id 정규화 마이그레이션 (한 번만 실행)
+    - 기존 업로드는 열 전체가 숫자(+빈 칸)면 float 열로 읽혀 '123.0'으로 저장됨
+    - 현재 업로드는 숫자 셀을 '123'으로 저장하므로 기존 값도 맞춰야 재업로드 시 중복으로 걸러짐
+    - 이미 '123' 행이 있는 경우(같은 log_id)는 UPDATE OR IGNORE로 그대로 둠
+    """
+    c.execute("SELECT 1 FROM app_meta WHERE key = 'qdata_codes_normalized'")
+    if c.fetchone():
+        return
+    for column in ('serial_number', 'log_id'):
+        c.execute(f"""UPDATE OR IGNORE q_data
+                      SET {column} = substr({column}, 1, length({column}) - 2)
+                      WHERE {column} GLOB '[0-9]*.0'
+                        AND substr({column}, 1, length({column}) - 2) NOT GLOB '*[^0-9]*'""")
+        if c.rowcount > 0:
+            print(f"Q-data {column} 정규화: {c.rowcount}건")
+    c.execute("INSERT INTO app_meta (key, value) VALUES ('qdata_codes_normalized', '1')")
+
+# 기간 조건 (created_date에 함수를 씌우지 않아 인덱스 범위 검색 가능)
+# DATE(created_date) BETWEEN start AND end 와 같은 결과: 종료일 다음날 0시 미만
+CREATED_DATE_RANGE_SQL = "created_date >= ? AND created_date < date(?, '+1 day')"
+
+# ========== 일별 집계 (rollup) ==========
+# 통계 API는 원본 행 대신 (일자 + 분류 키)별로 미리 집계된 건수를 읽음
+# - 원본 테이블 트리거로 INSERT/UPDATE/DELETE와 같은 트랜잭션 안에서 증감 (업로드, 칩셋 병합/이름 변경, 모델 재매핑 모두 포함)
+# - day는 원본 날짜 문자열 그대로 저장 → 원본 테이블과 같은 기간 조건 사용 가능
+# - 키에 NULL이 있을 수 있어 UNIQUE/UPSERT 대신 IS 비교로 행을 찾음
+# - indexes: 통계 API별 커버링 인덱스 (count 포함 → 테이블을 읽지 않고 SUM)
+ROLLUP_TABLES = {
+    'voc_daily_rollup': {
+        'source': 'internal_voc',
+        'day': 'created_date',
+        'keys': ['model_name', 'chipset', 'third_party_app', 'issue_type'],
+        'indexes': {
+            'model': 'model_name, day, count',
+            'model_month': 'model_name, month, count',
+            'chipset': 'chipset, day, count',
+            'app': 'third_party_app, day, count',
+            'month': 'month, count',
+            'week': 'week, count'
+        }
+    },
+    'qdata_daily_rollup': {
+        'source': 'q_data',
+        'day': 'service_date',
+        'keys': ['model_name', 'process_type', 'repair_name'],
+        'indexes': {
+            'model': 'model_name, day, process_type, count',
+            'model_month': 'model_name, month, count',
+            'month': 'month, count'
+        }
+    }
+}
+
+# 집계 테이블 기간 조건 (CREATED_DATE_RANGE_SQL과 같은 의미)
+ROLLUP_DAY_RANGE_SQL = "day >= ? AND day < date(?, '+1 day')"
+
+def _rollup_match(rollup, prefix):
+    """집계 행 검색 조건 (day IS NEW.created_date AND model_name IS NEW.model_name ...)"""
+    spec = ROLLUP_TABLES[rollup]
+    conditions = [f"day IS {prefix}.{spec['day']}"]
+    conditions += [f"{key} IS {prefix}.{key}" for key in spec['keys']]
+    return ' AND '.join(conditions)
+
+def _rollup_increment_sql(rollup, prefix):
+    """집계 행이 없으면 0건으로 만든 뒤 +1"""
+    spec = ROLLUP_TABLES[rollup]
+    columns = ', '.join(['day'] + spec['keys'])
+    values = ', '.join([f"{prefix}.{spec['day']}"] + [f"{prefix}.{key}" for key in spec['keys']])
+    match = _rollup_match(rollup, prefix)
+    return f"""
+        INSERT INTO {rollup} ({columns}, count)
+        SELECT {values}, 0
+        WHERE NOT EXISTS (SELECT 1 FROM {rollup} WHERE {match});
+        UPDATE {rollup} SET count = count + 1 WHERE {match};"""
+
+def _rollup_decrement_sql(rollup, prefix):
+    """-1 후 0건이 된 집계 행 삭제"""
+    match = _rollup_match(rollup, prefix)
+    return f"""
+        UPDATE {rollup} SET count = count - 1 WHERE {match};
+        DELETE FROM {rollup} WHERE {match} AND count <= 0;"""
+
+def rollup_schema_sql(rollup):
+    """집계 테이블 + 인덱스 + 트리거 생성 SQL"""
+    spec = ROLLUP_TABLES[rollup]
+    source = spec['source']
+    key_columns = ''.join(f"\n        {key} TEXT," for key in spec['keys'])
+    tracked = [spec['day']] + spec['keys']
+    changed = ' OR '.join(f"OLD.{column} IS NOT NEW.{column}" for column in tracked)
+    indexes = ''.join(f"\n    CREATE INDEX IF NOT EXISTS idx_{rollup}_{name} ON {rollup}({columns});"
+                      for name, columns in spec['indexes'].items())
+    return f"""
+    CREATE TABLE IF NOT EXISTS {rollup} (
+        day TEXT,{key_columns}
+        count INTEGER NOT NULL DEFAULT 0,
+        month TEXT GENERATED ALWAYS AS (strftime('%Y-%m', day)) VIRTUAL,
+        week TEXT GENERATED ALWAYS AS (strftime('%Y-%W', day)) VIRTUAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_{rollup}_key ON {rollup}(day, {', '.join(spec['keys'])}, count);{indexes}
+    
+    CREATE TRIGGER IF NOT EXISTS trg_{rollup}_insert AFTER INSERT ON {source}
+    BEGIN{_rollup_increment_sql(rollup, 'NEW')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_{rollup}_delete AFTER DELETE ON {source}
+    BEGIN{_rollup_decrement_sql(rollup, 'OLD')}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_{rollup}_update AFTER UPDATE OF {', '.join(tracked)} ON {source}
+    WHEN {changed}
+    BEGIN{_rollup_decrement_sql(rollup, 'OLD')}{_rollup_increment_sql(rollup, 'NEW')}
+    END;
+    """
+
+def _rollup_group_sql(rollup):
+    """원본 테이블을 집계 키로 GROUP BY 하는 SELECT"""
+    spec = ROLLUP_TABLES[rollup]
+    columns = ', '.join([spec['day']] + spec['keys'])
+    return f"SELECT {columns}, COUNT(*) FROM {spec['source']} GROUP BY {columns}"
+
+def init_rollups(c):
+    """집계 테이블/트리거 생성 (처음 만든 경우 원본에서 전체 재집계)"""
+    for rollup in ROLLUP_TABLES:
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (rollup,))
+        is_new = c.fetchone() is None
+        c.executescript(rollup_schema_sql(rollup))
+        if is_new:
+            rebuild_rollup(c, rollup)
+            print(f"집계 테이블 생성: {rollup}")
+
+def rebuild_rollup(c, rollup):
+    """집계 테이블 전체 재생성 (원본 테이블 GROUP BY)"""
+    spec = ROLLUP_TABLES[rollup]
+    columns = ', '.join(['day'] + spec['keys'])
+    c.execute(f"DELETE FROM {rollup}")
+    c.execute(f"INSERT INTO {rollup} ({columns}, count) {_rollup_group_sql(rollup)}")
+    c.execute(f"SELECT COUNT(*), COALESCE(SUM(count), 0) FROM {rollup}")
+    groups, total = c.fetchone()
+    return {'groups': groups, 'rows': total}
+
+TRIGGER_NAME_PATTERN = re.compile(r'CREATE TRIGGER IF NOT EXISTS (\w+)')
+
+def script_statements(script):
+    """여러 문장 SQL → 문장 목록 (트리거 본문 BEGIN ... END 안의 ;에서는 나누지 않음)"""
+    statements = []
+    buffer = ''
+    for part in script.split(';'):
+        buffer += part + ';'
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip(' \n;'):
+                statements.append(buffer.strip())
+            buffer = ''
+    return statements
+
+def source_trigger_statements(c, table):
+    """원본 테이블에 걸린 집계 트리거 (internal_voc는 검색 색인 트리거 포함) 생성문 목록"""
+    scripts = [rollup_schema_sql(rollup) for rollup, spec in ROLLUP_TABLES.items() if spec['source'] == table]
+    if table == 'internal_voc' and voc_search_available(c):
+        scripts.append(voc_search_schema_sql())
+    return [sql for script in scripts for sql in script_statements(script) if sql.startswith('CREATE TRIGGER')]
+
+def drop_source_triggers(c, table):
+    """
+    원본 테이블의 집계/검색 색인 트리거 삭제 (대량 삭제 전)
+    - executescript는 자동 커밋하므로 문장마다 execute → 이후 삭제/재생성까지 한 트랜잭션
+    - 커밋 전에 실패하면 롤백으로 트리거도 복구됨
+    반환: restore_source_triggers에 넘길 트리거 생성문 목록
+    """
+    if not c.connection.in_transaction:
+        c.execute("BEGIN IMMEDIATE")
+    statements = source_trigger_statements(c, table)
+    for sql in statements:
+        c.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME_PATTERN.match(sql).group(1)}")
+    return statements
+
+def restore_source_triggers(c, statements):
+    """drop_source_triggers로 삭제한 트리거 재생성 (같은 트랜잭션)"""
+    for sql in statements:
+        c.execute(sql)
+
+def truncate_source_table(c, table):
+    """
+    원본 테이블 전체 삭제 (초기화 API) → 삭제한 행 수 (커밋은 호출한 쪽)
+    - 행 단위 트리거가 있으면 SQLite의 전체 삭제 최적화가 꺼지고 삭제 행마다 집계 테이블 갱신 +
+      검색 색인 'delete'(본문 6개 컬럼을 다시 trigram으로 분해)를 실행함
+      → 트리거 삭제 → 원본/집계 테이블 전체 삭제 + 검색 색인 delete-all → 트리거 재생성
+    """
+    statements = drop_source_triggers(c, table)
+    count = c.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    c.execute(f"DELETE FROM {table}")
+    for rollup, spec in ROLLUP_TABLES.items():
+        if spec['source'] == table:
+            c.execute(f"DELETE FROM {rollup}")
+    if table == 'internal_voc' and voc_search_available(c):
+        c.execute("INSERT INTO voc_fts (voc_fts) VALUES ('delete-all')")
+    restore_source_triggers(c, statements)
+    return count
+
+def check_rollup(c, rollup, sample_size=20):
+    """
+    집계 테이블과 원본 건수 비교
+    반환: 불일치 키 수와 샘플 (키, 원본 건수, 집계 건수)
+    """
+    spec = ROLLUP_TABLES[rollup]
+    columns = ['day'] + spec['keys']
+    select_columns = ', '.join(columns)
+    # 양쪽 모두 (키, 건수) 집합으로 만든 뒤 차집합 비교 (NULL 키도 같은 값으로 취급됨)
+    raw_sql = _rollup_group_sql(rollup)
+    rollup_sql = f"SELECT {select_columns}, count FROM {rollup} WHERE count > 0"
+    c.execute(f"""
+        SELECT * FROM ({raw_sql} EXCEPT {rollup_sql})
+        UNION ALL
+        SELECT * FROM ({rollup_sql} EXCEPT {raw_sql})
+    """)
+    mismatched_keys = list(dict.fromkeys(tuple(row[:-1]) for row in c.fetchall()))
+    
+    # 불일치 키별 원본/집계 건수 (샘플)
+    raw_match = ' AND '.join(f"{column} IS ?" for column in [spec['day']] + spec['keys'])
+    rollup_match = ' AND '.join(f"{column} IS ?" for column in columns)
+    samples = []
+    for key in mismatched_keys[:sample_size]:
+        c.execute(f"SELECT COUNT(*) FROM {spec['source']} WHERE {raw_match}", key)
+        raw_count = c.fetchone()[0]
+        c.execute(f"SELECT COALESCE(SUM(count), 0) FROM {rollup} WHERE {rollup_match}", key)
+        rollup_count = c.fetchone()[0]
+        samples.append({'key': dict(zip(columns, key)), 'raw': raw_count, 'rollup': rollup_count})
+    
+    return {'consistent': not mismatched_keys, 'mismatched_keys': len(mismatched_keys), 'samples': samples}
+
+# ========== 전문 검색 (FTS5) ==========
+# internal_voc 본문 컬럼의 trigram 인덱스 (외부 콘텐츠 테이블 → 본문은 중복 저장하지 않음)
+# - trigram: 공백 단위가 아닌 3글자 단위 색인 → 한글 부분 단어도 검색 가능 ('배터리' → '배터리소모')
+# - 3글자 미만 검색어(예: '발열')는 색인을 쓸 수 없어 LIKE로 확인 (다른 검색어와 함께 쓰면 범위가 좁혀짐)
+# - trigram 토크나이저는 SQLite 3.34.0 이상 + FTS5 빌드에서만 사용 가능 → 없으면 모든 검색어를 LIKE로 확인
+VOC_SEARCH_COLUMNS = ['title', 'problem', 'original_content', 'reproduction_path', 'cause', 'solution']
+VOC_SEARCH_MIN_TERM = 3
+VOC_SEARCH_PAGE_SIZE = 50
+VOC_SEARCH_MAX_PAGE_SIZE = 200
+VOC_SEARCH_RANK_WINDOW = 20000     # 관련도순 정렬 대상 (최근 일치 건수)
+VOC_SEARCH_MIN_SQLITE = (3, 34, 0)  # FTS5 trigram 토크나이저 지원 버전
+
+def voc_search_schema_sql():
+    """검색 테이블 + 동기화 트리거 생성 SQL"""
+    columns = ', '.join(VOC_SEARCH_COLUMNS)
+    new_values = ', '.join(f'NEW.{column}' for column in VOC_SEARCH_COLUMNS)
+    old_values = ', '.join(f'OLD.{column}' for column in VOC_SEARCH_COLUMNS)
+    changed = ' OR '.join(f'OLD.{column} IS NOT NEW.{column}' for column in VOC_SEARCH_COLUMNS)
+    return f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS voc_fts USING fts5(
+        {columns},
+        content='internal_voc', content_rowid='id', tokenize='trigram'
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS trg_voc_fts_insert AFTER INSERT ON internal_voc
+    BEGIN
+        INSERT INTO voc_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_voc_fts_delete AFTER DELETE ON internal_voc
+    BEGIN
+        INSERT INTO voc_fts (voc_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_voc_fts_update AFTER UPDATE OF {columns} ON internal_voc
+    WHEN {changed}
+    BEGIN
+        INSERT INTO voc_fts (voc_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+        INSERT INTO voc_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+    END;
+    """
+
+def init_voc_search(c):
+    """
+    검색 테이블/트리거 생성 (처음 만든 경우 기존 VOC 전체 색인)
+    - SQLite 버전이 낮거나 FTS5/trigram을 쓸 수 없으면 만들지 않음 (검색 API는 LIKE 검색으로 동작)
+    반환: 전문 검색 사용 가능 여부
+    """
+    if sqlite3.sqlite_version_info < VOC_SEARCH_MIN_SQLITE:
+        print(f"전문 검색 미사용: SQLite {sqlite3.sqlite_version} (trigram은 3.34.0 이상 필요)")
+        return False
+    
+    is_new = not voc_search_available(c)
+    try:
+        c.executescript(voc_search_schema_sql())
+    except sqlite3.OperationalError as e:
+        print(f"전문 검색 미사용: {e}")
+        return False
+    if is_new:
+        c.execute("INSERT INTO voc_fts (voc_fts) VALUES ('rebuild')")
+        print("검색 색인 생성: voc_fts")
+    return True
+
+def voc_search_available(c):
+    """검색 테이블(voc_fts)이 있는지 여부"""
+    return c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'voc_fts'").fetchone() is not None
+
+def build_voc_search_query(text, fulltext=True):
+    """
+    검색어 → (FTS5 MATCH 식, LIKE 조건 목록)
+    - 공백으로 나눈 각 단어를 모두 포함(AND)하는 VOC 검색
+    - 3글자 이상: 따옴표로 감싼 구문으로 MATCH (FTS 문법 문자 무력화)
+    - 3글자 미만 (또는 fulltext=False): 검색 컬럼 중 하나라도 포함하는지 LIKE
+    """
+    match_terms = []
+    like_terms = []
+    for term in dict.fromkeys(text.split()):
+        if fulltext and len(term) >= VOC_SEARCH_MIN_TERM:
+            match_terms.append('"' + term.replace('"', '""') + '"')
+        else:
+            like_terms.append('%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    return ' AND '.join(match_terms), like_terms
+
+# 여러 모델 월별 추이 비교 시 최대 모델 수
+MODELS_MONTHLY_MAX = 50
+
+def month_range(first_month, last_month):
+    """'YYYY-MM' 구간의 모든 월 목록 (양끝 포함)"""
+    year, month = map(int, first_month.split('-'))
+    last_year, last = map(int, last_month.split('-'))
+    months = []
+    while (year, month) <= (last_year, last):
+        months.append(f'{year:04d}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def parse_models_monthly_request(data):
+    """
+    여러 모델 월별 통계 요청 본문 검증
+    반환: (model_names 중복 제거, start_date, end_date)
+    - start_date / end_date: 'YYYY-MM-DD', 둘 다 있을 때만 기간 조건 적용
+    - 잘못된 입력은 ValueError (라우트에서 400)
+    """
+    if not isinstance(data, dict):
+        raise ValueError('요청 본문은 JSON 객체여야 합니다.')
+    
+    model_names = data.get('model_names') or []
+    if not isinstance(model_names, list) or not all(isinstance(name, str) for name in model_names):
+        raise ValueError('model_names는 모델명 목록이어야 합니다.')
+    
+    start_date = data.get('start_date')
+    end_date = data.get('end_date')
+    if start_date and end_date:
+        for value in (start_date, end_date):
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except (TypeError, ValueError):
+                raise ValueError(f'날짜 형식이 올바르지 않습니다: {value} (YYYY-MM-DD)')
+        if start_date > end_date:
+            raise ValueError('시작일이 종료일보다 늦습니다.')
+    
+    return list(dict.fromkeys(model_names)), start_date, end_date
+
+def fetch_models_monthly(conn, rollup, model_names, start_date=None, end_date=None):
+    """
+    여러 모델의 월별 건수를 한 번의 쿼리로 조회
+    반환: (months, {모델명: [월별 건수]}) - 모든 모델이 같은 월 목록을 쓰며 빈 월은 0
+    - 기간이 주어지면 시작~종료 월, 아니면 조회된 첫 월~마지막 월
+    """
+    placeholders = ', '.join('?' for _ in model_names)
+    query = f"""
+        SELECT model_name, month, SUM(count)
+        FROM {rollup}
+        WHERE model_name IN ({placeholders}) AND month IS NOT NULL
+    """
+    params = list(model_names)
+    if start_date and end_date:
+        query += " AND " + ROLLUP_DAY_RANGE_SQL
+        params.extend([start_date, end_date])
+    query += " GROUP BY model_name, month"
+    
+    counts = {model_name: {} for model_name in model_names}
+    for model_name, month, count in conn.execute(query, params):
+        counts[model_name][month] = count
+    
+    if start_date and end_date:
+        months = month_range(start_date[:7], end_date[:7])
+    else:
+        found = [month for model_counts in counts.values() for month in model_counts]
+        months = month_range(min(found), max(found)) if found else []
+    
+    series = {model_name: [model_counts.get(month, 0) for month in months]
+              for model_name, model_counts in counts.items()}
+    return months, series
+
+# VOC 추출용 정규식 (미리 컴파일)
+WATCH_EN_PATTERN = re.compile(r'(watch\d*)', re.IGNORECASE)
+WATCH_KO_PATTERN = re.compile(r'(워치\d*)', re.IGNORECASE)
+SM_MODEL_PATTERN = re.compile(r'(SM-[A-Z0-9]{4,5})', re.IGNORECASE)
+CASE_CODE_DATE_PATTERN = re.compile(r'P(\d{6})')
+EXTERNAL_ISSUE_PATTERN = re.compile('|'.join(re.escape(k) for k in ['samsung members', 'k zone', 'rdm']))
+
+# 재현경로(N열) 태그: 그룹 번호로 어떤 태그인지 구분
+REPRODUCTION_TAG_PATTERN = re.compile(
+    r'\[(?:(Model No\.)|(Build No\.)|(OS Ver\.)|(Original Contents))\]', re.IGNORECASE)
+REPRODUCTION_LINE_VALUE = re.compile(r'\s*([^\[\n]+)')
+REPRODUCTION_BLOCK_VALUE = re.compile(r'\s*([^\[]+)')
+REPRODUCTION_FIELDS = (
+    ('model_no', REPRODUCTION_LINE_VALUE),
+    ('build_version', REPRODUCTION_LINE_VALUE),
+    ('os_version', REPRODUCTION_LINE_VALUE),
+    ('original_content', REPRODUCTION_BLOCK_VALUE)
+)
 
 def extract_watch_model(title):
     """H열에서 '워치' 단어 추출"""
@@ -299,31 +823,30 @@ def extract_watch_model(title):
     
     return None
 
-def map_model_name(model_name):
-    """모델명 매핑"""
-    if not model_name:
-        return None
-    
-    # 대소문자 구분 없이 매핑
-    model_name_upper = model_name.upper()
-    
+# 모델명 별칭 기본값 (대문자 모델명 → 표시 모델명) - model_aliases 테이블을 처음 만들 때만 사용
+# 이후 별칭은 model_aliases 테이블에서 관리 (/api/model-aliases, /api/upload/model_aliases)
+DEFAULT_MODEL_ALIASES = {
     # 워치울
-    if model_name_upper in ['SM-L705N', 'SM-L705']:
-        return '워치울'
-    
+    'SM-L705N': '워치울', 'SM-L705': '워치울',
     # 워치7
-    if model_name_upper in ['SM-L310N', 'SM-L310', 'SM-L305N', 'WATCH7']:
-        return '워치7'
-    
+    'SM-L310N': '워치7', 'SM-L310': '워치7', 'SM-L305N': '워치7', 'WATCH7': '워치7',
     # 워치4
-    if model_name_upper in ['SM-R890', 'SM-R870']:
-        return '워치4'
-    
+    'SM-R890': '워치4', 'SM-R870': '워치4',
     # 워치6
-    if model_name_upper in ['SM-R935N', 'SM-R960', 'SM-R950', 'SM-R940', 'WATCH6']:
-        return '워치6'
-    
-    return model_name
+    'SM-R935N': '워치6', 'SM-R960': '워치6', 'SM-R950': '워치6', 'SM-R940': '워치6', 'WATCH6': '워치6',
+}
+
+def map_model_name(model_name, model_aliases=None):
+    """모델명 매핑 (대소문자 구분 없이 별칭 적용)
+
+    model_aliases: load_voc_lookups()로 미리 읽어둔 {대문자 별칭: 모델명}
+    (없으면 캐시에서 조회)
+    """
+    if not model_name:
+        return None
+    if model_aliases is None:
+        model_aliases = load_voc_lookups()['model_aliases']
+    return model_aliases.get(model_name.upper(), model_name)
 
 def extract_model_from_title(title):
     """타이틀에서 모델명 추출 (SM-XXX 형식)"""
@@ -332,42 +855,57 @@ def extract_model_from_title(title):
     match = re.search(r'SM-[A-Z0-9]{4,5}', title, re.IGNORECASE)
     return match.group(0).upper() if match else None
 
+def parse_reproduction_path(text):
+    """재현경로를 한 번만 훑어서 [Model No.], [Build No.], [OS Ver.], [Original Contents] 추출
+
+    extract_model_from_reproduction / extract_build_version / extract_os_version /
+    extract_original_content 네 함수의 결과와 동일한 값을 dict로 반환
+    """
+    values = dict.fromkeys(field for field, _ in REPRODUCTION_FIELDS)
+    if not text:
+        return values
+    
+    remaining = len(REPRODUCTION_FIELDS)
+    for tag in REPRODUCTION_TAG_PATTERN.finditer(text):
+        field, value_pattern = REPRODUCTION_FIELDS[tag.lastindex - 1]
+        if values[field] is not None:
+            continue
+        
+        # 태그 뒤에 값이 없으면 같은 태그의 다음 위치에서 다시 찾음 (re.search와 동일)
+        value = value_pattern.match(text, tag.end())
+        if not value:
+            continue
+        values[field] = value.group(1).strip()
+        
+        remaining -= 1
+        if remaining == 0:
+            break
+    
+    if values['model_no'] is not None:
+        sm_match = SM_MODEL_PATTERN.search(values['model_no'])
+        if sm_match:
+            values['model_no'] = sm_match.group(0).upper()
+    if values['build_version'] is not None:
+        # 마지막 3글자
+        values['build_version'] = values['build_version'][-3:]
+    
+    return values
+
 def extract_model_from_reproduction(text):
     """재현경로에서 [Model No.] 추출"""
-    if not text:
-        return None
-    match = re.search(r'\[Model No\.\]\s*([^\[\n]+)', text, re.IGNORECASE)
-    if match:
-        model = match.group(1).strip()
-        # SM- 형식 찾기
-        sm_match = re.search(r'SM-[A-Z0-9]{4,5}', model, re.IGNORECASE)
-        return sm_match.group(0).upper() if sm_match else model
-    return None
+    return parse_reproduction_path(text)['model_no']
 
 def extract_build_version(text):
     """재현경로에서 [Build No.] 뒤 3글자 추출"""
-    if not text:
-        return None
-    match = re.search(r'\[Build No\.\]\s*([^\[\n]+)', text, re.IGNORECASE)
-    if match:
-        build = match.group(1).strip()
-        # 마지막 3글자 추출
-        return build[-3:] if len(build) >= 3 else build
-    return None
+    return parse_reproduction_path(text)['build_version']
 
 def extract_os_version(text):
     """재현경로에서 [OS Ver.] 추출"""
-    if not text:
-        return None
-    match = re.search(r'\[OS Ver\.\]\s*([^\[\n]+)', text, re.IGNORECASE)
-    return match.group(1).strip() if match else None
+    return parse_reproduction_path(text)['os_version']
 
 def extract_original_content(text):
     """재현경로에서 [Original Contents] 추출"""
-    if not text:
-        return None
-    match = re.search(r'\[Original Contents\]\s*([^\[]+)', text, re.IGNORECASE)
-    return match.group(1).strip() if match else None
+    return parse_reproduction_path(text)['original_content']
 
 def detect_issue_type(problem, reproduction):
     """외부/내부 이슈 구분"""
@@ -379,40 +917,358 @@ def detect_issue_type(problem, reproduction):
             return '외부이슈'
     return '내부이슈'
 
-def detect_third_party_app(text):
-    """텍스트에서 3rd party 앱 감지"""
+def build_app_keyword_matcher(app_keywords):
+    """앱 키워드 Aho-Corasick 오토마톤 생성
+
+    app_keywords: [(app_name, [소문자 keyword, ...]), ...]
+    텍스트를 한 번만 훑어서 모든 앱 키워드를 동시에 찾을 수 있도록 goto/fail/output 테이블을 만든다.
+    """
+    goto = [{}]
+    outputs = [set()]
+    always_matched = set()
+    
+    for app_index, (_, keywords) in enumerate(app_keywords):
+        for keyword in keywords:
+            if not keyword:
+                # 빈 키워드('a,,b' 등)는 기존 방식('' in text)과 동일하게 항상 일치
+                always_matched.add(app_index)
+                continue
+            node = 0
+            for ch in keyword:
+                next_node = goto[node].get(ch)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][ch] = next_node
+                    goto.append({})
+                    outputs.append(set())
+                node = next_node
+            outputs[node].add(app_index)
+    
+    # 실패 링크 (BFS)
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for ch, next_node in goto[node].items():
+            queue.append(next_node)
+            state = fail[node]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            fail[next_node] = goto[state].get(ch, 0)
+            outputs[next_node] |= outputs[fail[next_node]]
+    
+    return {
+        'app_names': [app_name for app_name, _ in app_keywords],
+        'goto': goto,
+        'fail': fail,
+        'outputs': outputs,
+        'always_matched': always_matched
+    }
+
+def match_app_keywords(matcher, text):
+    """오토마톤으로 텍스트를 한 번 스캔하여 일치한 앱 이름 목록 반환 (app_keywords 등록 순서 유지)"""
+    goto = matcher['goto']
+    fail = matcher['fail']
+    outputs = matcher['outputs']
+    
+    matched = set(matcher['always_matched'])
+    node = 0
+    for ch in text.lower():
+        while node and ch not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(ch, 0)
+        if outputs[node]:
+            matched |= outputs[node]
+    
+    app_names = matcher['app_names']
+    return [app_names[i] for i in sorted(matched)]
+
+def detect_third_party_app(text, app_matcher=None):
+    """텍스트에서 3rd party 앱 감지
+
+    app_matcher: load_voc_lookups()로 미리 만들어 둔 키워드 오토마톤
+    (없으면 DB에서 키워드를 읽어 직접 생성)
+    """
     if not text:
         return None
     
-    conn = sqlite3.connect('voc_data.db')
-    c = conn.cursor()
-    c.execute("SELECT app_name, keywords FROM app_keywords")
-    apps = c.fetchall()
-    conn.close()
-    
-    detected_apps = []
-    for app_name, keywords_str in apps:
-        keywords = [k.strip() for k in keywords_str.split(',')]
-        for keyword in keywords:
-            if keyword.lower() in text.lower():
-                detected_apps.append(app_name)
-                break
+    if app_matcher is None:
+        conn = get_db()
+        app_matcher = build_app_keyword_matcher(load_app_keywords(conn))
     
+    detected_apps = match_app_keywords(app_matcher, text)
     return ', '.join(detected_apps) if detected_apps else None
 
-def get_chipset_for_model(model_name):
-    """모델명으로 칩셋 조회"""
+def get_chipset_for_model(model_name, chipset_map=None):
+    """모델명으로 칩셋 조회
+
+    chipset_map: load_voc_lookups()로 미리 읽어둔 {model_name: chipset}
+    (없으면 DB에서 직접 조회)
+    """
     if not model_name:
         return None
     
-    conn = sqlite3.connect('voc_data.db')
+    if chipset_map is not None:
+        return chipset_map.get(model_name)
+    
+    conn = get_db()
     c = conn.cursor()
     c.execute("SELECT chipset FROM chipset_mapping WHERE model_name = ?", (model_name,))
     result = c.fetchone()
-    conn.close()
     
     return result[0] if result else None
 
+# ========== 조회 캐시 (칩셋 매핑 / 앱 키워드 / 모델명 별칭) ==========
+
+# VOC 업로드 시 행마다 DB를 다시 조회하지 않도록 세 테이블을 한 번만 읽어 둔다.
+# 매핑/키워드/별칭을 바꾸는 API는 커밋 전에 invalidate_voc_lookups(conn)을 호출해 app_meta.lookups_version을 올린다.
+# 버전이 DB에 있으므로 다른 워커 프로세스의 캐시도 다음 조회 때 다시 읽힌다.
+_voc_lookups = {'loaded_version': None, 'data': None}
+_voc_lookups_lock = threading.Lock()
+
+def get_lookups_version(conn):
+    """조회 캐시 버전 (app_meta.lookups_version)"""
+    row = conn.execute("SELECT value FROM app_meta WHERE key = 'lookups_version'").fetchone()
+    return int(row[0]) if row else 0
+
+def load_app_keywords(conn):
+    """앱 키워드 테이블 조회 (쉼표로 구분된 키워드를 소문자 리스트로 변환)"""
+    c = conn.cursor()
+    c.execute("SELECT app_name, keywords FROM app_keywords ORDER BY id")
+    return [
+        (app_name, [k.strip().lower() for k in keywords_str.split(',')])
+        for app_name, keywords_str in c.fetchall()
+    ]
+
+def load_chipset_map(conn):
+    """칩셋 매핑 테이블 조회 {model_name: chipset}"""
+    c = conn.cursor()
+    c.execute("SELECT model_name, chipset FROM chipset_mapping")
+    return dict(c.fetchall())
+
+def load_model_aliases(conn):
+    """모델명 별칭 테이블 조회 {대문자 별칭: 모델명}"""
+    c = conn.cursor()
+    c.execute("SELECT alias, model_name FROM model_aliases")
+    return dict(c.fetchall())
+
+def load_voc_lookups():
+    """칩셋 매핑 / 앱 키워드 / 모델명 별칭 캐시 조회 (DB의 버전이 바뀐 경우에만 다시 읽음)"""
+    conn = get_db()
+    with _voc_lookups_lock:
+        version = get_lookups_version(conn)
+        if _voc_lookups['loaded_version'] == version and _voc_lookups['data'] is not None:
+            return _voc_lookups['data']
+        
+        app_keywords = load_app_keywords(conn)
+        data = {
+            'chipset_map': load_chipset_map(conn),
+            'model_aliases': load_model_aliases(conn),
+            'app_keywords': app_keywords,
+            'app_matcher': build_app_keyword_matcher(app_keywords)
+        }
+
+        _voc_lookups['data'] = data
+        _voc_lookups['loaded_version'] = version
+        return data
+
+def invalidate_voc_lookups(conn):
+    """칩셋 매핑 / 앱 키워드 / 모델명 별칭 변경 시 캐시 버전 증가 (호출한 쪽의 커밋과 함께 반영)"""
+    conn.execute("""
+        INSERT INTO app_meta (key, value) VALUES ('lookups_version', '1')
+        ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+    """)
+    with _voc_lookups_lock:
+        _voc_lookups['data'] = None
+
+# ========== 응답 캐시 (데이터 버전) ==========
+
+# 통계 API 응답을 (데이터 버전, 엔드포인트, 파라미터) 단위로 보관 (LRU)
+# - 데이터를 바꾸는 API는 커밋 전에 bump_data_version(conn)을 호출해 같은 트랜잭션에서 버전 증가
+# - 버전은 DB(app_meta)에 있으므로 워커 프로세스가 여러 개여도 모두 같은 시점에 무효화됨
+RESPONSE_CACHE_SIZE = 256
+
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+_response_cache_stats = {
+    'version': None,
+    'hits': 0,
+    'misses': 0,
+    'evictions': 0
+}
+
+def get_data_stamp(conn):
+    """(데이터 버전, 최종 수정 시각) - 조건부 요청(ETag / Last-Modified)용"""
+    rows = dict(conn.execute(
+        "SELECT key, value FROM app_meta WHERE key IN ('data_version', 'data_updated_at')"
+    ).fetchall())
+    updated_at = None
+    if rows.get('data_updated_at'):
+        try:
+            # 저장값은 서버 로컬 시각 (초 또는 마이크로초 단위) → HTTP 날짜(UTC)로 변환
+            updated_at = datetime.fromisoformat(rows['data_updated_at']).astimezone(timezone.utc)
+        except ValueError:
+            updated_at = None
+    return int(rows.get('data_version') or 0), updated_at
+
+def _response_cache_key(view_args):
+    """엔드포인트 + 경로 변수 + 정렬된 쿼리 파라미터 (+ POST JSON 본문)"""
+    body = None
+    if request.method == 'POST':
+        body = json.dumps(request.get_json(silent=True), sort_keys=True, ensure_ascii=False)
+    return (
+        request.endpoint,
+        tuple(sorted(view_args.items())),
+        tuple(sorted(request.args.items(multi=True))),
+        body
+    )
+
+def cached_response(view):
+    """통계 API 응답 캐시 데코레이터 (200 응답만 저장)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = get_data_version(get_db())
+        key = _response_cache_key(kwargs)
+        
+        with _response_cache_lock:
+            # 데이터가 바뀌었으면 이전 버전 응답은 모두 폐기
+            if _response_cache_stats['version'] != version:
+                _response_cache.clear()
+                _response_cache_stats['version'] = version
+            
+            cached = _response_cache.get(key)
+            if cached is not None:
+                _response_cache.move_to_end(key)
+                _response_cache_stats['hits'] += 1
+            else:
+                _response_cache_stats['misses'] += 1
+        
+        if cached is not None:
+            body, mimetype = cached
+            return app.response_class(body, mimetype=mimetype)
+        
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            with _response_cache_lock:
+                # 계산하는 동안 버전이 바뀌었으면 저장하지 않음
+                if _response_cache_stats['version'] == version:
+                    _response_cache[key] = (response.get_data(), response.mimetype)
+                    _response_cache.move_to_end(key)
+                    while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                        _response_cache.popitem(last=False)
+                        _response_cache_stats['evictions'] += 1
+        return response
+    return wrapper
+
+def conditional_response(view):
+    """
+    ETag / Last-Modified 조건부 GET 데코레이터
+    - ETag = 데이터 버전 + 요청 키 해시 (압축을 받는 요청이면 200/304 모두 약한 ETag)
+    - If-None-Match(또는 If-Modified-Since)가 현재 값과 같으면 SQL 실행 없이 304 반환
+    - 최종 수정이 현재 초 안이면 Last-Modified 생략 (HTTP 날짜는 초 단위라 같은 초의 이후 변경을 구분 못함)
+    - Cache-Control: no-cache → 브라우저가 매번 재검증하되 본문은 변경 시에만 전송
+    - GET / HEAD만 적용 (POST 조회는 본문이 요청마다 다를 수 있어 검증자를 보내거나 비교하지 않음)
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(*args, **kwargs)
+        
+        version, updated_at = get_data_stamp(get_db())
+        key_digest = hashlib.sha1(repr(_response_cache_key(kwargs)).encode('utf-8')).hexdigest()[:16]
+        etag = f'{version}-{key_digest}'
+        # compress_response는 200만 W/로 바꾸므로 304도 같은 검증자가 되도록 미리 약한 ETag로
+        weak = response_encoding() is not None
+        # 최종 수정이 아직 현재 초 안이면 날짜로는 검증하지 않음 (ETag로만)
+        current_second = datetime.now(timezone.utc).replace(microsecond=0)
+        if updated_at is not None and updated_at.replace(microsecond=0) >= current_second:
+            updated_at = None
+        
+        not_modified = False
+        if request.if_none_match:
+            # 압축 응답은 약한 ETag(W/)로 나가므로 약한 비교
+            not_modified = request.if_none_match.contains_weak(etag)
+        elif request.if_modified_since and updated_at is not None:
+            not_modified = updated_at.replace(microsecond=0) <= request.if_modified_since
+        
+        if not_modified:
+            response = app.response_class(status=304)
+            response.vary.add('Accept-Encoding')
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        
+        response.set_etag(etag, weak=weak)
+        if updated_at is not None:
+            response.last_modified = updated_at
+        response.cache_control.no_cache = True
+        return response
+    return wrapper
+
+# ========== 응답 형식 / 압축 ==========
+
+COMPRESS_MIN_SIZE = 1024            # 이 크기(byte) 이상인 응답만 압축
+COMPRESS_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/csv'}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5                  # 11(최대)은 압축 시간이 길어 응답마다 쓰기 부적합
+
+def statistics_response(df, label_column, memos=None):
+    """
+    통계 API 응답 생성
+    - 기본: [{label_column: ..., 'count': ..., ('memo': ...)}] (기존 형식)
+    - ?format=columnar: {'labels': [...], 'counts': [...], ('memos': [...])}
+      DataFrame 열을 그대로 리스트로 변환 (행별 dict 생성 없음, 키 이름 반복 없음)
+    """
+    if request.args.get('format') == 'columnar':
+        labels = df[label_column].tolist()
+        data = {'labels': labels, 'counts': df['count'].tolist()}
+        if memos is not None:
+            data['memos'] = [memos.get(label, '') for label in labels]
+        return jsonify(data)
+    
+    result = df.to_dict('records')
+    if memos is not None:
+        for item in result:
+            item['memo'] = memos.get(item[label_column], '')
+    return jsonify(result)
+
+def response_encoding():
+    """Accept-Encoding으로 고른 압축 방식 ('br' / 'gzip' / None)"""
+    if brotli is not None and 'br' in request.accept_encodings:
+        return 'br'
+    if 'gzip' in request.accept_encodings:
+        return 'gzip'
+    return None
+
+@app.after_request
+def compress_response(response):
+    """Accept-Encoding에 따라 brotli(설치된 경우) 또는 gzip으로 응답 압축"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    
+    encoding = response_encoding()
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+    
+    # 압축 결과는 바이트 단위로 원본과 다르므로 약한 ETag로 변경
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
 def normalize_chipset_name(chipset):
     """칩셋명 정규화 (유사도 비교용)"""
     if not chipset:
@@ -525,6 +1381,24 @@ def merge_similar_chipsets(chipsets):
 
 # ========== 유틸리티 함수 ==========
 
+# Q-data 엑셀 열 인덱스 (0부터 시작)
+# F=5, M=12, P=15, Q=16, T=19, Z=25, AD=29, AR=43, BE=50, BF=51
+QDATA_USECOLS = [5, 12, 15, 16, 19, 25, 29, 43, 50, 51]
+QDATA_COLUMNS = [
+    'service_date',    # F열
+    'process_type',    # M열
+    'repair_name',     # P열
+    'repair_detail',   # Q열
+    'detail_content',  # T열
+    'model_name',      # Z열
+    'serial_number',   # AD열
+    'log_id',          # AR열
+    'sw_before',       # BE열
+    'sw_after'         # BF열
+]
+QDATA_HEADER_ROW = 8      # 9행이 헤더 (pd.read_excel header=8)
+QDATA_BATCH_SIZE = 5000   # 스트리밍 읽기 배치 크기
+
 def convert_qdata_date(date_str):
     """
     Q-data 날짜 변환: 260209 → 2026-02-09
@@ -547,9 +1421,7 @@ def read_qdata_excel(file_path):
     - F, M, P, Q, T, Z, AD, AR, BE, BF 열 읽기
     - DRM 파일 처리 (8가지 방법 fallback)
     """
-    # 열 인덱스 (0부터 시작)
-    # F=5, M=12, P=15, Q=16, T=19, Z=25, AD=29, AR=43, BE=50, BF=51
-    usecols = [5, 12, 15, 16, 19, 25, 29, 43, 50, 51]
+    usecols = QDATA_USECOLS
     df = None
     
     # DRM 처리 - 8가지 방법 시도
@@ -594,19 +1466,12 @@ def read_qdata_excel(file_path):
         raise Exception(f"Q-data 엑셀 파일 읽기 실패 (DRM): {last_error}")
     
     # 컬럼 이름 매핑 (실제 헤더 이름과 관계없이 순서대로 매핑)
-    df.columns = [
-        'service_date',    # F열
-        'process_type',    # M열
-        'repair_name',     # P열
-        'repair_detail',   # Q열
-        'detail_content',  # T열
-        'model_name',      # Z열
-        'serial_number',   # AD열
-        'log_id',          # AR열
-        'sw_before',       # BE열
-        'sw_after'         # BF열
-    ]
+    df.columns = QDATA_COLUMNS
     
+    return normalize_qdata_frame(df)
+
+def normalize_qdata_frame(df):
+    """날짜 변환 및 빈 행 제거"""
     # 날짜 변환
     df['service_date'] = df['service_date'].apply(convert_qdata_date)
     
@@ -714,9 +1579,99 @@ def read_via_openpyxl_direct(file_path, header, usecols):
     
     return pd.DataFrame(data, columns=column_names)
 
+def read_qdata_batches(file_path, batch_size=QDATA_BATCH_SIZE):
+    """
+    Q-data 엑셀 파일을 배치 단위로 읽기
+    - openpyxl read_only 모드로 행을 순회하며 필요한 10개 열만 추출 (파일 크기와 관계없이 메모리 일정)
+    - 스트리밍으로 열 수 없는 파일(DRM, xls 등)은 read_qdata_excel로 전체를 읽어 배치로 나눔
+    반환: (예상 행 수 또는 None, DataFrame 배치 iterator)
+    """
+    from openpyxl import load_workbook
+    
+    try:
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+    except Exception as e:
+        print(f"Q-data 스트리밍 읽기 실패, DRM 처리 방식으로 재시도: {str(e)}")
+        df = read_qdata_excel(file_path)
+        return len(df), (df.iloc[start:start + batch_size] for start in range(0, len(df), batch_size))
+    
+    ws = wb.active
+    estimated_rows = max(ws.max_row - (QDATA_HEADER_ROW + 1), 0) if ws.max_row else None
+    return estimated_rows, _iter_qdata_rows(wb, ws, batch_size)
+
+def _iter_qdata_rows(wb, ws, batch_size):
+    """read_only 워크시트에서 필요한 열만 batch_size 행씩 DataFrame으로 반환"""
+    max_col = QDATA_USECOLS[-1] + 1
+    try:
+        batch = []
+        for row in ws.iter_rows(min_row=QDATA_HEADER_ROW + 2, max_col=max_col, values_only=True):
+            batch.append([row[i] if i < len(row) else None for i in QDATA_USECOLS])
+            if len(batch) >= batch_size:
+                yield normalize_qdata_frame(pd.DataFrame(batch, columns=QDATA_COLUMNS))
+                batch = []
+        if batch:
+            yield normalize_qdata_frame(pd.DataFrame(batch, columns=QDATA_COLUMNS))
+    finally:
+        wb.close()
+
+QDATA_INSERT_SQL = """INSERT OR IGNORE INTO q_data (
+        service_date, process_type, repair_name, repair_detail,
+        detail_content, model_name, serial_number, log_id,
+        sw_before, sw_after, uploaded_date
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+def _code_text(value):
+    """S/N, log_id 셀 값 → 문자열 (정수 값 숫자는 '.0' 없이: 123, 123.0 → '123')"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+def _trim_text_column(series):
+    """
+    S/N, log_id 문자열 변환 + 공백 제거 (열 단위), 빈 값은 None
+    - 숫자 셀은 배치 구성(빈 칸 유무에 따른 int/float 열 추론)과 관계없이 같은 문자열로 변환
+    """
+    trimmed = series.map(_code_text, na_action='ignore')
+    return trimmed.where(series.notna() & (trimmed != ''), None)
+
+def clean_qdata_frame(df):
+    """
+    Q-data 배치 정제 (열 단위)
+    - S/N, log_id 문자열 정규화 (숫자 123.0 → '123') + 공백 제거, 빈 문자열은 NULL
+    - S/N이 없는 행 제거
+    - NaN → None (object 타입으로 변환)
+    """
+    df = df.copy()
+    df['serial_number'] = _trim_text_column(df['serial_number'])
+    df['log_id'] = _trim_text_column(df['log_id'])
+    df = df[df['serial_number'].notna()]
+    return df.astype(object).where(df.notna(), None)
+
+def save_qdata_batch(conn, df, uploaded_date):
+    """Q-data 배치 일괄 저장 (INSERT OR IGNORE)
+
+    반환값: (inserted_count, duplicate_count)
+    S/N이 없는 행과 이미 있는 (S/N, log_id) 조합은 중복으로 카운트
+    """
+    cleaned = clean_qdata_frame(df)
+    params = [row + (uploaded_date,) for row in cleaned[QDATA_COLUMNS].itertuples(index=False, name=None)]
+    
+    # executemany의 rowcount = 실제 저장된 건수 (무시된 중복 제외)
+    # total_changes는 일별 집계 트리거의 변경까지 포함하므로 사용하지 않음
+    try:
+        cursor = conn.executemany(QDATA_INSERT_SQL, params)
+        bump_data_version(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    inserted_count = cursor.rowcount
+    
+    return inserted_count, len(df) - inserted_count
+
 def init_qdata_table():
     """Q-data 테이블 초기화"""
-    conn = sqlite3.connect('voc_data.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     # SQL 파일 실행
@@ -725,9 +1680,114 @@ def init_qdata_table():
         cursor.executescript(sql_script)
     
     conn.commit()
-    conn.close()
 # <<< qdata_backend.py 유틸리티 함수 끝 >>>>>
 
+# ========== 업로드 작업 큐 ==========
+
+# 대용량 엑셀 업로드는 요청 안에서 처리하지 않고 파일을 디스크에 저장한 뒤
+# 백그라운드 작업으로 처리한다. 진행 상황은 /api/jobs/<job_id>로 조회.
+# 별칭 변경 후 재매핑처럼 파일이 없는 작업도 같은 큐를 사용한다 (submit_job).
+UPLOAD_JOB_FOLDER = os.path.join(app.config['UPLOAD_FOLDER'], 'jobs')
+UPLOAD_JOB_RETENTION = timedelta(hours=1)  # 완료된 작업 정보 보관 시간
+os.makedirs(UPLOAD_JOB_FOLDER, exist_ok=True)
+
+upload_executor = ThreadPoolExecutor(max_workers=2)
+_upload_jobs = {}
+_upload_jobs_lock = threading.Lock()
+
+def update_job(job_id, **fields):
+    """작업 상태 갱신"""
+    with _upload_jobs_lock:
+        _upload_jobs[job_id].update(fields)
+
+def get_job(job_id):
+    """작업 상태 조회 (처리 속도 포함)"""
+    with _upload_jobs_lock:
+        job = _upload_jobs.get(job_id)
+        if job is None:
+            return None
+        job = dict(job)
+    
+    started_at = job.pop('_started', None)
+    finished_at = job.pop('_finished', None)
+    if started_at is not None:
+        elapsed = ((finished_at or datetime.now()) - started_at).total_seconds()
+        job['elapsed'] = round(elapsed, 2)
+        job['rows_per_second'] = round(job['rows_processed'] / elapsed, 1) if elapsed > 0 else 0.0
+    return job
+
+def _cleanup_jobs():
+    """보관 시간이 지난 완료 작업 삭제"""
+    expire_before = datetime.now() - UPLOAD_JOB_RETENTION
+    with _upload_jobs_lock:
+        for job_id in [job_id for job_id, job in _upload_jobs.items()
+                       if job['_finished'] and job['_finished'] < expire_before]:
+            del _upload_jobs[job_id]
+
+def _run_upload_job(job_id, worker, args, file_path=None):
+    """작업 실행 래퍼 (상태 기록 및 임시 파일 삭제)"""
+    started_at = datetime.now()
+    update_job(job_id, status='running', _started=started_at)
+    label = '업로드' if file_path else '작업'
+    try:
+        result = worker(job_id, *args)
+        update_job(job_id, status='done', phase='done', result=result)
+    except Exception as e:
+        print(f"{label} 작업 실패 ({job_id}): {str(e)}")
+        update_job(job_id, status='failed', phase='failed', error=f'{label} 실패: {str(e)}')
+    finally:
+        # 실패한 작업이 남긴 미완료 트랜잭션 취소 (스레드 연결은 계속 재사용)
+        reset_thread_db()
+        finished_at = datetime.now()
+        update_job(job_id, _finished=finished_at, finished_at=finished_at.strftime('%Y-%m-%d %H:%M:%S'))
+        if file_path:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+def _register_job(job_type, filename=None):
+    """작업 상태 등록 → job_id"""
+    _cleanup_jobs()
+    
+    job_id = uuid.uuid4().hex
+    with _upload_jobs_lock:
+        _upload_jobs[job_id] = {
+            'job_id': job_id,
+            'type': job_type,
+            'filename': filename,
+            'status': 'queued',
+            'phase': 'queued',  # queued → reading → parsing → writing → done/failed
+            'rows_total': None,
+            'rows_processed': 0,
+            'result': None,
+            'error': None,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'finished_at': None,
+            '_finished': None
+        }
+    return job_id
+
+def submit_upload_job(job_type, file, worker):
+    """업로드 파일을 디스크에 저장하고 백그라운드 작업 등록"""
+    job_id = _register_job(job_type, file.filename)
+    file_path = os.path.join(UPLOAD_JOB_FOLDER, job_id + os.path.splitext(file.filename)[1].lower())
+    file.save(file_path)
+    
+    upload_executor.submit(_run_upload_job, job_id, worker, (file_path, file.filename), file_path)
+    return job_id
+
+def submit_job(job_type, worker, *args):
+    """파일 없는 백그라운드 작업 등록 (worker(job_id, *args) 실행, 진행 상황은 /api/jobs/<job_id>)"""
+    job_id = _register_job(job_type)
+    upload_executor.submit(_run_upload_job, job_id, worker, args)
+    return job_id
+
+def read_spooled_excel(file_path, filename):
+    """디스크에 저장된 업로드 파일을 read_excel_with_drm으로 읽기"""
+    with open(file_path, 'rb') as f:
+        return read_excel_with_drm(FileStorage(stream=f, filename=filename))
+
 # ========== API 엔드포인트 ==========
 @app.route('/')
 def index():
@@ -744,8 +1804,14 @@ def statistics_page():
     """통계 페이지"""
     return render_template('statistics.html')
 
-def process_voc_row(row, file_filename):
-    """VOC 데이터 한 행 처리"""
+def process_voc_row(row, file_filename, lookups=None):
+    """VOC 데이터 한 행 처리 (업로드는 같은 규칙을 컬럼 단위로 적용하는 extract_voc_frame 사용)
+
+    lookups: load_voc_lookups() 결과 (칩셋 매핑 / 앱 키워드를 행마다 DB에서 조회하지 않도록 전달)
+    """
+    if lookups is None:
+        lookups = load_voc_lookups()
+    
     try:
         case_code = str(row.iloc[0]) if pd.notna(row.iloc[0]) else None  # A열
         title = str(row.iloc[7]) if pd.notna(row.iloc[7]) else None  # H열
@@ -759,30 +1825,31 @@ def process_voc_row(row, file_filename):
         if not case_code:
             return None, None, None
         
-        # 데이터 추출
+        # 데이터 추출 (재현경로는 한 번만 파싱)
+        reproduction_fields = parse_reproduction_path(reproduction)
         model_no = None  # 초기화
         watch_model = extract_watch_model(title)
         if watch_model:
             model_name = watch_model
         else:
             model_from_title = extract_model_from_title(title)
-            model_no = extract_model_from_reproduction(reproduction)
+            model_no = reproduction_fields['model_no']
             model_name = model_no or model_from_title
         
         # 모델명 매핑
-        model_name = map_model_name(model_name)
+        model_name = map_model_name(model_name, lookups['model_aliases'])
         
-        build_version = extract_build_version(reproduction)
-        os_version = extract_os_version(reproduction)
-        original_content = extract_original_content(reproduction)
+        build_version = reproduction_fields['build_version']
+        os_version = reproduction_fields['os_version']
+        original_content = reproduction_fields['original_content']
         issue_type = detect_issue_type(problem, reproduction)
         
         # 칩셋 매핑
-        chipset = get_chipset_for_model(model_name)
+        chipset = get_chipset_for_model(model_name, lookups['chipset_map'])
         
         # 3rd party 앱 감지
         search_text = f"{problem or ''} {original_content or ''}"
-        third_party_app = detect_third_party_app(search_text)
+        third_party_app = detect_third_party_app(search_text, lookups['app_matcher'])
         
         # 생성일자 추출 (사례코드에서 또는 파일명에서)
         created_date = None
@@ -827,9 +1894,301 @@ def process_voc_row(row, file_filename):
         print(f"Row processing error: {str(e)}")
         return None, None, None
 
+# ========== 컬럼 단위 VOC 추출 ==========
+
+# 엑셀 열 위치 (A, H, M, N, O, R, U, V)
+VOC_SOURCE_COLUMNS = {
+    'case_code': 0,
+    'title': 7,
+    'problem': 12,
+    'reproduction': 13,
+    'resolver': 14,
+    'resolve_option': 17,
+    'cause': 20,
+    'solution': 21
+}
+
+VOC_OUTPUT_COLUMNS = [
+    'case_code', 'title', 'model_name', 'model_no', 'chipset', 'build_version',
+    'os_version', 'issue_type', 'problem', 'original_content', 'reproduction',
+    'resolver', 'resolve_option', 'cause', 'solution', 'third_party_app',
+    'created_date', 'is_unmapped'
+]
+
+def _none_if_na(series):
+    """NaN → None (object 컬럼으로 변환)"""
+    return series.astype(object).where(series.notna(), None)
+
+def _text_column(series):
+    """process_voc_row의 str(value) if pd.notna(value) else None 과 동일한 변환"""
+    return _none_if_na(series.map(str, na_action='ignore'))
+
+def _extract_column(series, pattern):
+    """정규식 첫 번째 그룹 추출 (미일치/None → NaN)"""
+    return series.str.extract(pattern, expand=False)
+
+def _map_unique(series, func):
+    """고유값 단위로 함수 적용 (같은 값이 반복되는 컬럼용)"""
+    values = series.dropna().unique()
+    mapping = {value: func(value) for value in values}
+    return _none_if_na(series.map(mapping))
+
+def _parse_case_code_date(date_str):
+    """사례코드 날짜(YYMMDD) → YYYY-MM-DD"""
+    try:
+        return datetime.strptime(date_str, '%y%m%d').strftime('%Y-%m-%d')
+    except:
+        return None
+
+def _filename_created_date(file_filename):
+    """파일명에서 날짜(YYYYMMDD) 추출"""
+    date_match = re.search(r'(\d{8})', str(file_filename))
+    if date_match:
+        try:
+            return datetime.strptime(date_match.group(1), '%Y%m%d').strftime('%Y-%m-%d')
+        except:
+            pass
+    return None
+
+def extract_voc_frame(df, file_filename, lookups=None):
+    """VOC 엑셀 전체를 컬럼 단위로 추출 (process_voc_row를 모든 행에 적용한 결과와 동일)
+
+    반환: VOC_OUTPUT_COLUMNS 컬럼의 DataFrame (사례코드가 없는 행은 제외, 값이 없으면 None)
+    """
+    if lookups is None:
+        lookups = load_voc_lookups()
+    
+    if df.shape[1] <= max(VOC_SOURCE_COLUMNS.values()):
+        # 열 개수가 부족하면 process_voc_row와 마찬가지로 모든 행을 건너뜀
+        return pd.DataFrame(columns=VOC_OUTPUT_COLUMNS)
+    
+    out = pd.DataFrame({
+        name: _text_column(df.iloc[:, position])
+        for name, position in VOC_SOURCE_COLUMNS.items()
+    })
+    out = out[out['case_code'].notna() & (out['case_code'] != '')]
+    
+    title = out['title'].fillna('').astype(str)
+    problem = out['problem'].fillna('').astype(str)
+    reproduction = out['reproduction'].fillna('').astype(str)
+    
+    # 모델명: 타이틀의 '워치' → 재현경로 [Model No.] → 타이틀의 SM-XXXX 순
+    title_lower = title.str.lower()
+    watch_model = _extract_column(title, WATCH_EN_PATTERN).str.upper()
+    watch_model = watch_model.fillna(_extract_column(title, WATCH_KO_PATTERN).str.upper())
+    watch_model = watch_model.mask(watch_model.isna() & title_lower.str.contains('watch', regex=False), 'WATCH')
+    watch_model = watch_model.mask(watch_model.isna() & title_lower.str.contains('워치', regex=False), '워치')
+    has_watch = watch_model.notna()
+    
+    # 재현경로 태그는 parse_reproduction_path로 한 번에 파싱
+    reproduction_fields = pd.DataFrame(
+        reproduction.map(parse_reproduction_path).tolist(),
+        index=reproduction.index,
+        columns=[field for field, _ in REPRODUCTION_FIELDS]
+    )
+    
+    model_from_title = _extract_column(title, SM_MODEL_PATTERN).str.upper()
+    model_no = reproduction_fields['model_no'].where(~has_watch)
+    
+    # model_no or model_from_title (빈 문자열은 False 취급)
+    model_name = model_no.where(model_no.notna() & (model_no != ''), model_from_title)
+    model_name = watch_model.where(has_watch, model_name)
+    model_aliases = lookups['model_aliases']
+    out['model_name'] = _map_unique(model_name, lambda name: map_model_name(name, model_aliases))
+    out['model_no'] = _none_if_na(model_no)
+    
+    out['build_version'] = _none_if_na(reproduction_fields['build_version'])
+    out['os_version'] = _none_if_na(reproduction_fields['os_version'])
+    original_content = reproduction_fields['original_content']
+    out['original_content'] = _none_if_na(original_content)
+    
+    issue_text = (problem + ' ' + reproduction).str.lower()
+    out['issue_type'] = issue_text.str.contains(EXTERNAL_ISSUE_PATTERN).map({True: '외부이슈', False: '내부이슈'})
+    
+    # 칩셋 매핑 / 3rd party 앱 (lookups 캐시 사용, DB 조회 없음)
+    out['chipset'] = _none_if_na(out['model_name'].map(lookups['chipset_map']))
+    search_text = problem + ' ' + original_content.fillna('').astype(str)
+    app_matcher = lookups['app_matcher']
+    out['third_party_app'] = _none_if_na(search_text.map(lambda text: detect_third_party_app(text, app_matcher)))
+    
+    # 생성일자: 'P'로 시작하는 사례코드는 사례코드의 날짜, 그 외에는 파일명의 날짜
+    case_code = out['case_code']
+    is_p_code = case_code.str.startswith('P')
+    case_code_date = _map_unique(_extract_column(case_code, CASE_CODE_DATE_PATTERN), _parse_case_code_date)
+    out['created_date'] = case_code_date.where(is_p_code, _filename_created_date(file_filename))
+    out['created_date'] = _none_if_na(out['created_date'])
+    
+    out['is_unmapped'] = out['chipset'].isna() & out['model_name'].notna()
+    
+    return out[VOC_OUTPUT_COLUMNS].reset_index(drop=True)
+
+VOC_UPSERT_SQL = """INSERT INTO internal_voc
+    (case_code, title, model_name, model_no, chipset, build_version,
+     os_version, issue_type, problem, original_content, reproduction_path,
+     resolver, resolve_option, cause, solution, third_party_app,
+     created_date, uploaded_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(case_code) DO UPDATE SET
+        model_name = excluded.model_name,
+        cause = excluded.cause,
+        solution = excluded.solution,
+        uploaded_date = excluded.uploaded_date"""
+
+def fetch_existing_case_codes(c, case_codes, batch_size=500):
+    """이미 저장된 사례코드 조회 (SQLite 변수 개수 제한 때문에 나눠서 조회)"""
+    existing = set()
+    case_codes = list(case_codes)
+    for start in range(0, len(case_codes), batch_size):
+        batch = case_codes[start:start + batch_size]
+        placeholders = ', '.join('?' * len(batch))
+        c.execute(f"SELECT case_code FROM internal_voc WHERE case_code IN ({placeholders})", batch)
+        existing.update(row[0] for row in c.fetchall())
+    return existing
+
+def save_voc_chunk(conn, records, uploaded_date):
+    """VOC 청크 일괄 저장 (신규는 INSERT, 기존 사례코드는 모델명/원인/대책만 UPDATE)
+
+    records: [(case_code, voc_data), ...]
+    반환값: (inserted_count, updated_count)
+    """
+    if not records:
+        return 0, 0
+    
+    c = conn.cursor()
+    existing = fetch_existing_case_codes(c, {case_code for case_code, _ in records})
+    
+    inserted_count = 0
+    updated_count = 0
+    upsert_params = []
+    update_params = []
+    seen = set()
+    for case_code, voc_data in records:
+        if case_code in existing:
+            # DB에 이미 있는 사례코드는 모델명, U열(원인), V열(대책)만 업데이트
+            update_params.append((voc_data['model_name'], voc_data['cause'], voc_data['solution'],
+                                  uploaded_date, case_code))
+            updated_count += 1
+            continue
+        
+        # 같은 파일 안에서 중복된 사례코드는 두 번째부터 ON CONFLICT로 UPDATE 처리됨
+        if case_code in seen:
+            updated_count += 1
+        else:
+            inserted_count += 1
+            seen.add(case_code)
+        
+        upsert_params.append((case_code, voc_data['title'], voc_data['model_name'], voc_data['model_no'],
+                              voc_data['chipset'], voc_data['build_version'], voc_data['os_version'],
+                              voc_data['issue_type'], voc_data['problem'], voc_data['original_content'],
+                              voc_data['reproduction'], voc_data['resolver'], voc_data['resolve_option'],
+                              voc_data['cause'], voc_data['solution'], voc_data['third_party_app'],
+                              voc_data['created_date'], uploaded_date))
+    
+    # 청크 하나를 하나의 트랜잭션으로 저장
+    try:
+        if update_params:
+            c.executemany("""UPDATE internal_voc
+                             SET model_name = ?, cause = ?, solution = ?, uploaded_date = ?
+                             WHERE case_code = ?""", update_params)
+        if upsert_params:
+            c.executemany(VOC_UPSERT_SQL, upsert_params)
+        bump_data_version(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    
+    return inserted_count, updated_count
+
+def save_voc_rows(conn, records, uploaded_date):
+    """청크 저장이 실패했을 때 한 행씩 저장 (실패한 행만 건너뜀)
+
+    반환값: (inserted_count, updated_count, error_count)
+    """
+    inserted_count = 0
+    updated_count = 0
+    error_count = 0
+    for record in records:
+        try:
+            row_inserted, row_updated = save_voc_chunk(conn, [record], uploaded_date)
+            inserted_count += row_inserted
+            updated_count += row_updated
+        except Exception as e:
+            error_count += 1
+            print(f"Row error ({record[0]}): {str(e)}")
+    return inserted_count, updated_count, error_count
+
+def run_internal_voc_upload(job_id, file_path, filename):
+    """사내 VOC 업로드 작업 (백그라운드 실행)"""
+    update_job(job_id, phase='reading')
+    
+    # DRM 처리 엑셀 파일 읽기
+    df = read_spooled_excel(file_path, filename)
+    print(f"엑셀 파일 읽기 성공: {len(df)}행")
+    
+    update_job(job_id, phase='parsing', rows_total=len(df))
+    
+    # 칩셋 매핑 / 앱 키워드는 업로드 시작 시 한 번만 조회
+    lookups = load_voc_lookups()
+    
+    # 전체 행을 컬럼 단위로 한 번에 추출
+    voc_df = extract_voc_frame(df, filename, lookups)
+    unmapped_models = set(voc_df.loc[voc_df['is_unmapped'], 'model_name'])
+    total_rows = len(voc_df)
+    print(f"데이터 추출 완료: {total_rows}행")
+    
+    update_job(job_id, phase='writing', rows_total=total_rows, rows_processed=0)
+    
+    conn = get_db()
+    
+    inserted_count = 0
+    updated_count = 0
+    error_count = 0
+    chunk_size = 1000  # 청크 크기
+    uploaded_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # 청크 단위로 저장 (청크마다 사례코드 일괄 조회 + executemany + 커밋 1회)
+    for chunk_start in range(0, total_rows, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, total_rows)
+        chunk_df = voc_df.iloc[chunk_start:chunk_end]
+        
+        records = [(voc_data['case_code'], voc_data) for voc_data in chunk_df.to_dict('records')]
+        
+        try:
+            chunk_inserted, chunk_updated = save_voc_chunk(conn, records, uploaded_date)
+            inserted_count += chunk_inserted
+            updated_count += chunk_updated
+        except Exception as e:
+            # 한 행 때문에 청크 전체가 롤백되므로 행 단위로 다시 저장해 실패한 행만 제외
+            print(f"Chunk {chunk_start + 1}-{chunk_end} error: {str(e)} → 행 단위로 다시 저장")
+            chunk_inserted, chunk_updated, chunk_errors = save_voc_rows(conn, records, uploaded_date)
+            inserted_count += chunk_inserted
+            updated_count += chunk_updated
+            error_count += chunk_errors
+        
+        update_job(job_id, rows_processed=chunk_end)
+        print(f"진행률: {chunk_end}/{total_rows} ({chunk_end/total_rows*100:.1f}%)")
+    
+    success_count = inserted_count + updated_count
+    print(f"업로드 완료: 신규 {inserted_count}건, 업데이트 {updated_count}건, 실패 {error_count}건")
+    
+    # 결과 메시지 구성
+    message = f'업로드 완료: {success_count}건 성공 (신규 {inserted_count}건, 업데이트 {updated_count}건), {error_count}건 실패'
+    if unmapped_models:
+        message += f'\n칩셋 미매핑 모델: {len(unmapped_models)}개'
+    
+    return {
+        'success': True,
+        'message': message,
+        'inserted': inserted_count,
+        'updated': updated_count,
+        'errors': error_count,
+        'unmapped_models': list(unmapped_models) if unmapped_models else []
+    }
+
 @app.route('/api/upload/internal_voc', methods=['POST'])
 def upload_internal_voc():
-    """사내 VOC 엑셀 업로드"""
+    """사내 VOC 엑셀 업로드 (백그라운드 작업 등록 후 job_id 반환)"""
     try:
         if 'file' not in request.files:
             return jsonify({'error': '파일이 없습니다.'}), 400
@@ -842,181 +2201,117 @@ def upload_internal_voc():
             return jsonify({'error': '엑셀 파일만 업로드 가능합니다.'}), 400
         
         print(f"파일 업로드 시작: {file.filename}")
-        
-        # DRM 처리 엑셀 파일 읽기
-        try:
-            df = read_excel_with_drm(file)
-            print(f"엑셀 파일 읽기 성공: {len(df)}행")
-        except Exception as e:
-            print(f"엑셀 파일 읽기 실패: {str(e)}")
-            return jsonify({'error': str(e)}), 400
-        
-        conn = sqlite3.connect('voc_data.db')
-        c = conn.cursor()
-        
-        success_count = 0
-        error_count = 0
-        unmapped_models = set()
-        chunk_size = 1000  # 청크 크기
-        total_rows = len(df)
-        
-        print(f"데이터 처리 시작: 총 {total_rows}행")
-        
-        # 청크 단위로 처리
-        for chunk_start in range(0, total_rows, chunk_size):
-            chunk_end = min(chunk_start + chunk_size, total_rows)
-            chunk_df = df.iloc[chunk_start:chunk_end]
-            
-            print(f"청크 처리 중: {chunk_start + 1}-{chunk_end}/{total_rows}")
-            
-            for idx, row in chunk_df.iterrows():
-                try:
-                    case_code, voc_data, is_unmapped = process_voc_row(row, file.filename)
-                    
-                    if case_code is None:
-                        continue
-                    
-                    if is_unmapped:
-                        unmapped_models.add(voc_data['model_name'])
-                    
-                    # 중복 데이터 확인 및 처리
-                    c.execute("SELECT id FROM internal_voc WHERE case_code = ?", (case_code,))
-                    existing_record = c.fetchone()
-                    
-                    if existing_record:
-                        # 기존 데이터가 있으면 모델명, U열(원인), V열(대책) 업데이트
-                        c.execute("""UPDATE internal_voc
-                                    SET model_name = ?, cause = ?, solution = ?, uploaded_date = ?
-                                    WHERE case_code = ?""",
-                                 (voc_data['model_name'], voc_data['cause'], voc_data['solution'], 
-                                  datetime.now().strftime('%Y-%m-%d %H:%M:%S'), case_code))
-                    else:
-                        # 새 데이터이면 전체 삽입
-                        c.execute("""INSERT INTO internal_voc 
-                                    (case_code, title, model_name, model_no, chipset, build_version, 
-                                     os_version, issue_type, problem, original_content, reproduction_path,
-                                     resolver, resolve_option, cause, solution, third_party_app, 
-                                     created_date, uploaded_date)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                                 (case_code, voc_data['title'], voc_data['model_name'], voc_data['model_no'], 
-                                  voc_data['chipset'], voc_data['build_version'], voc_data['os_version'], 
-                                  voc_data['issue_type'], voc_data['problem'], voc_data['original_content'], 
-                                  voc_data['reproduction'], voc_data['resolver'], voc_data['resolve_option'], 
-                                  voc_data['cause'], voc_data['solution'], voc_data['third_party_app'],
-                                  voc_data['created_date'], datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-                    
-                    success_count += 1
-                    
-                    # 100행마다 커밋하여 메모리 해제
-                    if success_count % 100 == 0:
-                        conn.commit()
-                        print(f"진행률: {success_count}/{total_rows} ({success_count/total_rows*100:.1f}%)")
-                
-                except Exception as e:
-                    error_count += 1
-                    print(f"Row {idx} error: {str(e)}")
-        
-        conn.commit()
-        conn.close()
-        
-        print(f"업로드 완료: 성공 {success_count}건, 실패 {error_count}건")
-        
-        # 결과 메시지 구성
-        message = f'업로드 완료: {success_count}건 성공, {error_count}건 실패'
-        if unmapped_models:
-            message += f'\n칩셋 미매핑 모델: {len(unmapped_models)}개'
+        job_id = submit_upload_job('internal_voc', file, run_internal_voc_upload)
         
         return jsonify({
             'success': True,
-            'message': message,
-            'unmapped_models': list(unmapped_models) if unmapped_models else []
-        })
+            'job_id': job_id,
+            'message': '업로드 작업이 등록되었습니다.'
+        }), 202
     
     except Exception as e:
         print(f"업로드 실패: {str(e)}")
         return jsonify({'error': f'업로드 실패: {str(e)}'}), 500
 
-@app.route('/api/upload/chipset_mapping', methods=['POST'])
-def upload_chipset_mapping():
-    """칩셋 매핑 파일 업로드"""
-    try:
-        if 'file' not in request.files:
-            return jsonify({'error': '파일이 없습니다.'}), 400
-        
-        file = request.files['file']
-        
-        # DRM 처리 엑셀 파일 읽기
-        try:
-            df = read_excel_with_drm(file)
-        except Exception as e:
-            return jsonify({'error': str(e)}), 400
+def run_chipset_mapping_upload(job_id, file_path, filename):
+    """칩셋 매핑 업로드 작업 (백그라운드 실행)"""
+    update_job(job_id, phase='reading')
+    
+    # DRM 처리 엑셀 파일 읽기
+    df = read_spooled_excel(file_path, filename)
+    
+    conn = get_db()
+    c = conn.cursor()
+    
+    success_count = 0
+    update_count = 0
+    duplicate_count = 0
+    
+    update_job(job_id, phase='parsing', rows_total=len(df))
+    
+    # 모델명과 칩셋명 저장
+    model_chipset_pairs = []
+    for _, row in df.iterrows():
+        model_name = str(row.iloc[0]).strip()
+        chipset = str(row.iloc[1]).strip()
         
-        conn = sqlite3.connect('voc_data.db')
-        c = conn.cursor()
+        if model_name and chipset:
+            model_chipset_pairs.append((model_name, chipset))
+    
+    # 칩셋명 병합
+    all_chipsets = [chipset for _, chipset in model_chipset_pairs]
+    merged_chipsets = merge_similar_chipsets(all_chipsets)
+    
+    update_job(job_id, phase='writing', rows_total=len(model_chipset_pairs), rows_processed=0)
+    
+    # 병합된 칩셋명으로 매핑 저장 및 업데이트
+    for index, (model_name, chipset) in enumerate(model_chipset_pairs, 1):
+        # 병합된 칩셋명 사용
+        final_chipset = merged_chipsets.get(chipset, chipset)
         
-        success_count = 0
-        update_count = 0
-        duplicate_count = 0
+        if chipset != final_chipset:
+            print(f"칩셋명 병합: {chipset} -> {final_chipset}")
         
-        # 모델명과 칩셋명 저장
-        model_chipset_pairs = []
-        for _, row in df.iterrows():
-            model_name = str(row.iloc[0]).strip()
-            chipset = str(row.iloc[1]).strip()
+        try:
+            c.execute("INSERT INTO chipset_mapping (model_name, chipset) VALUES (?, ?)",
+                     (model_name, final_chipset))
+            success_count += 1
             
-            if model_name and chipset:
-                model_chipset_pairs.append((model_name, chipset))
-        
-        # 칩셋명 병합
-        all_chipsets = [chipset for _, chipset in model_chipset_pairs]
-        merged_chipsets = merge_similar_chipsets(all_chipsets)
-        
-        # 병합된 칩셋명으로 매핑 저장 및 업데이트
-        for model_name, chipset in model_chipset_pairs:
-            # 병합된 칩셋명 사용
-            final_chipset = merged_chipsets.get(chipset, chipset)
+            # 관련 VOC 데이터의 칩셋도 업데이트
+            c.execute("UPDATE internal_voc SET chipset = ? WHERE model_name = ?",
+                     (final_chipset, model_name))
             
-            if chipset != final_chipset:
-                print(f"칩셋명 병합: {chipset} -> {final_chipset}")
+            print(f"칩셋 매핑: {model_name} -> {final_chipset}")
             
-            try:
-                c.execute("INSERT INTO chipset_mapping (model_name, chipset) VALUES (?, ?)",
-                         (model_name, final_chipset))
-                success_count += 1
+        except sqlite3.IntegrityError as e:
+            if "UNIQUE constraint failed" in str(e):
+                # 중복 모델명이면 칩셋만 업데이트
+                c.execute("UPDATE chipset_mapping SET chipset = ? WHERE model_name = ?",
+                         (final_chipset, model_name))
                 
                 # 관련 VOC 데이터의 칩셋도 업데이트
                 c.execute("UPDATE internal_voc SET chipset = ? WHERE model_name = ?",
                          (final_chipset, model_name))
                 
-                print(f"칩셋 매핑: {model_name} -> {final_chipset}")
-                
-            except sqlite3.IntegrityError as e:
-                if "UNIQUE constraint failed" in str(e):
-                    # 중복 모델명이면 칩셋만 업데이트
-                    c.execute("UPDATE chipset_mapping SET chipset = ? WHERE model_name = ?",
-                             (final_chipset, model_name))
-                    
-                    # 관련 VOC 데이터의 칩셋도 업데이트
-                    c.execute("UPDATE internal_voc SET chipset = ? WHERE model_name = ?",
-                             (final_chipset, model_name))
-                    
-                    update_count += 1
-                    duplicate_count += 1
-                    print(f"칩셋 업데이트: {model_name} -> {final_chipset}")
-                else:
-                    raise e
+                update_count += 1
+                duplicate_count += 1
+                print(f"칩셋 업데이트: {model_name} -> {final_chipset}")
+            else:
+                raise e
         
-        conn.commit()
-        conn.close()
+        if index % 100 == 0:
+            update_job(job_id, rows_processed=index)
+    
+    update_job(job_id, rows_processed=len(model_chipset_pairs))
+    
+    bump_data_version(conn)
+    invalidate_voc_lookups(conn)
+    conn.commit()
+    
+    message = f'{success_count}개의 칩셋 매핑이 등록되었습니다.'
+    if update_count > 0:
+        message += f' {update_count}개가 업데이트되었습니다.'
+    
+    return {
+        'success': True,
+        'message': message
+    }
+
+@app.route('/api/upload/chipset_mapping', methods=['POST'])
+def upload_chipset_mapping():
+    """칩셋 매핑 파일 업로드 (백그라운드 작업 등록 후 job_id 반환)"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': '파일이 없습니다.'}), 400
         
-        message = f'{success_count}개의 칩셋 매핑이 등록되었습니다.'
-        if update_count > 0:
-            message += f' {update_count}개가 업데이트되었습니다.'
+        file = request.files['file']
+        job_id = submit_upload_job('chipset_mapping', file, run_chipset_mapping_upload)
         
         return jsonify({
             'success': True,
-            'message': message
-        })
+            'job_id': job_id,
+            'message': '업로드 작업이 등록되었습니다.'
+        }), 202
     
     except Exception as e:
         return jsonify({'error': f'업로드 실패: {str(e)}'}), 500
@@ -1036,7 +2331,7 @@ def upload_app_keywords():
         except Exception as e:
             return jsonify({'error': str(e)}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 기존 데이터 삭제
@@ -1052,8 +2347,9 @@ def upload_app_keywords():
                          (app_name, keywords))
                 success_count += 1
         
+        bump_data_version(conn)
+        invalidate_voc_lookups(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1063,36 +2359,212 @@ def upload_app_keywords():
     except Exception as e:
         return jsonify({'error': f'업로드 실패: {str(e)}'}), 500
 
+def run_app_rescan(job_id):
+    """현재 앱 키워드로 기존 VOC 전체의 3rd party 앱 재태깅 (백그라운드 실행)"""
+    app_matcher = load_voc_lookups()['app_matcher']
+    
+    conn = get_db()
+    c = conn.cursor()
+    
+    total_rows = c.execute("SELECT COUNT(*) FROM internal_voc").fetchone()[0]
+    update_job(job_id, phase='writing', rows_total=total_rows, rows_processed=0)
+    
+    batch_size = 5000
+    last_id = 0
+    scanned_count = 0
+    updated_count = 0
+    
+    # id 기준으로 나눠서 조회/업데이트 (배치마다 커밋)
+    while True:
+        c.execute("""
+            SELECT id, problem, original_content, third_party_app
+            FROM internal_voc
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (last_id, batch_size))
+        rows = c.fetchall()
+        if not rows:
+            break
+        
+        updates = []
+        for voc_id, problem, original_content, current_app in rows:
+            # 업로드 시와 동일한 검색 텍스트 구성
+            search_text = f"{problem or ''} {original_content or ''}"
+            third_party_app = detect_third_party_app(search_text, app_matcher)
+            if third_party_app != current_app:
+                updates.append((third_party_app, voc_id))
+        
+        if updates:
+            c.executemany("UPDATE internal_voc SET third_party_app = ? WHERE id = ?", updates)
+            bump_data_version(conn)
+            conn.commit()
+        
+        scanned_count += len(rows)
+        updated_count += len(updates)
+        last_id = rows[-1][0]
+        update_job(job_id, rows_processed=scanned_count)
+    
+    return {
+        'success': True,
+        'message': f'3rd party 앱 재태깅 완료: {scanned_count}건 중 {updated_count}건 변경',
+        'scanned': scanned_count,
+        'updated': updated_count
+    }
+
+@app.route('/api/app-keywords/rescan', methods=['POST'])
+def rescan_third_party_apps():
+    """3rd party 앱 재태깅 (백그라운드 작업 등록 후 job_id 반환)"""
+    try:
+        job_id = submit_job('app_rescan', run_app_rescan)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'message': '재태깅 작업이 등록되었습니다.'
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'error': f'재태깅 실패: {str(e)}'}), 500
+
+def run_reproduction_backfill(job_id):
+    """저장된 재현경로를 다시 파싱하여 모델번호/빌드/OS/원문 컬럼 갱신 (백그라운드 실행)"""
+    conn = get_db()
+    c = conn.cursor()
+    
+    total_rows = c.execute("SELECT COUNT(*) FROM internal_voc").fetchone()[0]
+    update_job(job_id, phase='writing', rows_total=total_rows, rows_processed=0)
+    
+    batch_size = 5000
+    last_id = 0
+    scanned_count = 0
+    updated_count = 0
+    
+    while True:
+        c.execute("""
+            SELECT id, title, reproduction_path, model_no, build_version, os_version, original_content
+            FROM internal_voc
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (last_id, batch_size))
+        rows = c.fetchall()
+        if not rows:
+            break
+        
+        updates = []
+        for voc_id, title, reproduction, *current in rows:
+            fields = parse_reproduction_path(reproduction)
+            # 업로드 시와 동일하게 워치 모델은 모델번호를 저장하지 않음
+            model_no = None if extract_watch_model(title) else fields['model_no']
+            new_values = [model_no, fields['build_version'], fields['os_version'], fields['original_content']]
+            if new_values != current:
+                updates.append((*new_values, voc_id))
+        
+        if updates:
+            c.executemany("""
+                UPDATE internal_voc
+                SET model_no = ?, build_version = ?, os_version = ?, original_content = ?
+                WHERE id = ?
+            """, updates)
+            bump_data_version(conn)
+            conn.commit()
+        
+        scanned_count += len(rows)
+        updated_count += len(updates)
+        last_id = rows[-1][0]
+        update_job(job_id, rows_processed=scanned_count)
+    
+    return {
+        'success': True,
+        'message': f'재현경로 재파싱 완료: {scanned_count}건 중 {updated_count}건 변경',
+        'scanned': scanned_count,
+        'updated': updated_count
+    }
+
+@app.route('/api/backfill/reproduction', methods=['POST'])
+def backfill_reproduction_fields():
+    """재현경로 재파싱 (백그라운드 작업 등록 후 job_id 반환)"""
+    try:
+        job_id = submit_job('reproduction_backfill', run_reproduction_backfill)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'message': '재파싱 작업이 등록되었습니다.'
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'error': f'재파싱 실패: {str(e)}'}), 500
+
+@app.route('/api/rollups/rebuild', methods=['POST'])
+def rebuild_rollups():
+    """일별 집계 테이블 전체 재생성"""
+    try:
+        conn = get_db()
+        c = conn.cursor()
+        
+        start_time = time.perf_counter()
+        result = {rollup: rebuild_rollup(c, rollup) for rollup in ROLLUP_TABLES}
+        bump_data_version(conn)
+        conn.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': '집계 테이블 재생성 완료',
+            'rollups': result,
+            'elapsed': round(time.perf_counter() - start_time, 2)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': f'재생성 실패: {str(e)}'}), 500
+
+@app.route('/api/rollups/check', methods=['GET'])
+def check_rollups():
+    """일별 집계 테이블과 원본 건수 일치 여부 확인"""
+    try:
+        conn = get_db()
+        c = conn.cursor()
+        
+        result = {rollup: check_rollup(c, rollup) for rollup in ROLLUP_TABLES}
+        
+        return jsonify({
+            'success': True,
+            'consistent': all(item['consistent'] for item in result.values()),
+            'rollups': result
+        })
+    
+    except Exception as e:
+        return jsonify({'error': f'확인 실패: {str(e)}'}), 500
+
 @app.route('/api/dashboard/daily')
 def get_daily_dashboard():
     """일일 대시보드 데이터"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
         # 어제 날짜
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
         # 전일 VOC 건수
-        query_daily = """
-            SELECT COUNT(*) as count
-            FROM internal_voc
-            WHERE DATE(created_date) = ?
+        query_daily = f"""
+            SELECT COALESCE(SUM(count), 0) as count
+            FROM voc_daily_rollup
+            WHERE {ROLLUP_DAY_RANGE_SQL}
         """
-        df_daily = pd.read_sql_query(query_daily, conn, params=(yesterday,))
+        df_daily = pd.read_sql_query(query_daily, conn, params=(yesterday, yesterday))
         daily_count = df_daily.iloc[0]['count']
         
         # 모델별 Top 10
-        query_top10 = """
-            SELECT model_name, COUNT(*) as count
-            FROM internal_voc
-            WHERE DATE(created_date) = ? AND model_name IS NOT NULL
+        query_top10 = f"""
+            SELECT model_name, SUM(count) as count
+            FROM voc_daily_rollup
+            WHERE {ROLLUP_DAY_RANGE_SQL} AND model_name IS NOT NULL
             GROUP BY model_name
             ORDER BY count DESC
             LIMIT 10
         """
-        df_top10 = pd.read_sql_query(query_top10, conn, params=(yesterday,))
-        
-        conn.close()
+        df_top10 = pd.read_sql_query(query_top10, conn, params=(yesterday, yesterday))
         
         return jsonify({
             'yesterday_date': yesterday,
@@ -1104,55 +2576,58 @@ def get_daily_dashboard():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/statistics/model')
+@conditional_response
+@cached_response
 def get_model_statistics():
     """휴대폰 모델별 통계"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
         query = """
-            SELECT model_name, COUNT(*) as count
-            FROM internal_voc
+            SELECT model_name, SUM(count) as count
+            FROM voc_daily_rollup
             WHERE model_name IS NOT NULL
         """
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(created_date) BETWEEN ? AND ?"
+            query += " AND " + ROLLUP_DAY_RANGE_SQL
             params = [start_date, end_date]
         
         query += " GROUP BY model_name ORDER BY count DESC"
         
         df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
         
-        return jsonify(df.to_dict('records'))
+        return statistics_response(df, 'model_name')
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/statistics/weekly')
+@conditional_response
+@cached_response
 def get_weekly_statistics():
     """주별 통계"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
         query = """
             SELECT 
-                strftime('%Y-%W', created_date) as week,
-                COUNT(*) as count
-            FROM internal_voc
-            WHERE created_date IS NOT NULL
+                week,
+                SUM(count) as count
+            FROM voc_daily_rollup
+            WHERE week IS NOT NULL
         """
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(created_date) BETWEEN ? AND ?"
+            query += " AND " + ROLLUP_DAY_RANGE_SQL
             params = [start_date, end_date]
         
         query += " GROUP BY week ORDER BY week"
@@ -1161,41 +2636,36 @@ def get_weekly_statistics():
         
         # 메모 정보 조회
         c = conn.cursor()
-        c.execute("SELECT week, memo FROM weekly_memos")
-        memos = {row[0]: row[1] for row in c.fetchall()}
-        
-        conn.close()
-        
-        # 메모 정보를 주별 데이터에 추가
-        result = df.to_dict('records')
-        for item in result:
-            item['memo'] = memos.get(item['week'], '')
+        c.execute("SELECT week, memo FROM weekly_memos")
+        memos = {row[0]: row[1] for row in c.fetchall()}
         
-        return jsonify(result)
+        return statistics_response(df, 'week', memos)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/statistics/monthly')
+@conditional_response
+@cached_response
 def get_monthly_statistics():
     """월별 통계"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
         query = """
             SELECT 
-                strftime('%Y-%m', created_date) as month,
-                COUNT(*) as count
-            FROM internal_voc
-            WHERE created_date IS NOT NULL
+                month,
+                SUM(count) as count
+            FROM voc_daily_rollup
+            WHERE month IS NOT NULL
         """
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(created_date) BETWEEN ? AND ?"
+            query += " AND " + ROLLUP_DAY_RANGE_SQL
             params = [start_date, end_date]
         
         query += " GROUP BY month ORDER BY month"
@@ -1207,86 +2677,239 @@ def get_monthly_statistics():
         c.execute("SELECT month, memo FROM monthly_memos")
         memos = {row[0]: row[1] for row in c.fetchall()}
         
-        conn.close()
-        
-        # 메모 정보를 월별 데이터에 추가
-        result = df.to_dict('records')
-        for item in result:
-            item['memo'] = memos.get(item['month'], '')
-        
-        return jsonify(result)
+        return statistics_response(df, 'month', memos)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/statistics/chipset')
+@conditional_response
+@cached_response
 def get_chipset_statistics():
     """칩셋별 통계"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
         query = """
-            SELECT chipset, COUNT(*) as count
-            FROM internal_voc
+            SELECT chipset, SUM(count) as count
+            FROM voc_daily_rollup
             WHERE chipset IS NOT NULL
         """
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(created_date) BETWEEN ? AND ?"
+            query += " AND " + ROLLUP_DAY_RANGE_SQL
             params = [start_date, end_date]
         
         query += " GROUP BY chipset ORDER BY count DESC"
         
         df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
         
-        return jsonify(df.to_dict('records'))
+        return statistics_response(df, 'chipset')
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/statistics/app')
+@conditional_response
+@cached_response
 def get_app_statistics():
     """3rd party 앱별 통계"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
         query = """
-            SELECT third_party_app, COUNT(*) as count
-            FROM internal_voc
+            SELECT third_party_app, SUM(count) as count
+            FROM voc_daily_rollup
             WHERE third_party_app IS NOT NULL
         """
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(created_date) BETWEEN ? AND ?"
+            query += " AND " + ROLLUP_DAY_RANGE_SQL
             params = [start_date, end_date]
         
         query += " GROUP BY third_party_app ORDER BY count DESC"
         
         df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
         
-        return jsonify(df.to_dict('records'))
+        return statistics_response(df, 'third_party_app')
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/voc/search')
+def search_vocs():
+    """
+    VOC 전문 검색
+    - q: 검색어 (공백으로 구분한 단어를 모두 포함)
+    - start_date / end_date / model_name: 필터 (선택)
+    - sort: rank(관련도순, 기본) / recent(최신 등록순)
+    - limit + cursor: 키셋 페이지 (응답의 next_cursor를 그대로 전달)
+    - rank는 최근 일치 VOC_SEARCH_RANK_WINDOW건 안에서만 정렬
+      → 일치 건수가 더 많으면 truncated: true (그 이전 VOC까지 보려면 sort=recent)
+    - 전문 검색 색인이 없으면(SQLite 버전/빌드) LIKE 검색 + recent 정렬 (fulltext: false)
+    """
+    try:
+        text = request.args.get('q', '').strip()
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        model_name = request.args.get('model_name')
+        sort = request.args.get('sort', 'rank')
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', VOC_SEARCH_PAGE_SIZE, type=int)
+        limit = max(1, min(limit, VOC_SEARCH_MAX_PAGE_SIZE))
+        
+        if not text:
+            return jsonify({'error': '검색어를 입력해주세요.'}), 400
+        
+        conn = get_db()
+        c = conn.cursor()
+        
+        fulltext = voc_search_available(c)
+        match, like_terms = build_voc_search_query(text, fulltext)
+        # 관련도(bm25)는 MATCH가 있을 때만 계산 가능
+        if not match:
+            sort = 'recent'
+        
+        # 검색 조건 (MATCH + 짧은 검색어 LIKE + 필터)
+        where = "1=1"
+        params = []
+        if match:
+            where += " AND voc_fts MATCH ?"
+            params.append(match)
+        for pattern in like_terms:
+            conditions = ' OR '.join(f"v.{column} LIKE ? ESCAPE '\\'" for column in VOC_SEARCH_COLUMNS)
+            where += f" AND ({conditions})"
+            params.extend([pattern] * len(VOC_SEARCH_COLUMNS))
+        if start_date and end_date:
+            where += " AND " + CREATED_DATE_RANGE_SQL
+            params.extend([start_date, end_date])
+        if model_name:
+            where += " AND v.model_name = ?"
+            params.append(model_name)
+        
+        truncated = False
+        try:
+            if sort == 'rank':
+                # 최근 일치 VOC_SEARCH_RANK_WINDOW건 안에서 관련도 정렬
+                # (bm25는 일치 행마다 계산되므로 흔한 검색어도 비용이 일정하도록 후보 수 제한)
+                keyset = ""
+                keyset_params = []
+                if cursor:
+                    last_rank, last_id = cursor.split(':')
+                    keyset = "WHERE hits.rank > ? OR (hits.rank = ? AND hits.id > ?)"
+                    keyset_params = [float(last_rank), float(last_rank), int(last_id)]
+                query = f"""
+                    WITH hits AS (
+                        SELECT voc_fts.rowid AS id, voc_fts.rank AS rank
+                        FROM voc_fts
+                        JOIN internal_voc v ON v.id = voc_fts.rowid
+                        WHERE {where}
+                        ORDER BY voc_fts.rowid DESC
+                        LIMIT ?
+                    )
+                    SELECT hits.id, hits.rank FROM hits
+                    {keyset}
+                    ORDER BY hits.rank, hits.id
+                    LIMIT ?
+                """
+                # 후보 범위 밖에 일치 행이 더 있는지 (rank 계산 없이 rowid만 읽음)
+                c.execute(f"""
+                    SELECT 1 FROM voc_fts
+                    JOIN internal_voc v ON v.id = voc_fts.rowid
+                    WHERE {where}
+                    ORDER BY voc_fts.rowid DESC
+                    LIMIT 1 OFFSET ?
+                """, params + [VOC_SEARCH_RANK_WINDOW])
+                truncated = c.fetchone() is not None
+                params = params + [VOC_SEARCH_RANK_WINDOW] + keyset_params + [limit + 1]
+            else:
+                # 색인(FTS 또는 internal_voc)을 id 역순으로 읽다가 limit건에서 멈춤
+                if match:
+                    source = "voc_fts JOIN internal_voc v ON v.id = voc_fts.rowid"
+                    id_column = "voc_fts.rowid"
+                else:
+                    source = "internal_voc v"
+                    id_column = "v.id"
+                if cursor:
+                    where += f" AND {id_column} < ?"
+                    params.append(int(cursor.split(':')[-1]))
+                query = f"""
+                    SELECT {id_column} AS id, NULL AS rank
+                    FROM {source}
+                    WHERE {where}
+                    ORDER BY {id_column} DESC
+                    LIMIT ?
+                """
+                params.append(limit + 1)
+        except ValueError:
+            return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+        
+        c.execute(query, params)
+        hits = c.fetchall()
+        
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            last_id, last_rank = hits[-1]
+            next_cursor = f"{last_rank!r}:{last_id}" if sort == 'rank' else str(last_id)
+        
+        # 현재 페이지 행만 상세 + 스니펫 조회
+        ids = [hit[0] for hit in hits]
+        details = {}
+        snippets = {}
+        if ids:
+            placeholders = ', '.join('?' for _ in ids)
+            c.execute(f"""
+                SELECT id, case_code, model_name, created_date, title
+                FROM internal_voc WHERE id IN ({placeholders})
+            """, ids)
+            columns = [desc[0] for desc in c.description]
+            details = {row[0]: dict(zip(columns, row)) for row in c.fetchall()}
+            if match:
+                c.execute(f"""
+                    SELECT rowid, snippet(voc_fts, -1, '<mark>', '</mark>', '…', 16)
+                    FROM voc_fts WHERE voc_fts MATCH ? AND rowid IN ({placeholders})
+                """, [match] + ids)
+                snippets = dict(c.fetchall())
+        
+        results = []
+        for voc_id, rank in hits:
+            item = details[voc_id]
+            item['snippet'] = snippets.get(voc_id)
+            item['rank'] = rank
+            results.append(item)
+        
+        return jsonify({
+            'results': results,
+            'sort': sort,
+            'fulltext': fulltext,
+            'rank_window': VOC_SEARCH_RANK_WINDOW if sort == 'rank' else None,
+            'truncated': truncated,
+            'next_cursor': next_cursor
+        })
     
+    except sqlite3.OperationalError as e:
+        return jsonify({'error': f'검색 오류: {e}'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/voc/<int:voc_id>')
+@conditional_response
 def get_voc_detail(voc_id):
     """VOC 상세 정보"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
-        c.execute("SELECT * FROM internal_voc WHERE id = ?", (voc_id,))
+        c.execute(f"SELECT {INTERNAL_VOC_SELECT_COLUMNS} FROM internal_voc WHERE id = ?", (voc_id,))
         voc = c.fetchone()
         
         if not voc:
@@ -1304,8 +2927,6 @@ def get_voc_detail(voc_id):
         """, (voc_id,))
         comments = c.fetchall()
         
-        conn.close()
-        
         voc_dict['comments'] = [
             {'id': c[0], 'comment': c[1], 'created_date': c[2]}
             for c in comments
@@ -1326,7 +2947,7 @@ def add_comment(voc_id):
         if not comment:
             return jsonify({'error': '댓글 내용을 입력해주세요.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         c.execute("""
@@ -1334,9 +2955,9 @@ def add_comment(voc_id):
             VALUES (?, 'internal', ?, ?)
         """, (voc_id, comment, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
         
+        bump_data_version(conn)
         conn.commit()
         comment_id = c.lastrowid
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1349,29 +2970,38 @@ def add_comment(voc_id):
 
 @app.route('/api/export/excel')
 def export_to_excel():
-    """엑셀로 내보내기"""
+    """
+    사내 VOC 내보내기
+    - format: xlsx(기본) / csv / parquet
+    - columns: 내보낼 컬럼 (쉼표 구분, 선택)
+    """
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        conn = sqlite3.connect('voc_data.db')
+        try:
+            export_format = parse_export_format(request.args.get('format'))
+            columns = parse_export_columns(request.args.get('columns'), INTERNAL_VOC_EXPORT_COLUMNS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        conn = get_db()
         
-        query = "SELECT * FROM internal_voc"
+        query = f"SELECT {', '.join(columns)} FROM internal_voc"
         params = []
         
         if start_date and end_date:
-            query += " WHERE DATE(created_date) BETWEEN ? AND ?"
+            query += " WHERE " + CREATED_DATE_RANGE_SQL
             params = [start_date, end_date]
         
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
-        
-        # 엑셀 파일 생성
-        filename = f"voc_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        df.to_excel(filepath, index=False)
+        # 같은 기간/컬럼/형식을 데이터 변경 없이 다시 내보내면 보관된 파일 전송
+        key = export_store_key('internal_voc', {'start_date': start_date, 'end_date': end_date},
+                               columns, export_format, get_data_version(conn))
         
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        # 조회 오류는 스트리밍 시작 전에 500으로 응답
+        filename = f"voc_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return stored_export_response(EXPORT_STORE_FOLDER, key, export_format, columns,
+                                      lambda: conn.execute(query, params), filename)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1380,24 +3010,20 @@ def export_to_excel():
 def reset_voc_data():
     """기존 업로드 데이터 초기화"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
-        # VOC 데이터 삭제 건수 확인
-        c.execute("SELECT COUNT(*) FROM internal_voc")
-        voc_count = c.fetchone()[0]
+        # VOC 데이터 삭제 (집계 트리거 없이 전체 삭제, 건수 반환)
+        voc_count = truncate_source_table(c, 'internal_voc')
         
         c.execute("SELECT COUNT(*) FROM comments")
         comment_count = c.fetchone()[0]
         
-        # VOC 데이터 삭제
-        c.execute("DELETE FROM internal_voc")
-        
         # 댓글 데이터 삭제
         c.execute("DELETE FROM comments")
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1411,7 +3037,7 @@ def reset_voc_data():
 def get_unmapped_models():
     """칩셋 미매핑 모델명 조회"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 모델명이 있지만 칩셋이 없는 데이터 조회
@@ -1430,8 +3056,6 @@ def get_unmapped_models():
         c.execute("SELECT COUNT(DISTINCT model_name) FROM internal_voc WHERE model_name IS NOT NULL AND model_name != ''")
         total_models = c.fetchone()[0]
         
-        conn.close()
-        
         return jsonify({
             'success': True,
             'unmapped_models': [{'model_name': row[0], 'count': row[1]} for row in unmapped_models],
@@ -1453,7 +3077,7 @@ def add_chipset_mapping():
         if not model_name or not chipset:
             return jsonify({'error': '모델명과 칩셋명을 모두 입력해주세요.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 기존 매핑 확인
@@ -1475,8 +3099,9 @@ def add_chipset_mapping():
         c.execute("UPDATE internal_voc SET chipset = ? WHERE model_name = ?", 
                  (chipset, model_name))
         
+        bump_data_version(conn)
+        invalidate_voc_lookups(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1496,7 +3121,7 @@ def add_chipset_mapping_batch():
         if not mappings:
             return jsonify({'error': '매핑 데이터가 없습니다.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         success_count = 0
@@ -1534,8 +3159,9 @@ def add_chipset_mapping_batch():
                 errors.append(f'{mapping.get("model_name", "Unknown")}: {str(e)}')
                 error_count += 1
         
+        bump_data_version(conn)
+        invalidate_voc_lookups(conn)
         conn.commit()
-        conn.close()
         
         message = f'일괄 처리 완료: {success_count}건 성공'
         if error_count > 0:
@@ -1556,7 +3182,7 @@ def add_chipset_mapping_batch():
 def update_created_dates():
     """생성일자 업데이트 (파일명에서 날짜 추출)"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # created_date가 NULL인 데이터 조회
@@ -1583,8 +3209,8 @@ def update_created_dates():
                 except:
                     pass
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1598,7 +3224,7 @@ def update_created_dates():
 def get_monthly_memos():
     """전체 월별 메모 조회"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         c.execute("""
@@ -1608,8 +3234,6 @@ def get_monthly_memos():
         """)
         memos = c.fetchall()
         
-        conn.close()
-        
         return jsonify({
             'success': True,
             'memos': [
@@ -1641,7 +3265,7 @@ def add_monthly_memo():
         if not re.match(r'^\d{4}-\d{2}$', month):
             return jsonify({'error': '월 형식이 올바르지 않습니다. (YYYY-MM)'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 기존 메모 확인
@@ -1649,7 +3273,6 @@ def add_monthly_memo():
         existing = c.fetchone()
         
         if existing:
-            conn.close()
             return jsonify({'error': f'{month}월에 이미 메모가 있습니다. 수정을 사용해주세요.'}), 400
         
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -1658,8 +3281,8 @@ def add_monthly_memo():
             VALUES (?, ?, ?, ?)
         """, (month, memo, now, now))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1679,7 +3302,7 @@ def update_monthly_memo(month):
         if not memo:
             return jsonify({'error': '메모를 입력해주세요.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 메모 존재 확인
@@ -1687,7 +3310,6 @@ def update_monthly_memo(month):
         existing = c.fetchone()
         
         if not existing:
-            conn.close()
             return jsonify({'error': f'{month}월에 메모가 없습니다.'}), 404
         
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -1697,8 +3319,8 @@ def update_monthly_memo(month):
             WHERE month = ?
         """, (memo, now, month))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1712,7 +3334,7 @@ def update_monthly_memo(month):
 def delete_monthly_memo(month):
     """월별 메모 삭제"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 메모 존재 확인
@@ -1720,13 +3342,12 @@ def delete_monthly_memo(month):
         existing = c.fetchone()
         
         if not existing:
-            conn.close()
             return jsonify({'error': f'{month}월에 메모가 없습니다.'}), 404
         
         c.execute("DELETE FROM monthly_memos WHERE month = ?", (month,))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1740,7 +3361,7 @@ def delete_monthly_memo(month):
 def get_weekly_memos():
     """전체 주별 메모 조회"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         c.execute("""
@@ -1750,8 +3371,6 @@ def get_weekly_memos():
         """)
         memos = c.fetchall()
         
-        conn.close()
-        
         return jsonify({
             'success': True,
             'memos': [
@@ -1783,7 +3402,7 @@ def add_weekly_memo():
         if not re.match(r'^\d{4}-\d{2}$', week):
             return jsonify({'error': '주 형식이 올바르지 않습니다. (YYYY-WW)'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 기존 메모 확인
@@ -1791,7 +3410,6 @@ def add_weekly_memo():
         existing = c.fetchone()
         
         if existing:
-            conn.close()
             return jsonify({'error': f'{week}주에 이미 메모가 있습니다. 수정을 사용해주세요.'}), 400
         
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -1800,8 +3418,8 @@ def add_weekly_memo():
             VALUES (?, ?, ?, ?)
         """, (week, memo, now, now))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1821,7 +3439,7 @@ def update_weekly_memo(week):
         if not memo:
             return jsonify({'error': '메모를 입력해주세요.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 메모 존재 확인
@@ -1829,7 +3447,6 @@ def update_weekly_memo(week):
         existing = c.fetchone()
         
         if not existing:
-            conn.close()
             return jsonify({'error': f'{week}주에 메모가 없습니다.'}), 404
         
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -1839,8 +3456,8 @@ def update_weekly_memo(week):
             WHERE week = ?
         """, (memo, now, week))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1854,7 +3471,7 @@ def update_weekly_memo(week):
 def delete_weekly_memo(week):
     """주별 메모 삭제"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 메모 존재 확인
@@ -1862,13 +3479,12 @@ def delete_weekly_memo(week):
         existing = c.fetchone()
         
         if not existing:
-            conn.close()
             return jsonify({'error': f'{week}주에 메모가 없습니다.'}), 404
         
         c.execute("DELETE FROM weekly_memos WHERE week = ?", (week,))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1882,7 +3498,7 @@ def delete_weekly_memo(week):
 def get_model_monthly_memos(model_name):
     """특정 모델의 월별 메모 조회"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         c.execute("""
@@ -1893,8 +3509,6 @@ def get_model_monthly_memos(model_name):
         """, (model_name,))
         memos = c.fetchall()
         
-        conn.close()
-        
         return jsonify({
             'success': True,
             'memos': [
@@ -1927,7 +3541,7 @@ def add_model_monthly_memo():
         if not re.match(r'^\d{4}-\d{2}$', month):
             return jsonify({'error': '월 형식이 올바르지 않습니다. (YYYY-MM)'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 기존 메모 확인
@@ -1936,7 +3550,6 @@ def add_model_monthly_memo():
         existing = c.fetchone()
         
         if existing:
-            conn.close()
             return jsonify({'error': f'{model_name} 모델의 {month}월에 이미 메모가 있습니다. 수정을 사용해주세요.'}), 400
         
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -1945,8 +3558,8 @@ def add_model_monthly_memo():
             VALUES (?, ?, ?, ?, ?)
         """, (model_name, month, memo, now, now))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -1966,7 +3579,7 @@ def update_model_monthly_memo(model_name, month):
         if not memo:
             return jsonify({'error': '메모를 입력해주세요.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 메모 존재 확인
@@ -1975,7 +3588,6 @@ def update_model_monthly_memo(model_name, month):
         existing = c.fetchone()
         
         if not existing:
-            conn.close()
             return jsonify({'error': f'{model_name} 모델의 {month}월에 메모가 없습니다.'}), 404
         
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -1985,8 +3597,8 @@ def update_model_monthly_memo(model_name, month):
             WHERE model_name = ? AND month = ?
         """, (memo, now, model_name, month))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -2000,7 +3612,7 @@ def update_model_monthly_memo(model_name, month):
 def delete_model_monthly_memo(model_name, month):
     """모델별 월별 메모 삭제"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 메모 존재 확인
@@ -2009,14 +3621,13 @@ def delete_model_monthly_memo(model_name, month):
         existing = c.fetchone()
         
         if not existing:
-            conn.close()
             return jsonify({'error': f'{model_name} 모델의 {month}월에 메모가 없습니다.'}), 404
         
         c.execute("DELETE FROM model_monthly_memos WHERE model_name = ? AND month = ?", 
                  (model_name, month))
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -2027,25 +3638,27 @@ def delete_model_monthly_memo(model_name, month):
         return jsonify({'error': f'삭제 실패: {str(e)}'}), 500
 
 @app.route('/api/statistics/model/<model_name>/monthly')
+@conditional_response
+@cached_response
 def get_model_monthly_statistics(model_name):
     """특정 모델의 월별 통계"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
         query = """
             SELECT 
-                strftime('%Y-%m', created_date) as month,
-                COUNT(*) as count
-            FROM internal_voc
-            WHERE model_name = ? AND created_date IS NOT NULL
+                month,
+                SUM(count) as count
+            FROM voc_daily_rollup
+            WHERE model_name = ? AND month IS NOT NULL
         """
         params = [model_name]
         
         if start_date and end_date:
-            query += " AND DATE(created_date) BETWEEN ? AND ?"
+            query += " AND " + ROLLUP_DAY_RANGE_SQL
             params.extend([start_date, end_date])
         
         query += " GROUP BY month ORDER BY month"
@@ -2057,59 +3670,51 @@ def get_model_monthly_statistics(model_name):
         c.execute("SELECT month, memo FROM model_monthly_memos WHERE model_name = ?", (model_name,))
         memos = {row[0]: row[1] for row in c.fetchall()}
         
-        conn.close()
-        
-        # 메모 정보를 월별 데이터에 추가
-        result = df.to_dict('records')
-        for item in result:
-            item['memo'] = memos.get(item['month'], '')
-        
-        return jsonify(result)
+        return statistics_response(df, 'month', memos)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/statistics/models/monthly', methods=['POST'])
+@conditional_response
+@cached_response
 def get_models_monthly_statistics():
-    """여러 모델의 월별 통계"""
+    """
+    여러 모델의 월별 통계
+    - 모델 전체를 한 번에 집계 + 메모도 한 번에 조회
+    - 모든 모델이 같은 월 목록 사용 (건수 없는 월은 0)
+    - start_date / end_date (선택): 조회 기간
+    """
     try:
-        data = request.get_json()
-        model_names = data.get('model_names', [])
+        try:
+            model_names, start_date, end_date = parse_models_monthly_request(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         if not model_names:
             return jsonify({'error': '모델명을 선택해주세요.'}), 400
         
-        if len(model_names) > 10:
-            return jsonify({'error': '최대 10개 모델까지만 선택 가능합니다.'}), 400
+        if len(model_names) > MODELS_MONTHLY_MAX:
+            return jsonify({'error': f'최대 {MODELS_MONTHLY_MAX}개 모델까지만 선택 가능합니다.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         
-        # 각 모델의 월별 통계 조회
-        result = {}
-        for model_name in model_names:
-            query = """
-                SELECT 
-                    strftime('%Y-%m', created_date) as month,
-                    COUNT(*) as count
-                FROM internal_voc
-                WHERE model_name = ? AND created_date IS NOT NULL
-                GROUP BY month ORDER BY month
-            """
-            df = pd.read_sql_query(query, conn, params=(model_name,))
-            
-            # 메모 정보 조회
-            c = conn.cursor()
-            c.execute("SELECT month, memo FROM model_monthly_memos WHERE model_name = ?", (model_name,))
-            memos = {row[0]: row[1] for row in c.fetchall()}
-            
-            # 메모 정보를 월별 데이터에 추가
-            model_data = df.to_dict('records')
-            for item in model_data:
-                item['memo'] = memos.get(item['month'], '')
-            
-            result[model_name] = model_data
+        months, series = fetch_models_monthly(conn, 'voc_daily_rollup', model_names, start_date, end_date)
+        
+        # 메모 정보 조회 (선택한 모델 전체)
+        placeholders = ', '.join('?' for _ in model_names)
+        c = conn.cursor()
+        c.execute(f"SELECT model_name, month, memo FROM model_monthly_memos WHERE model_name IN ({placeholders})",
+                  model_names)
+        memos = {(row[0], row[1]): row[2] for row in c.fetchall()}
         
-        conn.close()
+        # 메모 정보를 월별 데이터에 추가
+        result = {}
+        for model_name, counts in series.items():
+            result[model_name] = [
+                {'month': month, 'count': count, 'memo': memos.get((model_name, month), '')}
+                for month, count in zip(months, counts)
+            ]
         
         return jsonify(result)
     
@@ -2120,7 +3725,7 @@ def get_models_monthly_statistics():
 def merge_chipsets():
     """기존 칩셋명 병합"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 모든 칩셋명 조회
@@ -2147,8 +3752,9 @@ def merge_chipsets():
                 c.execute("UPDATE chipset_mapping SET chipset = ? WHERE model_name = ?",
                          (merged_chipset, model_name))
         
+        bump_data_version(conn)
+        invalidate_voc_lookups(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -2171,7 +3777,7 @@ def rename_chipset():
         if old_chipset == new_chipset:
             return jsonify({'error': '기존 칩셋명과 새 칩셋명이 같습니다.'}), 400
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # internal_voc 테이블 업데이트
@@ -2182,8 +3788,9 @@ def rename_chipset():
         c.execute("UPDATE chipset_mapping SET chipset = ? WHERE chipset = ?", (new_chipset, old_chipset))
         mapping_updated_count = c.rowcount
         
+        bump_data_version(conn)
+        invalidate_voc_lookups(conn)
         conn.commit()
-        conn.close()
         
         total_updated = voc_updated_count + mapping_updated_count
         return jsonify({
@@ -2193,79 +3800,354 @@ def rename_chipset():
     except Exception as e:
         return jsonify({'error': f'변경 실패: {str(e)}'}), 500
 
+# ========== 모델명 일괄 재매핑 ==========
+# 행을 Python으로 가져와 한 건씩 UPDATE 하지 않고 SQL 한 문장으로 처리
+# - 워치 모델: extract_watch_model을 SQLite 함수로 등록 (deterministic) → UPDATE ... FROM 서브쿼리
+# - 별칭 전체: model_aliases 테이블과 UPDATE ... FROM 조인 (/api/model/update-mapping)
+# - 별칭 일부 변경: 집계 테이블에서 해당 별칭과 일치하는 모델명만 찾아 모델명 인덱스로 UPDATE
+#   (internal_voc 전체를 읽지 않음, 별칭 추가/수정 API가 백그라운드 작업으로 실행)
+# - id 범위(REMAP_BATCH_SIZE)마다 커밋 → 쓰기 잠금을 짧게 잡아 업로드/메모 저장이 오래 기다리지 않음
+REMAP_BATCH_SIZE = 50000
+
+# 워치 모델 재지정: 제목에 watch/워치가 있는 행만 함수 호출 (LIKE는 영문 대소문자 무시)
+WATCH_REMAP_SQL = """
+    UPDATE internal_voc SET model_name = w.watch_model
+    FROM (
+        SELECT id, extract_watch_model(title) AS watch_model
+        FROM internal_voc
+        WHERE id BETWEEN ? AND ?
+          AND (title LIKE '%watch%' OR title LIKE '%워치%')
+    ) AS w
+    WHERE internal_voc.id = w.id
+      AND w.watch_model IS NOT NULL
+      AND w.watch_model IS NOT internal_voc.model_name
+"""
+
+# 별칭 적용: upper(model_name)이 별칭과 같은 행만
+MAPPING_REMAP_SQL = """
+    UPDATE internal_voc SET model_name = m.model_name
+    FROM model_aliases AS m
+    WHERE internal_voc.id BETWEEN ? AND ?
+      AND upper(internal_voc.model_name) = m.alias
+      AND internal_voc.model_name <> m.model_name
+"""
+
+# UPDATE ... FROM은 SQLite 3.33.0부터 지원 → 이전 버전은 같은 결과의 상관 서브쿼리 UPDATE 사용
+UPDATE_FROM_MIN_SQLITE = (3, 33, 0)
+
+WATCH_REMAP_LEGACY_SQL = """
+    UPDATE internal_voc SET model_name = extract_watch_model(title)
+    WHERE id BETWEEN ? AND ?
+      AND (title LIKE '%watch%' OR title LIKE '%워치%')
+      AND extract_watch_model(title) IS NOT NULL
+      AND extract_watch_model(title) IS NOT model_name
+"""
+
+MAPPING_REMAP_LEGACY_SQL = """
+    UPDATE internal_voc
+    SET model_name = (SELECT m.model_name FROM model_aliases AS m WHERE m.alias = upper(internal_voc.model_name))
+    WHERE id BETWEEN ? AND ?
+      AND EXISTS (SELECT 1 FROM model_aliases AS m
+                  WHERE m.alias = upper(internal_voc.model_name)
+                    AND internal_voc.model_name <> m.model_name)
+"""
+
+def update_from_supported():
+    """UPDATE ... FROM 사용 가능 여부 (SQLite 3.33.0 이상)"""
+    return sqlite3.sqlite_version_info >= UPDATE_FROM_MIN_SQLITE
+
+# 모델명 하나 변경 (idx_internal_voc_model_created로 해당 행만 찾음)
+MODEL_RENAME_BATCH_SQL = """
+    UPDATE internal_voc SET model_name = ?
+    WHERE id IN (SELECT id FROM internal_voc WHERE model_name = ? LIMIT ?)
+"""
+
+def run_batched_update(conn, sql, batch_size=REMAP_BATCH_SIZE):
+    """
+    id 범위를 나눠 같은 UPDATE 문 실행 (sql의 파라미터: 시작 id, 끝 id)
+    - 바뀐 행이 있는 배치마다 데이터 버전 증가 + 커밋
+    반환: (변경 행 수, 배치 수)
+    """
+    min_id, max_id = conn.execute("SELECT MIN(id), MAX(id) FROM internal_voc").fetchone()
+    if min_id is None:
+        return 0, 0
+    
+    updated_count = 0
+    batches = 0
+    for start_id in range(min_id, max_id + 1, batch_size):
+        changed = conn.execute(sql, (start_id, start_id + batch_size - 1)).rowcount
+        batches += 1
+        if changed:
+            updated_count += changed
+            bump_data_version(conn)
+        conn.commit()
+    return updated_count, batches
+
+def remap_watch_models(conn):
+    """제목의 watch/워치 단어로 모델명 재지정 → (변경 행 수, 배치 수)"""
+    conn.create_function('extract_watch_model', 1, extract_watch_model, deterministic=True)
+    return run_batched_update(conn, WATCH_REMAP_SQL if update_from_supported() else WATCH_REMAP_LEGACY_SQL)
+
+def remap_model_names(conn):
+    """model_aliases 전체로 모델명 재매핑 → (변경 행 수, 배치 수)"""
+    return run_batched_update(conn, MAPPING_REMAP_SQL if update_from_supported() else MAPPING_REMAP_LEGACY_SQL)
+
+def remap_model_aliases(conn, aliases, batch_size=REMAP_BATCH_SIZE, progress=None):
+    """
+    변경된 별칭에 해당하는 VOC만 재매핑 → (변경 행 수, 배치 수)
+    - aliases: 대문자 별칭 목록
+    - 바꿀 모델명은 voc_daily_rollup(모델명별 집계)에서 찾음 → VOC 전체를 읽지 않음
+    - 모델명마다 batch_size건씩 나눠 커밋
+    - progress(변경 행 수): 배치마다 호출 (작업 진행 상황 기록용)
+    - 이미 다른 모델명으로 바뀐 VOC는 원래 모델명을 알 수 없으므로 되돌리지 않음 (별칭 삭제/대상 변경 시)
+    """
+    aliases = list(dict.fromkeys(aliases))
+    if not aliases:
+        return 0, 0
+    
+    model_aliases = load_model_aliases(conn)
+    placeholders = ', '.join('?' for _ in aliases)
+    model_names = [row[0] for row in conn.execute(f"""
+        SELECT DISTINCT model_name FROM voc_daily_rollup
+        WHERE upper(model_name) IN ({placeholders}) AND count > 0
+    """, aliases)]
+    
+    updated_count = 0
+    batches = 0
+    for model_name in model_names:
+        target = model_aliases.get(model_name.upper())
+        if target is None or target == model_name:
+            continue
+        while True:
+            changed = conn.execute(MODEL_RENAME_BATCH_SQL, (target, model_name, batch_size)).rowcount
+            batches += 1
+            if changed:
+                updated_count += changed
+                bump_data_version(conn)
+            conn.commit()
+            if progress:
+                progress(updated_count)
+            if changed < batch_size:
+                break
+    return updated_count, batches
+
+def remap_response(updated_count, batches, elapsed):
+    """일괄 재매핑 결과 응답"""
+    print(f"모델명 일괄 업데이트: {updated_count}건 ({batches}개 배치, {elapsed:.2f}초)")
+    return jsonify({
+        'success': True,
+        'updated': updated_count,
+        'batches': batches,
+        'elapsed': round(elapsed, 3),
+        'message': f'{updated_count}개의 모델명이 업데이트되었습니다.'
+    })
+
 @app.route('/api/model/update-watch', methods=['POST'])
 def update_watch_models():
     """기존 데이터의 모델명을 '워치' 단어로 업데이트"""
     try:
-        conn = sqlite3.connect('voc_data.db')
-        c = conn.cursor()
-        
-        # 모든 데이터 조회
-        c.execute("SELECT id, title, model_name FROM internal_voc WHERE title IS NOT NULL")
-        records = c.fetchall()
+        started = time.perf_counter()
+        updated_count, batches = remap_watch_models(get_db())
+        return remap_response(updated_count, batches, time.perf_counter() - started)
+    except Exception as e:
+        return jsonify({'error': f'업데이트 실패: {str(e)}'}), 500
+
+@app.route('/api/model/update-mapping', methods=['POST'])
+def update_model_mapping():
+    """기존 데이터의 모델명을 매핑 규칙에 따라 업데이트"""
+    try:
+        started = time.perf_counter()
+        updated_count, batches = remap_model_names(get_db())
+        return remap_response(updated_count, batches, time.perf_counter() - started)
+    except Exception as e:
+        return jsonify({'error': f'업데이트 실패: {str(e)}'}), 500
+
+# ========== 모델명 별칭 관리 ==========
+# 별칭을 바꾸면 캐시(load_voc_lookups)를 무효화해 다음 업로드부터 적용하고,
+# 기존 VOC는 바뀐 별칭에 해당하는 행만 백그라운드 작업으로 재매핑 (응답의 job_id로 진행 확인)
+
+def save_model_aliases(conn, pairs):
+    """(별칭, 모델명) 목록 저장 (이미 있는 별칭은 모델명 수정) → 저장한 대문자 별칭 목록 (커밋은 호출한 쪽)"""
+    aliases = []
+    for alias, model_name in pairs:
+        alias = alias.strip().upper()
+        conn.execute("""
+            INSERT INTO model_aliases (alias, model_name) VALUES (?, ?)
+            ON CONFLICT(alias) DO UPDATE SET model_name = excluded.model_name
+        """, (alias, model_name.strip()))
+        aliases.append(alias)
+    return aliases
+
+def run_model_alias_remap(job_id, aliases):
+    """별칭 변경 후 재매핑 작업 (백그라운드 실행)"""
+    update_job(job_id, phase='writing')
+    started = time.perf_counter()
+    updated_count, batches = remap_model_aliases(
+        get_db(), aliases, progress=lambda count: update_job(job_id, rows_processed=count))
+    elapsed = time.perf_counter() - started
+    print(f"별칭 재매핑: {len(aliases)}개 별칭, {updated_count}건 ({batches}개 배치, {elapsed:.2f}초)")
+    return {
+        'success': True,
+        'aliases': aliases,
+        'updated': updated_count,
+        'batches': batches,
+        'elapsed': round(elapsed, 3),
+        'message': f'{updated_count}개의 모델명이 업데이트되었습니다.'
+    }
+
+def run_model_alias_upload(job_id, file_path, filename):
+    """모델명 별칭 업로드 작업 (A열: 별칭, B열: 모델명 / 백그라운드 실행)"""
+    update_job(job_id, phase='reading')
+    df = read_spooled_excel(file_path, filename)
+    
+    update_job(job_id, phase='parsing', rows_total=len(df))
+    pairs = []
+    for alias, model_name in zip(df.iloc[:, 0], df.iloc[:, 1]):
+        if pd.notna(alias) and pd.notna(model_name) and str(alias).strip() and str(model_name).strip():
+            pairs.append((str(alias), str(model_name)))
+    
+    conn = get_db()
+    aliases = save_model_aliases(conn, pairs)
+    bump_data_version(conn)
+    invalidate_voc_lookups(conn)
+    conn.commit()
+    
+    result = run_model_alias_remap(job_id, aliases)
+    result['message'] = f'{len(aliases)}개의 모델명 별칭이 등록되었습니다. ' + result['message']
+    return result
+
+@app.route('/api/model-aliases')
+def get_model_aliases():
+    """모델명 별칭 목록"""
+    try:
+        conn = get_db()
+        rows = conn.execute("SELECT alias, model_name FROM model_aliases ORDER BY model_name, alias").fetchall()
+        return jsonify({
+            'success': True,
+            'aliases': [{'alias': alias, 'model_name': model_name} for alias, model_name in rows],
+            'total': len(rows)
+        })
+    except Exception as e:
+        return jsonify({'error': f'조회 실패: {str(e)}'}), 500
+
+@app.route('/api/model-aliases/add', methods=['POST'])
+def add_model_alias():
+    """모델명 별칭 추가/수정 (기존 VOC는 백그라운드 재매핑)"""
+    try:
+        data = request.get_json()
+        alias = data.get('alias', '').strip()
+        model_name = data.get('model_name', '').strip()
         
-        updated_count = 0
-        for record in records:
-            voc_id, title, current_model_name = record
-            
-            # '워치' 단어 추출
-            watch_model = extract_watch_model(title)
-            
-            if watch_model and watch_model != current_model_name:
-                # 모델명 업데이트
-                c.execute("UPDATE internal_voc SET model_name = ? WHERE id = ?", (watch_model, voc_id))
-                updated_count += 1
-                print(f"모델명 업데이트: {current_model_name} -> {watch_model}")
+        if not alias or not model_name:
+            return jsonify({'error': '별칭과 모델명을 모두 입력해주세요.'}), 400
         
+        conn = get_db()
+        aliases = save_model_aliases(conn, [(alias, model_name)])
+        bump_data_version(conn)
+        invalidate_voc_lookups(conn)
         conn.commit()
-        conn.close()
+        
+        job_id = submit_job('model_alias_remap', run_model_alias_remap, aliases)
         
         return jsonify({
             'success': True,
-            'message': f'{updated_count}개의 모델명이 업데이트되었습니다.'
+            'job_id': job_id,
+            'message': f'{aliases[0]} → {model_name} 별칭을 저장했습니다. 기존 VOC 재매핑을 시작합니다.'
         })
     except Exception as e:
-        return jsonify({'error': f'업데이트 실패: {str(e)}'}), 500
+        return jsonify({'error': f'추가 실패: {str(e)}'}), 500
 
-@app.route('/api/model/update-mapping', methods=['POST'])
-def update_model_mapping():
-    """기존 데이터의 모델명을 매핑 규칙에 따라 업데이트"""
+@app.route('/api/model-aliases/batch', methods=['POST'])
+def add_model_alias_batch():
+    """모델명 별칭 일괄 추가/수정 (재매핑은 작업 하나로 실행)"""
     try:
-        conn = sqlite3.connect('voc_data.db')
-        c = conn.cursor()
+        data = request.get_json()
+        mappings = data.get('aliases', [])
         
-        # 모든 데이터 조회
-        c.execute("SELECT id, model_name FROM internal_voc WHERE model_name IS NOT NULL")
-        records = c.fetchall()
+        if not mappings:
+            return jsonify({'error': '별칭 데이터가 없습니다.'}), 400
         
-        updated_count = 0
-        for record in records:
-            voc_id, current_model_name = record
-            
-            # 모델명 매핑
-            new_model_name = map_model_name(current_model_name)
-            
-            if new_model_name != current_model_name:
-                # 모델명 업데이트
-                c.execute("UPDATE internal_voc SET model_name = ? WHERE id = ?", (new_model_name, voc_id))
-                updated_count += 1
-                print(f"모델명 업데이트: {current_model_name} -> {new_model_name}")
+        pairs = []
+        errors = []
+        for mapping in mappings:
+            alias = (mapping.get('alias') or '').strip()
+            model_name = (mapping.get('model_name') or '').strip()
+            if alias and model_name:
+                pairs.append((alias, model_name))
+            else:
+                errors.append(f'별칭 또는 모델명이 누락됨: {mapping}')
+        
+        job_id = None
+        if pairs:
+            conn = get_db()
+            aliases = save_model_aliases(conn, pairs)
+            bump_data_version(conn)
+            invalidate_voc_lookups(conn)
+            conn.commit()
+            job_id = submit_job('model_alias_remap', run_model_alias_remap, aliases)
+        
+        message = f'일괄 처리 완료: {len(pairs)}건 성공'
+        if errors:
+            message += f', {len(errors)}건 실패'
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'message': message,
+            'success_count': len(pairs),
+            'error_count': len(errors),
+            'errors': errors
+        })
+    except Exception as e:
+        return jsonify({'error': f'일괄 처리 실패: {str(e)}'}), 500
+
+@app.route('/api/model-aliases/<alias>', methods=['DELETE'])
+def delete_model_alias(alias):
+    """모델명 별칭 삭제 (이후 업로드부터 적용, 이미 바뀐 VOC 모델명은 그대로)"""
+    try:
+        alias = alias.strip().upper()
+        conn = get_db()
+        c = conn.cursor()
         
+        c.execute("DELETE FROM model_aliases WHERE alias = ?", (alias,))
+        if c.rowcount == 0:
+            return jsonify({'error': f'{alias} 별칭이 없습니다.'}), 404
+        
+        bump_data_version(conn)
+        invalidate_voc_lookups(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
-            'message': f'{updated_count}개의 모델명이 업데이트되었습니다.'
+            'message': f'{alias} 별칭이 삭제되었습니다.'
         })
     except Exception as e:
-        return jsonify({'error': f'업데이트 실패: {str(e)}'}), 500
+        return jsonify({'error': f'삭제 실패: {str(e)}'}), 500
+
+@app.route('/api/upload/model_aliases', methods=['POST'])
+def upload_model_aliases():
+    """모델명 별칭 파일 업로드 (백그라운드 작업 등록 후 job_id 반환)"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': '파일이 없습니다.'}), 400
+        
+        file = request.files['file']
+        job_id = submit_upload_job('model_aliases', file, run_model_alias_upload)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'message': '업로드 작업이 등록되었습니다.'
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'error': f'업로드 실패: {str(e)}'}), 500
 
 @app.route('/api/memos/backup', methods=['POST'])
 def backup_memos():
     """메모 백업"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         # 월별 메모 백업
@@ -2280,8 +4162,6 @@ def backup_memos():
         c.execute("SELECT model_name, month, memo, created_date, updated_date FROM model_monthly_memos")
         model_monthly_memos = c.fetchall()
         
-        conn.close()
-        
         # 백업 파일 생성
         backup_data = {
             'monthly_memos': [
@@ -2347,7 +4227,7 @@ def restore_memos():
         # 백업 파일 읽기
         backup_data = json.load(file)
         
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         c = conn.cursor()
         
         restored_count = 0
@@ -2388,8 +4268,8 @@ def restore_memos():
                 except Exception as e:
                     print(f"모델별 월별 메모 복구 실패: {memo['model_name']}, {memo['month']}, {str(e)}")
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -2400,9 +4280,43 @@ def restore_memos():
 
 # ==========(qdata_backend.py에서 복사) API 엔드포인트 ==========
 
+def run_qdata_upload(job_id, file_path, filename):
+    """Q-data 업로드 작업 (백그라운드 실행)"""
+    update_job(job_id, phase='reading')
+    
+    # 엑셀 읽기 (read_only 스트리밍, 배치 단위)
+    estimated_rows, batches = read_qdata_batches(file_path)
+    
+    update_job(job_id, phase='writing', rows_total=estimated_rows, rows_processed=0)
+    
+    # 데이터베이스 저장
+    conn = get_db()
+    
+    uploaded_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    inserted_count = 0
+    duplicate_count = 0
+    
+    processed_rows = 0
+    for df in batches:
+        # 배치 단위로 정제 후 일괄 저장 (배치마다 커밋)
+        inserted, duplicates = save_qdata_batch(conn, df, uploaded_date)
+        inserted_count += inserted
+        duplicate_count += duplicates
+        processed_rows += len(df)
+        update_job(job_id, rows_processed=processed_rows)
+    
+    conn.commit()
+    
+    return {
+        'success': True,
+        'message': f'Q-data 업로드 완료: {inserted_count}건 저장, {duplicate_count}건 중복',
+        'inserted': inserted_count,
+        'duplicates': duplicate_count
+    }
+
 @app.route('/api/upload/qdata', methods=['POST'])
 def upload_qdata():
-    """Q-data 엑셀 파일 업로드"""
+    """Q-data 엑셀 파일 업로드 (백그라운드 작업 등록 후 job_id 반환)"""
     if 'file' not in request.files:
         return jsonify({'success': False, 'error': '파일이 없습니다.'}), 400
     
@@ -2415,80 +4329,13 @@ def upload_qdata():
         return jsonify({'success': False, 'error': '엑셀 파일만 업로드 가능합니다.'}), 400
     
     try:
-        # 임시 파일 저장
-        upload_folder = 'uploads'
-        os.makedirs(upload_folder, exist_ok=True)
-        file_path = os.path.join(upload_folder, file.filename)
-        file.save(file_path)
-        
-        # 엑셀 읽기
-        df = read_qdata_excel(file_path)
-        
-        # 데이터베이스 저장
-        conn = sqlite3.connect('voc_data.db')
-        cursor = conn.cursor()
-        
-        uploaded_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        inserted_count = 0
-        duplicate_count = 0
-        
-        for _, row in df.iterrows():
-            # S/N이 없는 경우 건너뛰기
-            if pd.isna(row['serial_number']):
-                duplicate_count += 1  # NULL 데이터는 중복으로 카운트
-                continue
-            
-            # 공백 제거 (trim)
-            serial_number = str(row['serial_number']).strip()
-            
-            # 빈 문자열 체크
-            if not serial_number:
-                duplicate_count += 1
-                continue
-            
-            # log_id는 NULL 허용
-            log_id = None
-            if not pd.isna(row['log_id']):
-                log_id = str(row['log_id']).strip() if str(row['log_id']).strip() else None
-            
-            try:
-                cursor.execute('''
-                    INSERT INTO q_data (
-                        service_date, process_type, repair_name, repair_detail,
-                        detail_content, model_name, serial_number, log_id,
-                        sw_before, sw_after, uploaded_date
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    row['service_date'],
-                    row['process_type'],
-                    row['repair_name'],
-                    row['repair_detail'],
-                    row['detail_content'],
-                    row['model_name'],
-                    serial_number,  # 정제된 값
-                    log_id,         # NULL 허용
-                    row['sw_before'],
-                    row['sw_after'],
-                    uploaded_date
-                ))
-                inserted_count += 1
-            except sqlite3.IntegrityError:
-                # 중복 데이터 (S/N 기준)
-                duplicate_count += 1
-                continue
-        
-        conn.commit()
-        conn.close()
-        
-        # 임시 파일 삭제
-        os.remove(file_path)
+        job_id = submit_upload_job('qdata', file, run_qdata_upload)
         
         return jsonify({
             'success': True,
-            'message': f'Q-data 업로드 완료: {inserted_count}건 저장, {duplicate_count}건 중복',
-            'inserted': inserted_count,
-            'duplicates': duplicate_count
-        })
+            'job_id': job_id,
+            'message': '업로드 작업이 등록되었습니다.'
+        }), 202
         
     except Exception as e:
         return jsonify({
@@ -2496,102 +4343,131 @@ def upload_qdata():
             'error': f'업로드 실패: {str(e)}'
         }), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_upload_job(job_id):
+    """업로드 작업 진행 상황 조회"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """통계 응답 캐시 적중/미적중 횟수"""
+    with _response_cache_lock:
+        stats = dict(_response_cache_stats)
+        stats.pop('version')
+        stats['entries'] = len(_response_cache)
+        stats['size_bytes'] = sum(len(body) for body, _ in _response_cache.values())
+    
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / total, 3) if total else 0.0
+    stats['max_entries'] = RESPONSE_CACHE_SIZE
+    stats['data_version'] = get_data_version(get_db())
+    return jsonify(stats)
+
+@app.route('/api/metrics/excel-read', methods=['GET'])
+def get_excel_read_metrics():
+    """엑셀 읽기 지표 조회 (판별된 형식, 성공 경로, 실패 시도 횟수/소요 시간)"""
+    with _excel_read_metrics_lock:
+        metrics = {
+            'sniffed': dict(_excel_read_metrics['sniffed']),
+            'succeeded': dict(_excel_read_metrics['succeeded']),
+            'failed': dict(_excel_read_metrics['failed']),
+            'succeeded_seconds': round(_excel_read_metrics['succeeded_seconds'], 3),
+            'failed_seconds': round(_excel_read_metrics['failed_seconds'], 3)
+        }
+    return jsonify(metrics)
+
 @app.route('/api/statistics/qdata/model', methods=['GET'])
+@conditional_response
+@cached_response
 def get_qdata_model_statistics():
-    """모델별 Q-data 통계 (처리유형 분포 포함)"""
+    """
+    모델별 Q-data 통계 (처리유형 분포 포함)
+    - (모델, 처리유형) 단위로 한 번에 집계한 뒤 모델별로 묶음
+    - top_n: 건수 상위 N개 모델만 반환 (선택)
+    - min_count: 건수가 이 값 미만인 모델 제외 (선택)
+    """
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
+    top_n = request.args.get('top_n', type=int)
+    min_count = request.args.get('min_count', type=int)
     
-    conn = sqlite3.connect('voc_data.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     # 기본 쿼리
     query = '''
         SELECT 
             model_name,
-            COUNT(*) as count
-        FROM q_data
+            process_type,
+            SUM(count) as count
+        FROM qdata_daily_rollup
         WHERE 1=1
     '''
     params = []
     
     # 날짜 필터
     if start_date:
-        query += ' AND service_date >= ?'
+        query += ' AND day >= ?'
         params.append(start_date)
     if end_date:
-        query += ' AND service_date <= ?'
+        query += ' AND day <= ?'
         params.append(end_date)
     
-    query += ' GROUP BY model_name ORDER BY count DESC'
+    query += ' GROUP BY model_name, process_type'
     
     cursor.execute(query, params)
-    results = cursor.fetchall()
-    
-    # 각 모델별 처리유형 분포 조회
-    data = []
-    for row in results:
-        model_name = row[0]
-        count = row[1]
-        
-        # 처리유형별 건수 조회
-        process_query = '''
-            SELECT process_type, COUNT(*) as type_count
-            FROM q_data
-            WHERE model_name = ?
-        '''
-        process_params = [model_name]
-        
-        if start_date:
-            process_query += ' AND service_date >= ?'
-            process_params.append(start_date)
-        if end_date:
-            process_query += ' AND service_date <= ?'
-            process_params.append(end_date)
-        
-        process_query += ' GROUP BY process_type'
-        
-        cursor.execute(process_query, process_params)
-        process_results = cursor.fetchall()
-        
-        process_types = {}
-        for p_row in process_results:
-            if p_row[0]:  # process_type이 NULL이 아닌 경우만
-                process_types[p_row[0]] = p_row[1]
-        
-        data.append({
-            'model_name': model_name,
-            'count': count,
-            'process_types': process_types
-        })
     
-    conn.close()
+    # 모델별 합계 + 처리유형 분포
+    models = {}
+    for model_name, process_type, count in cursor.fetchall():
+        item = models.get(model_name)
+        if item is None:
+            item = models[model_name] = {
+                'model_name': model_name,
+                'count': 0,
+                'process_types': {}
+            }
+        item['count'] += count
+        if process_type:  # process_type이 NULL이 아닌 경우만
+            item['process_types'][process_type] = count
+    
+    data = sorted(models.values(), key=lambda item: item['count'], reverse=True)
+    
+    if min_count is not None:
+        data = [item for item in data if item['count'] >= min_count]
+    if top_n is not None and top_n > 0:
+        data = data[:top_n]
     
     return jsonify(data)
 
 @app.route('/api/statistics/qdata/monthly', methods=['GET'])
+@conditional_response
+@cached_response
 def get_qdata_monthly_statistics():
     """월별 Q-data 전체 건수"""
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    conn = sqlite3.connect('voc_data.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     query = '''
         SELECT 
-            strftime('%Y-%m', service_date) as month,
-            COUNT(*) as count
-        FROM q_data
+            month,
+            SUM(count) as count
+        FROM qdata_daily_rollup
         WHERE 1=1
     '''
     params = []
     
     if start_date:
-        query += ' AND service_date >= ?'
+        query += ' AND day >= ?'
         params.append(start_date)
     if end_date:
-        query += ' AND service_date <= ?'
+        query += ' AND day <= ?'
         params.append(end_date)
     
     query += ' GROUP BY month ORDER BY month'
@@ -2599,55 +4475,63 @@ def get_qdata_monthly_statistics():
     cursor.execute(query, params)
     results = cursor.fetchall()
     
-    conn.close()
-    
     data = [{'month': row[0], 'count': row[1]} for row in results]
     return jsonify(data)
 
 @app.route('/api/statistics/qdata/models/monthly', methods=['POST'])
+@conditional_response
+@cached_response
 def get_qdata_models_monthly():
-    """선택된 모델들의 월별 Q-data 건수"""
-    data = request.get_json()
-    model_names = data.get('model_names', [])
-    
-    if not model_names:
-        return jsonify({})
-    
-    conn = sqlite3.connect('voc_data.db')
-    cursor = conn.cursor()
-    
-    result = {}
-    
-    for model_name in model_names:
-        query = '''
-            SELECT 
-                strftime('%Y-%m', service_date) as month,
-                COUNT(*) as count
-            FROM q_data
-            WHERE model_name = ?
-            GROUP BY month
-            ORDER BY month
-        '''
+    """
+    선택된 모델들의 월별 Q-data 건수
+    - 모델 전체를 한 번에 집계, 건수 없는 월은 0
+    - start_date / end_date (선택): 조회 기간
+    """
+    try:
+        try:
+            model_names, start_date, end_date = parse_models_monthly_request(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if not model_names:
+            return jsonify({})
         
-        cursor.execute(query, (model_name,))
-        rows = cursor.fetchall()
+        if len(model_names) > MODELS_MONTHLY_MAX:
+            return jsonify({'error': f'최대 {MODELS_MONTHLY_MAX}개 모델까지만 선택 가능합니다.'}), 400
         
-        result[model_name] = [{'month': row[0], 'count': row[1]} for row in rows]
-    
-    conn.close()
+        conn = get_db()
+        
+        months, series = fetch_models_monthly(conn, 'qdata_daily_rollup', model_names, start_date, end_date)
+        
+        result = {}
+        for model_name, counts in series.items():
+            result[model_name] = [{'month': month, 'count': count} for month, count in zip(months, counts)]
+        
+        return jsonify(result)
     
-    return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/export/qdata/excel', methods=['GET'])
 def export_qdata_excel():
-    """Q-data 엑셀 다운로드"""
+    """
+    Q-data 내보내기
+    - format: xlsx(기본) / csv / parquet
+    - columns: 내보낼 컬럼 (쉼표 구분, 선택)
+    """
     model_name = request.args.get('model_name')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    conn = sqlite3.connect('voc_data.db')
+    try:
+        export_format = parse_export_format(request.args.get('format'))
+        columns = parse_export_columns(request.args.get('columns'), QDATA_EXPORT_COLUMNS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    conn = get_db()
     
-    query = 'SELECT * FROM q_data WHERE 1=1'
+    query = f"SELECT {', '.join(columns)} FROM q_data WHERE 1=1"
     params = []
     
     if model_name:
@@ -2662,24 +4546,18 @@ def export_qdata_excel():
     
     query += ' ORDER BY service_date DESC'
     
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    key = export_store_key('q_data',
+                           {'model_name': model_name, 'start_date': start_date, 'end_date': end_date},
+                           columns, export_format, get_data_version(conn))
     
-    # 엑셀 파일 생성
-    output_file = 'qdata_export.xlsx'
-    df.to_excel(output_file, index=False, engine='openpyxl')
-    
-    return send_file(
-        output_file,
-        as_attachment=True,
-        download_name=f'qdata_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    filename = f'qdata_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+    return stored_export_response(EXPORT_STORE_FOLDER, key, export_format, columns,
+                                  lambda: conn.execute(query, params), filename)
 
 @app.route('/api/qdata/check-duplicates', methods=['GET'])
 def check_qdata_duplicates():
     """Q-data 중복 확인 (serial_number 기준)"""
-    conn = sqlite3.connect('voc_data.db')
+    conn = get_db()
     cursor = conn.cursor()
     
     # 중복된 S/N 찾기
@@ -2692,7 +4570,6 @@ def check_qdata_duplicates():
     ''')
     
     duplicates = cursor.fetchall()
-    conn.close()
     
     if duplicates:
         return jsonify({
@@ -2716,9 +4593,12 @@ def check_qdata_duplicates():
 @app.route('/api/qdata/remove-duplicates', methods=['POST'])
 def remove_qdata_duplicates():
     """Q-data 중복 제거 (serial_number 기준, 가장 최근 업로드만 유지)"""
-    conn = sqlite3.connect('voc_data.db')
+    conn = get_db()
     cursor = conn.cursor()
     
+    # 행마다 집계 트리거를 실행하지 않고 삭제 후 집계 테이블을 한 번에 재생성
+    statements = drop_source_triggers(cursor, 'q_data')
+    
     # 중복 제거: S/N이 같은 경우 가장 최근 업로드만 유지
     cursor.execute('''
         DELETE FROM q_data
@@ -2730,8 +4610,10 @@ def remove_qdata_duplicates():
     ''')
     
     removed_count = cursor.rowcount
+    rebuild_rollup(cursor, 'qdata_daily_rollup')
+    restore_source_triggers(cursor, statements)
+    bump_data_version(conn)
     conn.commit()
-    conn.close()
     
     return jsonify({
         'success': True,
@@ -2743,18 +4625,14 @@ def remove_qdata_duplicates():
 def reset_qdata_data():
     """Q-data 전체 데이터 초기화"""
     try:
-        conn = sqlite3.connect('voc_data.db')
+        conn = get_db()
         cursor = conn.cursor()
         
-        # Q-data 데이터 삭제 건수 확인
-        cursor.execute("SELECT COUNT(*) FROM q_data")
-        qdata_count = cursor.fetchone()[0]
-        
-        # Q-data 전체 삭제
-        cursor.execute("DELETE FROM q_data")
+        # Q-data 전체 삭제 (집계 트리거 없이 전체 삭제, 건수 반환)
+        qdata_count = truncate_source_table(cursor, 'q_data')
         
+        bump_data_version(conn)
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS q_data (
     sw_before TEXT,                        -- BE열: 수리전 S/W
     sw_after TEXT,                         -- BF열: 수리 S/W
     uploaded_date TEXT NOT NULL,           -- 업로드 일시
+    service_month TEXT GENERATED ALWAYS AS (strftime('%Y-%m', service_date)) VIRTUAL,  -- 월별 집계용 (서비스 연월)
     
     UNIQUE(serial_number, log_id)
 );
@@ -0,0 +1,126 @@
+"""
+SQLite 연결 관리 (app.py / qdata_backend.py / voc_details_app.py 공용)
+
+- 요청마다 connect/close 하지 않고 연결을 풀에 보관해 재사용 (페이지 캐시 유지)
+- 요청 처리 중에는 Flask app context(g)에 연결을 묶고, 요청이 끝나면 풀에 반납
+- 백그라운드 작업 스레드(업로드 등)는 스레드별 연결을 계속 사용
+- WAL 모드: 대용량 업로드가 커밋하는 동안에도 통계 조회(읽기)가 막히지 않음
+- 데이터 버전(app_meta.data_version): 응답 캐시 / 내보내기 파일 재사용 판단에 공용으로 사용
+"""
+import sqlite3
+import threading
+from datetime import datetime
+from queue import LifoQueue, Empty, Full
+
+from flask import g, has_app_context
+
+DATABASE = 'voc_data.db'
+
+POOL_SIZE = 8            # DB 파일별로 보관하는 유휴 연결 수
+BUSY_TIMEOUT = 60        # 쓰기 잠금 대기 시간 (초)
+
+# 연결을 열 때마다 적용하는 PRAGMA
+PRAGMAS = [
+    'PRAGMA journal_mode = WAL',          # 읽기/쓰기 동시 진행
+    'PRAGMA synchronous = NORMAL',        # WAL에서는 NORMAL로도 손상 없음 (체크포인트 시에만 fsync)
+    'PRAGMA cache_size = -32768',         # 연결당 페이지 캐시 32MB
+    'PRAGMA mmap_size = 268435456',       # 256MB 메모리 맵 읽기
+    'PRAGMA temp_store = MEMORY',         # 정렬/GROUP BY 임시 데이터는 메모리에서
+]
+
+_pools = {}
+_pools_lock = threading.Lock()
+_local = threading.local()
+
+def connect(db_path=DATABASE):
+    """PRAGMA가 적용된 새 연결 생성"""
+    # 풀에 반납된 연결은 다른 스레드가 이어서 사용하므로 check_same_thread=False
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma).fetchall()
+    return conn
+
+def _get_pool(db_path):
+    with _pools_lock:
+        if db_path not in _pools:
+            _pools[db_path] = LifoQueue(maxsize=POOL_SIZE)
+        return _pools[db_path]
+
+def _acquire(db_path):
+    """풀에서 연결 꺼내기 (없으면 새로 생성)"""
+    try:
+        return _get_pool(db_path).get_nowait()
+    except Empty:
+        return connect(db_path)
+
+def _reset(conn):
+    """커밋되지 않은 작업 취소 + 요청별 설정 초기화"""
+    if conn.in_transaction:
+        conn.rollback()
+    conn.row_factory = None
+
+def _release(db_path, conn):
+    """연결을 풀에 반납 (풀이 가득 찬 경우에만 닫음)"""
+    try:
+        _reset(conn)
+        _get_pool(db_path).put_nowait(conn)
+    except (Full, sqlite3.Error):
+        conn.close()
+
+def get_db(db_path=DATABASE):
+    """
+    현재 요청(또는 스레드)의 DB 연결 반환
+    - 요청 처리 중: 요청이 끝날 때까지 같은 연결 사용, 종료 시 풀에 반납 (close 하지 않음)
+    - 그 외 (백그라운드 작업, 초기화): 스레드별 연결을 계속 재사용
+    """
+    if has_app_context():
+        connections = g.setdefault('db_connections', {})
+        if db_path not in connections:
+            connections[db_path] = _acquire(db_path)
+        return connections[db_path]
+
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    if db_path not in connections:
+        connections[db_path] = connect(db_path)
+    return connections[db_path]
+
+def release_db(exception=None):
+    """app context 종료 시 연결 반납 (teardown_appcontext)"""
+    connections = g.pop('db_connections', None)
+    if not connections:
+        return
+    for db_path, conn in connections.items():
+        _release(db_path, conn)
+
+def reset_thread_db():
+    """백그라운드 작업 종료 시 스레드 연결의 미완료 트랜잭션 취소"""
+    for conn in getattr(_local, 'connections', {}).values():
+        try:
+            _reset(conn)
+        except sqlite3.Error:
+            pass
+
+def init_app(app):
+    """Flask 앱에 연결 반납 훅 등록"""
+    app.teardown_appcontext(release_db)
+
+# ========== 데이터 버전 ==========
+
+def get_data_version(conn):
+    """현재 데이터 버전 (app_meta.data_version)"""
+    row = conn.execute("SELECT value FROM app_meta WHERE key = 'data_version'").fetchone()
+    return int(row[0]) if row else 0
+
+def bump_data_version(conn):
+    """데이터 버전 증가 (호출한 쪽의 커밋과 함께 반영)"""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')   # 같은 초 안의 변경도 구분
+    conn.execute("""
+        INSERT INTO app_meta (key, value) VALUES ('data_version', '1')
+        ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+    """)
+    conn.execute("""
+        INSERT INTO app_meta (key, value) VALUES ('data_updated_at', ?)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    """, (now,))
@@ -0,0 +1,482 @@
+"""
+대용량 내보내기 (app.py / voc_details_app.py 공용)
+
+- 조회 결과를 DataFrame/파일로 만들지 않고, SQLite 커서에서 배치 단위로 읽어 바로 응답으로 전송
+- xlsx: 워크시트 XML을 zip 항목에 이어 쓰면서 압축된 바이트를 조각 단위로 내보냄
+  (openpyxl write_only도 저장 시점에 한 번에 파일을 만들기 때문에 첫 바이트가 늦음)
+- csv: 배치마다 바로 전송 (엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 포함)
+- parquet: pyarrow로 행 그룹 단위 기록 (pandas.read_parquet로 바로 읽기, 선택 설치)
+- 메모리 사용량은 행 수와 무관하게 배치(parquet은 행 그룹) 크기만큼만 유지
+- 내보내기 파일 보관소: (테이블, 조건, 컬럼, 형식, 데이터 버전)이 같으면 만들어 둔 파일을 그대로 전송
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from flask import Response, send_file, stream_with_context
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CSV_MIMETYPE = 'text/csv'
+PARQUET_MIMETYPE = 'application/vnd.apache.parquet'
+
+EXPORT_BATCH_SIZE = 2000         # 커서에서 한 번에 읽는 행 수 (= 응답 조각 단위)
+XLSX_MAX_CELL_LENGTH = 32767     # 엑셀 셀 최대 글자 수
+PARQUET_ROW_GROUP_SIZE = 100000  # parquet 행 그룹 크기 (이만큼 모아서 한 번에 기록)
+PARQUET_COMPRESSION = 'zstd'
+
+EXPORT_STORE_MAX_BYTES = 2 * 1024 ** 3   # 보관소 전체 크기 상한 (초과 시 오래 안 쓴 파일부터 삭제)
+EXPORT_STORE_MAX_AGE = 24 * 60 * 60      # 파일 보관 기간 (초, 마지막 사용 기준)
+EXPORT_STORE_SWEEP_INTERVAL = 60         # 정리 작업 최소 간격 (초)
+EXPORT_STORE_TEMP_PREFIX = '.building-'  # 만드는 중인 임시 파일 (완성되면 키 이름으로 교체)
+
+# XML 1.0에서 허용되지 않는 제어 문자 (엑셀이 파일을 열지 못함)
+ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+class _StreamSink:
+    """zipfile이 쓰는 바이트를 모아 두었다가 조각 단위로 꺼내는 쓰기 전용 버퍼 (seek/tell 없음)"""
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+class _CountingSink(_StreamSink):
+    """쓴 위치(tell)가 필요한 writer용 (pyarrow) - 되감기(seek)는 지원하지 않음"""
+    def __init__(self):
+        super().__init__()
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.position += len(data)
+        return super().write(data)
+
+    def tell(self):
+        return self.position
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        self.closed = True
+
+def iter_cursor_batches(cursor, batch_size=EXPORT_BATCH_SIZE):
+    """실행된 커서에서 batch_size 행씩 꺼내기"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
+
+def _column_letter(index):
+    """0 → A, 25 → Z, 26 → AA"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _cell_xml(ref, value, style=''):
+    """값 하나 → <c> 요소 (숫자는 숫자 셀, 나머지는 인라인 문자열)"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"{style}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        if value != value or value in (float('inf'), float('-inf')):  # NaN / 무한대는 빈 셀
+            return ''
+        return f'<c r="{ref}"{style}><v>{value!r}</v></c>'
+    text = ILLEGAL_XML_CHARS.sub('', str(value))[:XLSX_MAX_CELL_LENGTH]
+    return f'<c r="{ref}" t="inlineStr"{style}><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+def _rows_xml(batch, letters, first_row):
+    """행 배치 → <row> 요소 문자열"""
+    parts = []
+    for offset, row in enumerate(batch):
+        row_number = first_row + offset
+        cells = ''.join(_cell_xml(f'{letter}{row_number}', value)
+                        for letter, value in zip(letters, row))
+        parts.append(f'<row r="{row_number}">{cells}</row>')
+    return ''.join(parts)
+
+def stream_xlsx(columns, batches, sheet_name='Sheet1'):
+    """
+    (헤더, 행 배치 iterator) → xlsx 파일 바이트 조각 generator
+    - 첫 행은 굵은 헤더, 이후 배치마다 압축된 바이트를 바로 내보냄
+    - 워크시트 항목은 크기를 미리 알 수 없으므로 ZIP64로 기록 (4GB 초과 대비)
+    """
+    sink = _StreamSink()
+    letters = [_column_letter(index) for index in range(len(columns))]
+
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in XLSX_STATIC_PARTS.items():
+            zf.writestr(name, content)
+        zf.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(sheet_name)}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ))
+
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            header = ''.join(_cell_xml(f'{letter}1', column, ' s="1"')
+                             for letter, column in zip(letters, columns))
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                f'<sheetData><row r="1">{header}</row>'
+            ).encode('utf-8'))
+            yield sink.drain()
+
+            next_row = 2
+            for batch in batches:
+                sheet.write(_rows_xml(batch, letters, next_row).encode('utf-8'))
+                next_row += len(batch)
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+
+            sheet.write(b'</sheetData></worksheet>')
+
+    yield sink.drain()
+
+def stream_csv(columns, batches):
+    """(헤더, 행 배치 iterator) → CSV 바이트 조각 generator (UTF-8 BOM)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield ('\ufeff' + buffer.getvalue()).encode('utf-8')
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+
+def _parquet_schema(columns, rows):
+    """첫 행 그룹의 값으로 컬럼 타입 결정 (정수/실수 외에는 문자열)"""
+    fields = []
+    for index, column in enumerate(columns):
+        values = [row[index] for row in rows if row[index] is not None]
+        if values and all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+            fields.append((column, pa.int64()))
+        elif values and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            fields.append((column, pa.float64()))
+        else:
+            fields.append((column, pa.string()))
+    return pa.schema(fields)
+
+def _parquet_table(schema, rows):
+    """행 목록 → pyarrow Table (문자열 컬럼에 숫자가 섞여 있으면 문자열로 변환)"""
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        if pa.types.is_string(field.type):
+            values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def stream_parquet(columns, batches):
+    """
+    (헤더, 행 배치 iterator) → parquet 바이트 조각 generator
+    - PARQUET_ROW_GROUP_SIZE 행씩 모아 행 그룹 하나로 기록하고 바로 전송
+    - 컬럼 타입은 첫 행 그룹 기준 (id 등 정수 → int64, 나머지 → string)
+    """
+    sink = _CountingSink()
+    writer = None
+    schema = None
+    pending = []
+
+    def write_group(rows):
+        nonlocal writer, schema
+        if writer is None:
+            schema = _parquet_schema(columns, rows)
+            writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+        writer.write_table(_parquet_table(schema, rows), row_group_size=len(rows))
+
+    for batch in batches:
+        pending.extend(batch)
+        if len(pending) >= PARQUET_ROW_GROUP_SIZE:
+            write_group(pending)
+            pending = []
+            yield sink.drain()
+
+    if pending or writer is None:
+        write_group(pending)
+    writer.close()
+    yield sink.drain()
+
+# 형식 → (확장자, MIME 타입, 바이트 조각 generator)
+EXPORT_FORMATS = {
+    'xlsx': ('xlsx', XLSX_MIMETYPE, stream_xlsx),
+    'csv': ('csv', CSV_MIMETYPE, stream_csv),
+    'parquet': ('parquet', PARQUET_MIMETYPE, stream_parquet),
+}
+
+def parse_export_format(value):
+    """format 파라미터 검증 (기본 xlsx)"""
+    export_format = (value or 'xlsx').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {value} (xlsx, csv, parquet)")
+    if export_format == 'parquet' and pq is None:
+        raise ValueError('parquet 내보내기에는 pyarrow 설치가 필요합니다.')
+    return export_format
+
+def parse_export_columns(value, available, default=None):
+    """
+    columns 파라미터 (쉼표 구분) → 내보낼 컬럼 목록
+    - 지정하지 않으면 default (없으면 available 전체)
+    - available에 없는 컬럼이 있으면 ValueError
+    """
+    if not value:
+        return list(default or available)
+    columns = list(dict.fromkeys(column.strip() for column in value.split(',') if column.strip()))
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise ValueError(f"알 수 없는 컬럼: {', '.join(unknown)}")
+    if not columns:
+        raise ValueError('컬럼을 하나 이상 지정해주세요.')
+    return columns
+
+def _download_response(chunks, mimetype, download_name):
+    """바이트 조각 generator → 첨부파일 스트리밍 응답"""
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    # 한글 모델명 등 비 ASCII 파일명은 filename* (RFC 5987)로 전달
+    extension = download_name.rsplit('.', 1)[-1]
+    ascii_name = download_name.encode('ascii', 'ignore').decode('ascii') or f"export.{extension}"
+    response.headers['Content-Disposition'] = (
+        f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(download_name)}"
+    )
+    return response
+
+def export_response(export_format, columns, cursor, filename):
+    """
+    실행된 조회 커서 → 스트리밍 다운로드 응답
+    - filename은 확장자 제외 (형식에 맞게 붙임)
+    - 요청 컨텍스트/DB 연결은 전송이 끝날 때까지 유지
+    """
+    extension, mimetype, stream = EXPORT_FORMATS[export_format]
+    chunks = stream(columns, iter_cursor_batches(cursor))
+    return _download_response(chunks, mimetype, f"{filename}.{extension}")
+
+# ========== 내보내기 파일 보관소 ==========
+# 같은 조건의 내보내기를 여러 사람이 반복해도 파일은 한 번만 만듦
+# - 키: (테이블, 조건, 컬럼, 형식, 데이터 버전)의 해시 → 데이터가 바뀌면 자동으로 새 키
+# - 처음 요청: 스트리밍으로 전송하면서 같은 내용을 고유한 임시 파일에 기록, 끝까지 보내면 os.replace로 교체
+#   (중간에 연결이 끊기면 임시 파일 삭제 → 반쪽짜리 파일이 보관소에 남지 않음)
+# - 이후 요청: 완성된 파일을 send_file로 전송 (Content-Length / Range 지원)
+# - 정리: 파일을 완성할 때마다 (EXPORT_STORE_SWEEP_INTERVAL 간격) 기간 초과 → 용량 초과 순으로 삭제
+
+_building_keys = set()
+_building_lock = threading.Lock()
+_sweep_state = {'last': 0.0}
+_sweep_lock = threading.Lock()
+
+def export_store_key(table, filters, columns, export_format, data_version):
+    """보관소 키 (같은 데이터 버전에서 같은 내보내기면 같은 키)"""
+    payload = json.dumps([table, filters, list(columns), export_format, data_version],
+                         ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+def _tee_to_store(chunks, folder, key, path):
+    """전송하는 바이트 조각을 임시 파일에도 기록하고, 끝까지 보내면 보관소 파일로 교체"""
+    # 같은 파일을 이미 다른 요청이 만들고 있으면 기록 없이 전송만 (디스크에 중복 기록하지 않음)
+    with _building_lock:
+        building = key in _building_keys
+        _building_keys.add(key)
+    if building:
+        yield from chunks
+        return
+
+    temp_path = None
+    completed = False
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=folder, prefix=EXPORT_STORE_TEMP_PREFIX, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(temp_path, path)
+        completed = True
+    finally:
+        if temp_path and not completed:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        with _building_lock:
+            _building_keys.discard(key)
+    sweep_export_store(folder)
+
+def sweep_export_store(folder, max_bytes=EXPORT_STORE_MAX_BYTES, max_age=EXPORT_STORE_MAX_AGE, force=False):
+    """
+    보관소 정리 (마지막 사용 시각 = 파일 mtime 기준)
+    1. max_age보다 오래된 파일 삭제 (만들다 남은 임시 파일 포함)
+    2. 남은 파일 합계가 max_bytes를 넘으면 오래 안 쓴 파일부터 삭제
+    - 전송 중이라 지울 수 없는 파일(Windows)은 건너뛰고 다음 정리 때 다시 시도
+    """
+    now = time.time()
+    with _sweep_lock:
+        if not force and now - _sweep_state['last'] < EXPORT_STORE_SWEEP_INTERVAL:
+            return None
+        _sweep_state['last'] = now
+
+    result = {'removed': 0, 'freed_bytes': 0, 'remaining_files': 0, 'remaining_bytes': 0}
+    try:
+        entries = list(os.scandir(folder))
+    except FileNotFoundError:
+        return result
+
+    def remove(entry, size):
+        try:
+            os.remove(entry.path)
+        except OSError:
+            return False
+        result['removed'] += 1
+        result['freed_bytes'] += size
+        return True
+
+    artifacts = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if not entry.is_file():
+            continue
+        if now - stat.st_mtime > max_age:
+            if not remove(entry, stat.st_size):
+                artifacts.append((stat.st_mtime, stat.st_size, entry))
+        elif not entry.name.startswith(EXPORT_STORE_TEMP_PREFIX):
+            artifacts.append((stat.st_mtime, stat.st_size, entry))
+
+    total = sum(size for _, size, _ in artifacts)
+    artifacts.sort(key=lambda item: item[0])
+    remaining = []
+    for mtime, size, entry in artifacts:
+        if total > max_bytes and remove(entry, size):
+            total -= size
+        else:
+            remaining.append(size)
+
+    result['remaining_files'] = len(remaining)
+    result['remaining_bytes'] = sum(remaining)
+    return result
+
+def stored_export_response(folder, key, export_format, columns, open_cursor, filename):
+    """
+    보관소를 거치는 다운로드 응답
+    - key: export_store_key(...) (None이면 보관소를 쓰지 않고 스트리밍만)
+    - open_cursor: 보관소에 파일이 없을 때만 호출하는 조회 함수 (실행된 커서 반환)
+    - X-Export-Cache 헤더: hit(보관 파일 전송) / miss(새로 만들며 전송) / bypass
+    - ETag = 보관소 키 (키가 같으면 파일 내용도 같음)
+      → 보관 파일 전송 시 If-None-Match(304) / Range + If-Range(206 이어받기) 처리
+      → 새로 만드는 응답은 스트리밍이라 Range 미지원, ETag만 붙여 이어받기 요청이 보관 파일로 가도록 함
+    """
+    extension, mimetype, stream = EXPORT_FORMATS[export_format]
+    download_name = f"{filename}.{extension}"
+
+    if key is None:
+        response = _download_response(stream(columns, iter_cursor_batches(open_cursor())),
+                                      mimetype, download_name)
+        response.headers['X-Export-Cache'] = 'bypass'
+        return response
+
+    # send_file은 상대 경로를 앱 루트 기준으로 해석하므로 절대 경로로 변환
+    folder = os.path.abspath(folder)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{key}.{extension}")
+    try:
+        # 사용 시각 갱신 (정리 작업은 mtime이 오래된 파일부터 삭제)
+        os.utime(path)
+        response = send_file(path, mimetype=mimetype, as_attachment=True, download_name=download_name,
+                             conditional=True, etag=key, max_age=0)
+        response.headers['X-Export-Cache'] = 'hit'
+        return response
+    except FileNotFoundError:
+        pass
+
+    chunks = _tee_to_store(stream(columns, iter_cursor_batches(open_cursor())), folder, key, path)
+    response = _download_response(chunks, mimetype, download_name)
+    response.set_etag(key)
+    response.headers['X-Export-Cache'] = 'miss'
+    return response
@@ -9,8 +9,29 @@ from flask import Flask, request, jsonify, send_file
 import sqlite3
 import os
 
+from database import get_db
+from exporters import export_response
+
 # ========== 유틸리티 함수 ==========
 
+# Q-data 엑셀 열 인덱스 (0부터 시작)
+# F=5, M=12, P=15, Q=16, T=19, Z=25, AD=29, AR=43, BE=50, BF=51
+QDATA_USECOLS = [5, 12, 15, 16, 19, 25, 29, 43, 50, 51]
+QDATA_COLUMNS = [
+    'service_date',    # F열
+    'process_type',    # M열
+    'repair_name',     # P열
+    'repair_detail',   # Q열
+    'detail_content',  # T열
+    'model_name',      # Z열
+    'serial_number',   # AD열
+    'log_id',          # AR열
+    'sw_before',       # BE열
+    'sw_after'         # BF열
+]
+QDATA_HEADER_ROW = 8      # 9행이 헤더 (pd.read_excel header=8)
+QDATA_BATCH_SIZE = 5000   # 스트리밍 읽기 배치 크기
+
 def convert_qdata_date(date_str):
     """
     Q-data 날짜 변환: 260209 → 2026-02-09
@@ -33,9 +54,7 @@ def read_qdata_excel(file_path):
     - F, M, P, Q, T, Z, AD, AR, BE, BF 열 읽기
     - DRM 파일 처리 (8가지 방법 fallback)
     """
-    # 열 인덱스 (0부터 시작)
-    # F=5, M=12, P=15, Q=16, T=19, Z=25, AD=29, AR=43, BE=50, BF=51
-    usecols = [5, 12, 15, 16, 19, 25, 29, 43, 50, 51]
+    usecols = QDATA_USECOLS
     df = None
     
     # DRM 처리 - 8가지 방법 시도
@@ -80,19 +99,12 @@ def read_qdata_excel(file_path):
         raise Exception(f"Q-data 엑셀 파일 읽기 실패 (DRM): {last_error}")
     
     # 컬럼 이름 매핑 (실제 헤더 이름과 관계없이 순서대로 매핑)
-    df.columns = [
-        'service_date',    # F열
-        'process_type',    # M열
-        'repair_name',     # P열
-        'repair_detail',   # Q열
-        'detail_content',  # T열
-        'model_name',      # Z열
-        'serial_number',   # AD열
-        'log_id',          # AR열
-        'sw_before',       # BE열
-        'sw_after'         # BF열
-    ]
+    df.columns = QDATA_COLUMNS
     
+    return normalize_qdata_frame(df)
+
+def normalize_qdata_frame(df):
+    """날짜 변환 및 빈 행 제거"""
     # 날짜 변환
     df['service_date'] = df['service_date'].apply(convert_qdata_date)
     
@@ -200,9 +212,105 @@ def read_via_openpyxl_direct(file_path, header, usecols):
     
     return pd.DataFrame(data, columns=column_names)
 
+def read_qdata_batches(file_path, batch_size=QDATA_BATCH_SIZE):
+    """
+    Q-data 엑셀 파일을 배치 단위로 읽기
+    - openpyxl read_only 모드로 행을 순회하며 필요한 10개 열만 추출 (파일 크기와 관계없이 메모리 일정)
+    - 스트리밍으로 열 수 없는 파일(DRM, xls 등)은 read_qdata_excel로 전체를 읽어 배치로 나눔
+    반환: (예상 행 수 또는 None, DataFrame 배치 iterator)
+    """
+    from openpyxl import load_workbook
+    
+    try:
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+    except Exception as e:
+        print(f"Q-data 스트리밍 읽기 실패, DRM 처리 방식으로 재시도: {str(e)}")
+        df = read_qdata_excel(file_path)
+        return len(df), (df.iloc[start:start + batch_size] for start in range(0, len(df), batch_size))
+    
+    ws = wb.active
+    estimated_rows = max(ws.max_row - (QDATA_HEADER_ROW + 1), 0) if ws.max_row else None
+    return estimated_rows, _iter_qdata_rows(wb, ws, batch_size)
+
+def _iter_qdata_rows(wb, ws, batch_size):
+    """read_only 워크시트에서 필요한 열만 batch_size 행씩 DataFrame으로 반환"""
+    max_col = QDATA_USECOLS[-1] + 1
+    try:
+        batch = []
+        for row in ws.iter_rows(min_row=QDATA_HEADER_ROW + 2, max_col=max_col, values_only=True):
+            batch.append([row[i] if i < len(row) else None for i in QDATA_USECOLS])
+            if len(batch) >= batch_size:
+                yield normalize_qdata_frame(pd.DataFrame(batch, columns=QDATA_COLUMNS))
+                batch = []
+        if batch:
+            yield normalize_qdata_frame(pd.DataFrame(batch, columns=QDATA_COLUMNS))
+    finally:
+        wb.close()
+
+QDATA_INSERT_SQL = """INSERT OR IGNORE INTO q_data (
+        service_date, process_type, repair_name, repair_detail,
+        detail_content, model_name, serial_number, log_id,
+        sw_before, sw_after, uploaded_date
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+def _code_text(value):
+    """S/N, log_id 셀 값 → 문자열 (정수 값 숫자는 '.0' 없이: 123, 123.0 → '123')"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+def _trim_text_column(series):
+    """
+    S/N, log_id 문자열 변환 + 공백 제거 (열 단위), 빈 값은 None
+    - 숫자 셀은 배치 구성(빈 칸 유무에 따른 int/float 열 추론)과 관계없이 같은 문자열로 변환
+    """
+    trimmed = series.map(_code_text, na_action='ignore')
+    return trimmed.where(series.notna() & (trimmed != ''), None)
+
+def clean_qdata_frame(df):
+    """
+    Q-data 배치 정제 (열 단위)
+    - S/N, log_id 문자열 정규화 (숫자 123.0 → '123') + 공백 제거, 빈 문자열은 NULL
+    - S/N이 없는 행 제거
+    - NaN → None (object 타입으로 변환)
+    """
+    df = df.copy()
+    df['serial_number'] = _trim_text_column(df['serial_number'])
+    df['log_id'] = _trim_text_column(df['log_id'])
+    df = df[df['serial_number'].notna()]
+    return df.astype(object).where(df.notna(), None)
+
+def save_qdata_batch(conn, df, uploaded_date):
+    """Q-data 배치 일괄 저장 (INSERT OR IGNORE)
+
+    반환값: (inserted_count, duplicate_count)
+    S/N이 없는 행과 이미 있는 (S/N, log_id) 조합은 중복으로 카운트
+    """
+    cleaned = clean_qdata_frame(df)
+    params = [row + (uploaded_date,) for row in cleaned[QDATA_COLUMNS].itertuples(index=False, name=None)]
+    
+    # executemany의 rowcount = 실제 저장된 건수 (무시된 중복 제외)
+    # total_changes는 트리거에 의한 변경까지 포함하므로 사용하지 않음
+    try:
+        cursor = conn.executemany(QDATA_INSERT_SQL, params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    inserted_count = cursor.rowcount
+    
+    return inserted_count, len(df) - inserted_count
+
+# 월별 집계용 생성 열 식 (service_month)
+QDATA_SERVICE_MONTH_SQL = "strftime('%Y-%m', service_date)"
+
+# SELECT * 대신 사용하는 컬럼 목록 (생성 열 제외)
+QDATA_SELECT_COLUMNS = '''id, service_date, process_type, repair_name, repair_detail, detail_content,
+    model_name, serial_number, log_id, sw_before, sw_after, uploaded_date'''
+
 def init_qdata_table():
     """Q-data 테이블 초기화"""
-    conn = sqlite3.connect('voc_database.db')
+    conn = get_db('voc_database.db')
     cursor = conn.cursor()
     
     # SQL 파일 실행
@@ -210,8 +318,14 @@ def init_qdata_table():
         sql_script = f.read()
         cursor.executescript(sql_script)
     
+    # 기존 DB: 월 생성 열 추가 (VIRTUAL 열이므로 기존 행도 바로 계산됨)
+    cursor.execute("PRAGMA table_xinfo(q_data)")
+    if 'service_month' not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE q_data ADD COLUMN service_month TEXT GENERATED ALWAYS AS ({QDATA_SERVICE_MONTH_SQL}) VIRTUAL")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_q_data_month_model ON q_data(service_month, model_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_q_data_model_month ON q_data(model_name, service_month)')
+    
     conn.commit()
-    conn.close()
 
 # ========== API 엔드포인트 ==========
 
@@ -236,64 +350,23 @@ def upload_qdata():
         file_path = os.path.join(upload_folder, file.filename)
         file.save(file_path)
         
-        # 엑셀 읽기
-        df = read_qdata_excel(file_path)
+        # 엑셀 읽기 (read_only 스트리밍, 배치 단위)
+        _, batches = read_qdata_batches(file_path)
         
         # 데이터베이스 저장
-        conn = sqlite3.connect('voc_database.db')
-        cursor = conn.cursor()
+        conn = get_db('voc_database.db')
         
         uploaded_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         inserted_count = 0
         duplicate_count = 0
         
-        for _, row in df.iterrows():
-            # S/N이 없는 경우 건너뛰기
-            if pd.isna(row['serial_number']):
-                duplicate_count += 1  # NULL 데이터는 중복으로 카운트
-                continue
-            
-            # 공백 제거 (trim)
-            serial_number = str(row['serial_number']).strip()
-            
-            # 빈 문자열 체크
-            if not serial_number:
-                duplicate_count += 1
-                continue
-            
-            # log_id는 NULL 허용
-            log_id = None
-            if not pd.isna(row['log_id']):
-                log_id = str(row['log_id']).strip() if str(row['log_id']).strip() else None
-            
-            try:
-                cursor.execute('''
-                    INSERT INTO q_data (
-                        service_date, process_type, repair_name, repair_detail,
-                        detail_content, model_name, serial_number, log_id,
-                        sw_before, sw_after, uploaded_date
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    row['service_date'],
-                    row['process_type'],
-                    row['repair_name'],
-                    row['repair_detail'],
-                    row['detail_content'],
-                    row['model_name'],
-                    serial_number,  # 정제된 값
-                    log_id,         # NULL 허용
-                    row['sw_before'],
-                    row['sw_after'],
-                    uploaded_date
-                ))
-                inserted_count += 1
-            except sqlite3.IntegrityError:
-                # 중복 데이터 (S/N 기준)
-                duplicate_count += 1
-                continue
+        for df in batches:
+            # 배치 단위로 정제 후 일괄 저장 (배치마다 커밋)
+            inserted, duplicates = save_qdata_batch(conn, df, uploaded_date)
+            inserted_count += inserted
+            duplicate_count += duplicates
         
         conn.commit()
-        conn.close()
         
         # 임시 파일 삭제
         os.remove(file_path)
@@ -317,7 +390,7 @@ def get_qdata_model_statistics():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    conn = sqlite3.connect('voc_database.db')
+    conn = get_db('voc_database.db')
     cursor = conn.cursor()
     
     # 기본 쿼리
@@ -380,8 +453,6 @@ def get_qdata_model_statistics():
             'process_types': process_types
         })
     
-    conn.close()
-    
     return jsonify(data)
 
 @app.route('/api/statistics/qdata/monthly', methods=['GET'])
@@ -390,12 +461,12 @@ def get_qdata_monthly_statistics():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    conn = sqlite3.connect('voc_database.db')
+    conn = get_db('voc_database.db')
     cursor = conn.cursor()
     
     query = '''
         SELECT 
-            strftime('%Y-%m', service_date) as month,
+            service_month as month,
             COUNT(*) as count
         FROM q_data
         WHERE 1=1
@@ -414,8 +485,6 @@ def get_qdata_monthly_statistics():
     cursor.execute(query, params)
     results = cursor.fetchall()
     
-    conn.close()
-    
     data = [{'month': row[0], 'count': row[1]} for row in results]
     return jsonify(data)
 
@@ -428,7 +497,7 @@ def get_qdata_models_monthly():
     if not model_names:
         return jsonify({})
     
-    conn = sqlite3.connect('voc_database.db')
+    conn = get_db('voc_database.db')
     cursor = conn.cursor()
     
     result = {}
@@ -436,7 +505,7 @@ def get_qdata_models_monthly():
     for model_name in model_names:
         query = '''
             SELECT 
-                strftime('%Y-%m', service_date) as month,
+                service_month as month,
                 COUNT(*) as count
             FROM q_data
             WHERE model_name = ?
@@ -449,8 +518,6 @@ def get_qdata_models_monthly():
         
         result[model_name] = [{'month': row[0], 'count': row[1]} for row in rows]
     
-    conn.close()
-    
     return jsonify(result)
 
 @app.route('/api/export/qdata/excel', methods=['GET'])
@@ -460,9 +527,9 @@ def export_qdata_excel():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    conn = sqlite3.connect('voc_database.db')
+    conn = get_db('voc_database.db')
     
-    query = 'SELECT * FROM q_data WHERE 1=1'
+    query = f'SELECT {QDATA_SELECT_COLUMNS} FROM q_data WHERE 1=1'
     params = []
     
     if model_name:
@@ -477,24 +544,16 @@ def export_qdata_excel():
     
     query += ' ORDER BY service_date DESC'
     
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
-    
-    # 엑셀 파일 생성
-    output_file = 'qdata_export.xlsx'
-    df.to_excel(output_file, index=False, engine='openpyxl')
+    cursor = conn.execute(query, params)
     
-    return send_file(
-        output_file,
-        as_attachment=True,
-        download_name=f'qdata_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    # 고정 경로(qdata_export.xlsx)에 쓰면 동시 요청끼리 파일을 덮어쓰므로 파일 없이 바로 전송
+    columns = [column[0] for column in cursor.description]
+    return export_response('xlsx', columns, cursor, f'qdata_{datetime.now().strftime("%Y%m%d_%H%M%S")}')
 
 @app.route('/api/qdata/check-duplicates', methods=['GET'])
 def check_qdata_duplicates():
     """Q-data 중복 확인 (serial_number 기준)"""
-    conn = sqlite3.connect('voc_database.db')
+    conn = get_db('voc_database.db')
     cursor = conn.cursor()
     
     # 중복된 S/N 찾기
@@ -507,7 +566,6 @@ def check_qdata_duplicates():
     ''')
     
     duplicates = cursor.fetchall()
-    conn.close()
     
     if duplicates:
         return jsonify({
@@ -531,7 +589,7 @@ def check_qdata_duplicates():
 @app.route('/api/qdata/remove-duplicates', methods=['POST'])
 def remove_qdata_duplicates():
     """Q-data 중복 제거 (serial_number 기준, 가장 최근 업로드만 유지)"""
-    conn = sqlite3.connect('voc_database.db')
+    conn = get_db('voc_database.db')
     cursor = conn.cursor()
     
     # 중복 제거: S/N이 같은 경우 가장 최근 업로드만 유지
@@ -546,7 +604,6 @@ def remove_qdata_duplicates():
     
     removed_count = cursor.rowcount
     conn.commit()
-    conn.close()
     
     return jsonify({
         'success': True,
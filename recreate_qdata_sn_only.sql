@@ -16,12 +16,15 @@ CREATE TABLE q_data (
     log_id TEXT,                           -- AR열: LOG ID (NULL 허용)
     sw_before TEXT,                        -- BE열: 수리전 S/W
     sw_after TEXT,                         -- BF열: 수리 S/W
-    uploaded_date TEXT NOT NULL            -- 업로드 일시
+    uploaded_date TEXT NOT NULL,           -- 업로드 일시
+    service_month TEXT GENERATED ALWAYS AS (strftime('%Y-%m', service_date)) VIRTUAL  -- 월별 집계용 (서비스 연월)
 );
 
 -- 인덱스 생성 (검색 성능 향상)
 CREATE INDEX idx_q_data_model ON q_data(model_name);
 CREATE INDEX idx_q_data_service_date ON q_data(service_date);
+CREATE INDEX idx_q_data_month_model ON q_data(service_month, model_name);
+CREATE INDEX idx_q_data_model_month ON q_data(model_name, service_month);
 CREATE INDEX idx_q_data_repair_name ON q_data(repair_name);
 CREATE INDEX idx_q_data_process_type ON q_data(process_type);
 CREATE INDEX idx_q_data_log_id ON q_data(log_id);  -- log_id 검색용
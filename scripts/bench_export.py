@@ -0,0 +1,154 @@
+"""
+사내 VOC 내보내기 벤치마크 (합성 데이터)
+
+사용법: python scripts/bench_export.py [--rows 100000] [--keep]
+
+1. 합성 VOC를 internal_voc에 저장
+2. 방식별로 내보내기 파일 전체를 만들어 기록하고 첫 바이트 시간(TTFB) / 전체 시간 / 최대 RSS 비교
+   - 기존 방식: pandas read_sql + to_excel (파일 완성 후 전송)
+   - openpyxl write_only: 행 단위 append 후 save (save가 끝나야 첫 바이트)
+   - 현재 방식: exporters.stream_xlsx / stream_csv / stream_parquet (배치마다 바로 전송)
+최대 RSS는 방식마다 별도 프로세스에서 메모리 맵을 끄고 측정 (앞 방식 / DB 파일 페이지가 섞이지 않도록)
+임시 폴더에서 실행하므로 작업 폴더의 voc_data.db는 건드리지 않음
+"""
+import argparse
+import io
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = {
+    'legacy': '기존 (read_sql + to_excel)',
+    'openpyxl': 'openpyxl write_only',
+    'xlsx': '현재 stream_xlsx',
+    'csv': '현재 stream_csv',
+    'parquet': '현재 stream_parquet',
+}
+
+def insert_rows(app, conn, rows):
+    """합성 VOC 저장 (긴 원문 포함)"""
+    models = ['SM-S918N', 'SM-A546N', 'SM-F946N', 'SM-L310N']
+    conn.executemany(
+        """INSERT INTO internal_voc (case_code, title, model_name, build_version, os_version, problem,
+                                     original_content, cause, solution, created_date, uploaded_date)
+           VALUES (?, ?, ?, ?, '14', ?, ?, '원인 분석 내용', '대책 내용', ?, '2024-03-15 00:00:00')""",
+        [(f'P2403{i:09d}', f'{models[i % 4]} 이슈 {i}', models[i % 4], f'S918NKSU1AWB{i % 9}',
+          '카톡 알림이 안 옵니다 ' * 3, f'[Original Contents] 사용 중 네이버 앱 오류 {i} & <확인> ' * 8,
+          f'2024-03-{i % 28 + 1:02d}')
+         for i in range(rows)])
+    app.bump_data_version(conn)
+    conn.commit()
+
+def current_chunks(app, conn, mode):
+    import exporters
+
+    cursor = conn.execute(f"SELECT {app.INTERNAL_VOC_SELECT_COLUMNS} FROM internal_voc ORDER BY id")
+    stream = exporters.EXPORT_FORMATS[mode][2]
+    return stream(app.INTERNAL_VOC_EXPORT_COLUMNS, exporters.iter_cursor_batches(cursor))
+
+def legacy_chunks(app, conn, mode):
+    """이전 라우트와 같이 DataFrame 전체를 파일로 쓴 뒤 전송"""
+    import pandas as pd
+
+    df = pd.read_sql_query(f"SELECT {app.INTERNAL_VOC_SELECT_COLUMNS} FROM internal_voc ORDER BY id", conn)
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    yield buffer.getvalue()
+
+def openpyxl_chunks(app, conn, mode):
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(app.INTERNAL_VOC_EXPORT_COLUMNS)
+    for row in conn.execute(f"SELECT {app.INTERNAL_VOC_SELECT_COLUMNS} FROM internal_voc ORDER BY id"):
+        ws.append(row)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    yield buffer.getvalue()
+
+def peak_rss_kb():
+    """현재 프로세스 최대 RSS (KB)
+    - ru_maxrss는 fork한 부모의 값이 이어지므로 Linux에서는 /proc의 VmHWM 사용
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def run_mode(mode):
+    """자식 프로세스: 한 방식만 실행하고 결과 한 줄 출력"""
+    import app
+
+    conn = app.get_db()
+    conn.execute('PRAGMA mmap_size = 0')   # DB 파일 메모리 맵이 RSS에 섞이지 않도록
+    baseline = peak_rss_kb()
+    chunks = {'legacy': legacy_chunks, 'openpyxl': openpyxl_chunks}.get(mode, current_chunks)(app, conn, mode)
+
+    started = time.perf_counter()
+    first_byte = None
+    size = 0
+    with open(f'export_{mode}.out', 'wb') as f:   # 응답 전송 대신 파일에 기록
+        for chunk in chunks:
+            if first_byte is None and chunk:
+                first_byte = time.perf_counter() - started
+            f.write(chunk)
+            size += len(chunk)
+    elapsed = time.perf_counter() - started
+    peak = peak_rss_kb()
+    print(f"{first_byte} {elapsed} {peak} {peak - baseline} {size}")
+
+def main():
+    parser = argparse.ArgumentParser(description='사내 VOC 내보내기 벤치마크')
+    parser.add_argument('--rows', type=int, default=100000, help='합성 행 수 (기본 100000)')
+    parser.add_argument('--modes', default=','.join(MODES), help=f"비교할 방식 ({', '.join(MODES)})")
+    parser.add_argument('--keep', action='store_true', help='임시 폴더 유지')
+    parser.add_argument('--run-mode', choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.run_mode)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='bench_export_')
+    os.chdir(workdir)
+    try:
+        import app
+
+        app.init_db()
+        conn = app.get_db()
+        started = time.perf_counter()
+        insert_rows(app, conn, args.rows)
+        print(f"합성 VOC {args.rows:,}건 저장 {time.perf_counter() - started:.2f}초\n")
+
+        print(f"{'방식':<28} {'TTFB':>9} {'전체':>9} {'최대 RSS':>10} {'증가분':>10} {'크기':>10}")
+        for mode in args.modes.split(','):
+            mode = mode.strip()
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-mode', mode],
+                                    cwd=workdir, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{MODES.get(mode, mode):<28} 실패: {result.stderr.strip().splitlines()[-1]}")
+                continue
+            first_byte, elapsed, peak, grown, size = result.stdout.split()[-5:]
+            print(f"{MODES[mode]:<28} {float(first_byte):8.3f}초 {float(elapsed):8.2f}초 "
+                  f"{int(peak) / 1024:8.1f}MB {int(grown) / 1024:8.1f}MB {int(size) / 1024 ** 2:8.1f}MB")
+    finally:
+        os.chdir(ROOT)
+        if args.keep:
+            print(f"임시 폴더: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
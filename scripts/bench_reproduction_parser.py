@@ -0,0 +1,114 @@
+"""
+재현경로 파서 마이크로벤치마크: 태그별 정규식 4개 vs parse_reproduction_path (한 번 훑기)
+
+사용법: python scripts/bench_reproduction_parser.py [--texts 5000] [--length 6000] [--repeat 5]
+
+- 기존 방식: 태그마다 re.search로 전체 텍스트를 따로 검색 (변경 전 extract_* 함수와 동일한 코드)
+- 긴 재현경로(앞부분에 로그, 태그 사이에 긴 원문)를 만들어 두 방식의 결과가 같은지 확인한 뒤 시간 비교
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ===== 기존 방식 (태그별 정규식 4개) =====
+
+def legacy_model(text):
+    if not text:
+        return None
+    match = re.search(r'\[Model No\.\]\s*([^\[\n]+)', text, re.IGNORECASE)
+    if match:
+        model = match.group(1).strip()
+        sm_match = re.search(r'SM-[A-Z0-9]{4,5}', model, re.IGNORECASE)
+        return sm_match.group(0).upper() if sm_match else model
+    return None
+
+def legacy_build(text):
+    if not text:
+        return None
+    match = re.search(r'\[Build No\.\]\s*([^\[\n]+)', text, re.IGNORECASE)
+    if match:
+        build = match.group(1).strip()
+        return build[-3:] if len(build) >= 3 else build
+    return None
+
+def legacy_os(text):
+    if not text:
+        return None
+    match = re.search(r'\[OS Ver\.\]\s*([^\[\n]+)', text, re.IGNORECASE)
+    return match.group(1).strip() if match else None
+
+def legacy_original(text):
+    if not text:
+        return None
+    match = re.search(r'\[Original Contents\]\s*([^\[]+)', text, re.IGNORECASE)
+    return match.group(1).strip() if match else None
+
+def legacy_parse(text):
+    return {
+        'model_no': legacy_model(text),
+        'build_version': legacy_build(text),
+        'os_version': legacy_os(text),
+        'original_content': legacy_original(text),
+    }
+
+# ===== 테스트 데이터 =====
+
+def make_texts(count, length, seed=5):
+    rng = random.Random(seed)
+    words = ['로그', 'crash', '재부팅', 'app', '알림', 'bluetooth', '화면', '설정', '\n']
+    texts = []
+    for _ in range(count):
+        filler = ' '.join(rng.choice(words) for _ in range(length // 6))
+        tags = [
+            f'[Model No.] SM-S{rng.randint(900, 999)}N',
+            f'[Build No.] S918NKSU1AW{rng.choice("ABC")}{rng.randint(1, 9)}',
+            f'[OS Ver.] {rng.randint(11, 15)}',
+            f'[Original Contents] {filler[:length // 2]}',
+        ]
+        rng.shuffle(tags)
+        # 앞부분 로그 + 태그 (태그 대소문자/공백 변형 포함)
+        text = filler[length // 2:] + '\n' + '\n'.join(tags)
+        if rng.random() < 0.3:
+            text = text.replace('[OS Ver.]', '[os ver.]   ')
+        texts.append(text)
+    return texts
+
+def timed(func, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            func(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='재현경로 파서 마이크로벤치마크')
+    parser.add_argument('--texts', type=int, default=5000, help='텍스트 개수 (기본 5000)')
+    parser.add_argument('--length', type=int, default=6000, help='텍스트 길이 (기본 약 6000자)')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+
+    # app.py import 시 만드는 업로드 폴더가 작업 폴더에 생기지 않도록 임시 폴더에서 import
+    os.chdir(tempfile.mkdtemp(prefix='bench_reproduction_'))
+    from app import parse_reproduction_path
+
+    texts = make_texts(args.texts, args.length)
+    mismatches = sum(legacy_parse(text) != parse_reproduction_path(text) for text in texts)
+    print(f"결과 비교: {len(texts):,}건 중 불일치 {mismatches}건")
+
+    legacy = timed(legacy_parse, texts, args.repeat)
+    single = timed(parse_reproduction_path, texts, args.repeat)
+    print(f"정규식 4개:              {legacy:.3f}초")
+    print(f"parse_reproduction_path: {single:.3f}초 ({legacy / single:.2f}배)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+사내 VOC 업로드 벤치마크 (합성 엑셀 파일)
+
+사용법: python scripts/bench_voc_upload.py [--rows 100000] [--keep]
+
+1. 합성 VOC 엑셀(A~V열) 생성
+2. 업로드 전체 (엑셀 읽기 + 컬럼 단위 추출 + 청크 저장): 신규 업로드 / 같은 파일 재업로드
+3. 저장 단계만 비교
+   - 기존 방식: 행마다 SELECT 후 INSERT/UPDATE, 100행마다 커밋
+   - 현재 방식: save_voc_chunk (청크별 사례코드 일괄 조회 + executemany, 청크당 커밋 1회)
+임시 폴더에서 실행하므로 작업 폴더의 voc_data.db는 건드리지 않음
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHUNK_SIZE = 1000
+
+LEGACY_INSERT_SQL = """INSERT INTO internal_voc
+    (case_code, title, model_name, model_no, chipset, build_version,
+     os_version, issue_type, problem, original_content, reproduction_path,
+     resolver, resolve_option, cause, solution, third_party_app,
+     created_date, uploaded_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+def write_workbook(path, rows):
+    """합성 VOC 엑셀 생성 (write_only)"""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([f'col{i}' for i in range(22)])
+    models = ['SM-S918N', 'SM-A546N', 'SM-F946N', 'SM-L310N']
+    for i in range(rows):
+        row = [None] * 22
+        row[0] = f'P2401{i % 28 + 1:02d}{i:07d}'
+        row[7] = f'{models[i % 4]} 이슈 {i}' if i % 5 else f'갤럭시 워치{i % 7} 문의'
+        row[12] = '카톡 알림이 안 옵니다 ' * 3 if i % 3 else 'samsung members 접수'
+        row[13] = (f'[Model No.] {models[i % 4]}\n[Build No.] S918NKSU1AWB{i % 9}\n'
+                   f'[OS Ver.] 14\n[Original Contents] 사용 중 네이버 앱 오류 {i}')
+        row[14] = '담당자'
+        row[17] = '수정'
+        row[20] = '원인 분석 내용'
+        row[21] = '대책 내용'
+        ws.append(row)
+    wb.save(path)
+
+def legacy_save(conn, records, uploaded_date):
+    """기존 저장 방식 (행마다 SELECT → INSERT 또는 UPDATE, 100행마다 커밋)"""
+    c = conn.cursor()
+    for index, (case_code, v) in enumerate(records, 1):
+        c.execute("SELECT id FROM internal_voc WHERE case_code = ?", (case_code,))
+        if c.fetchone():
+            c.execute("UPDATE internal_voc SET model_name = ?, cause = ?, solution = ?, uploaded_date = ? "
+                      "WHERE case_code = ?",
+                      (v['model_name'], v['cause'], v['solution'], uploaded_date, case_code))
+        else:
+            c.execute(LEGACY_INSERT_SQL, (
+                case_code, v['title'], v['model_name'], v['model_no'], v['chipset'], v['build_version'],
+                v['os_version'], v['issue_type'], v['problem'], v['original_content'], v['reproduction'],
+                v['resolver'], v['resolve_option'], v['cause'], v['solution'], v['third_party_app'],
+                v['created_date'], uploaded_date))
+        if index % 100 == 0:
+            conn.commit()
+    conn.commit()
+
+def chunked_save(app, conn, records, uploaded_date):
+    """현재 저장 방식 (save_voc_chunk)"""
+    for start in range(0, len(records), CHUNK_SIZE):
+        app.save_voc_chunk(conn, records[start:start + CHUNK_SIZE], uploaded_date)
+
+def clear_voc(conn):
+    conn.execute("DELETE FROM internal_voc")
+    conn.commit()
+
+def timed(label, rows, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {elapsed:8.2f}초  {rows / elapsed:>10,.0f} 행/초")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='사내 VOC 업로드 벤치마크')
+    parser.add_argument('--rows', type=int, default=100000, help='합성 행 수 (기본 100000)')
+    parser.add_argument('--keep', action='store_true', help='임시 폴더 유지')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_voc_upload_')
+    os.chdir(workdir)
+    try:
+        import app
+
+        app.init_db()
+        conn = app.get_db()
+        filename = 'VOC_20240315.xlsx'
+        path = os.path.join(workdir, filename)
+
+        timed(f'엑셀 생성 ({args.rows:,}행)', args.rows, lambda: write_workbook(path, args.rows))
+
+        def upload():
+            job_id = app._register_job('internal_voc', filename)
+            return app.run_internal_voc_upload(job_id, path, filename)
+
+        result = timed('업로드 전체 - 신규', args.rows, upload)
+        print(f"  신규 {result['inserted']:,}건 / 업데이트 {result['updated']:,}건 / 실패 {result['errors']:,}건")
+        result = timed('업로드 전체 - 재업로드', args.rows, upload)
+        print(f"  신규 {result['inserted']:,}건 / 업데이트 {result['updated']:,}건 / 실패 {result['errors']:,}건")
+
+        # 저장 단계만: 같은 추출 결과로 두 방식 비교
+        df = app.read_spooled_excel(path, filename)
+        voc_df = app.extract_voc_frame(df, filename, app.load_voc_lookups())
+        records = [(voc_data['case_code'], voc_data) for voc_data in voc_df.to_dict('records')]
+        uploaded_date = '2024-03-15 00:00:00'
+
+        for label, save in (('기존 (행 단위 SELECT + INSERT/UPDATE)', lambda: legacy_save(conn, records, uploaded_date)),
+                            ('현재 (청크 조회 + executemany)', lambda: chunked_save(app, conn, records, uploaded_date))):
+            clear_voc(conn)
+            timed(f'저장만 {label} - 신규', len(records), save)
+            timed(f'저장만 {label} - 재업로드', len(records), save)
+    finally:
+        os.chdir(ROOT)
+        if args.keep:
+            print(f"임시 폴더: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
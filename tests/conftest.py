@@ -0,0 +1,85 @@
+"""
+테스트 공용 fixture
+- app.py는 DB(voc_data.db) / 업로드 폴더를 상대 경로로 쓰므로 임시 폴더로 이동한 뒤 import
+- DB는 세션 동안 하나를 공유하고, 테스트마다 VOC / Q-data 행을 비움
+"""
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    os.chdir(tmp_path_factory.mktemp('voc'))
+    import app
+    app.init_db()
+    return app
+
+@pytest.fixture
+def db(app_module):
+    """비운 DB의 연결 (테스트 스레드 전용 연결)"""
+    conn = app_module.get_db()
+    conn.execute("DELETE FROM internal_voc")
+    conn.execute("DELETE FROM q_data")
+    conn.commit()
+    return conn
+
+@pytest.fixture
+def client(app_module, db):
+    return app_module.app.test_client()
+
+def voc_workbook_rows(count, start=0):
+    """사내 VOC 엑셀 형식(A~V열) 행 목록"""
+    rows = []
+    for i in range(start, start + count):
+        row = [''] * 22
+        row[0] = f'P2401{i % 28 + 1:02d}{i:06d}'                      # A: 사례코드
+        row[7] = ['갤럭시 워치7 문제', 'SM-S918N 발열', '기타 문의'][i % 3]  # H: 제목
+        row[12] = '카톡 안됨' if i % 2 else 'samsung members 문의'        # M: 문제
+        row[13] = ('[Model No.] SM-S918N\n[Build No.] S918NKSU1AWB1\n'
+                   '[OS Ver.] 14\n[Original Contents] 네이버 오류')       # N: 재현경로
+        row[20] = '원인'                                                # U: 원인
+        row[21] = '대책'                                                # V: 대책
+        rows.append(row)
+    return rows
+
+def insert_vocs(db, count, **columns):
+    """
+    internal_voc에 count건 저장 + 데이터 버전 증가 (통계/내보내기 캐시 무효화) 후 커밋
+    - columns: 컬럼별 값 (고정값 또는 행 번호 i → 값 함수)
+    - 기본값: case_code P000000, P000001, ... / created_date 2024-03-01
+    """
+    from database import bump_data_version
+    columns = {'case_code': lambda i: f'P{i:06d}', 'created_date': '2024-03-01', **columns}
+    names = list(columns)
+    rows = [tuple(value(i) if callable(value) else value for value in columns.values()) for i in range(count)]
+    db.executemany(f"INSERT INTO internal_voc ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})", rows)
+    bump_data_version(db)
+    db.commit()
+
+def write_voc_workbook(path, rows):
+    """행 목록 → 엑셀 파일"""
+    pd.DataFrame(rows).to_excel(path, index=False)
+    return path
+
+def excel_bytes(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    buffer.seek(0)
+    return buffer
+
+def wait_job(client, job_id, timeout=60):
+    """백그라운드 작업이 끝날 때까지 /api/jobs/<job_id> 조회"""
+    import time
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f'/api/jobs/{job_id}').get_json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
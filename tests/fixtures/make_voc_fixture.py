@@ -0,0 +1,61 @@
+"""
+voc_fixture.xlsx 생성 (test_voc_extract.py의 컬럼 단위 추출 / 행 단위 추출 비교용)
+
+사용법: python tests/fixtures/make_voc_fixture.py
+- 고정 시드로 만들므로 다시 실행해도 같은 데이터
+- 워치/SM- 모델, 태그 공백/대소문자, 빈 셀/숫자 셀, 잘못된 사례코드 날짜, 'P'가 아닌 사례코드 등을 섞음
+"""
+import os
+import random
+
+import pandas as pd
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'voc_fixture.xlsx')
+ROWS = 300
+
+TITLES = ['갤럭시 워치7 배터리', 'Galaxy WATCH6 화면', 'watch 연결 끊김', '워치 충전 안됨', 'sm-s918n 발열',
+          'SM-A5461 카메라', '일반 문의', '', None, 12345, 'Watch Ultra 문의', '워치울 스트랩']
+REPRODUCTIONS = [
+    '[Model No.] SM-S918N\n[Build No.] S918NKSU1AWB1\n[OS Ver.] 14\n[Original Contents] 네이버 앱 오류',
+    '[model no.]SM-L310N [build no.] L310NKOU1 [os ver.] 5.0 [Original Contents] 카톡\n여러 줄\n원문',
+    '[Original Contents] 태그 하나만',
+    '[Model No.]   \n[Build No.] \n[OS Ver.]',
+    'samsung members 접수 [Model No.] SM-F946N',
+    'rdm 이슈 재현 경로 없음',
+    '',
+    None,
+    3.5,
+]
+PROBLEMS = ['카톡 알림 안됨', 'Samsung Members 문의', 'k zone 연동', '네이버 로그인 실패', '', None, 0]
+
+def case_code(rng, index):
+    kind = rng.random()
+    if kind < 0.7:
+        return f'P{rng.choice(["2401", "2312", "2402"])}{rng.randint(1, 28):02d}{index:05d}'
+    if kind < 0.8:
+        return f'P999999{index:05d}'      # 잘못된 날짜
+    if kind < 0.9:
+        return f'Q{index:08d}'            # 'P'가 아닌 사례코드 → 파일명 날짜
+    if kind < 0.95:
+        return None                       # 사례코드 없음 → 제외
+    return 20240101 + index               # 숫자 셀
+
+def build_rows(seed=20240315):
+    rng = random.Random(seed)
+    rows = []
+    for index in range(ROWS):
+        row = [None] * 22
+        row[0] = case_code(rng, index)
+        row[7] = rng.choice(TITLES)
+        row[12] = rng.choice(PROBLEMS)
+        row[13] = rng.choice(REPRODUCTIONS)
+        row[14] = rng.choice(['담당자', None])
+        row[17] = rng.choice(['수정', '', None])
+        row[20] = rng.choice(['원인', None, 1.0])
+        row[21] = rng.choice(['대책', None])
+        rows.append(row)
+    return rows
+
+if __name__ == '__main__':
+    pd.DataFrame(build_rows()).to_excel(FIXTURE_PATH, index=False)
+    print(f"생성: {FIXTURE_PATH} ({ROWS}행)")
@@ -0,0 +1,37 @@
+"""전체 VOC를 다시 처리하는 작업 (백그라운드 작업 + job_id)"""
+from conftest import insert_vocs, wait_job
+
+def test_app_rescan_runs_as_job(app_module, client, db):
+    insert_vocs(db, 10, case_code=lambda i: f'R{i}', title='제목',
+                problem=lambda i: '카톡 알림 오류' if i % 2 else '일반 문의', created_date='2024-01-05')
+    db.execute("DELETE FROM app_keywords")
+    db.execute("INSERT INTO app_keywords (app_name, keywords) VALUES ('카카오톡', '카톡, kakao')")
+    app_module.invalidate_voc_lookups(db)
+    db.commit()
+    
+    response = client.post('/api/app-keywords/rescan')
+    assert response.status_code == 202
+    job = wait_job(client, response.get_json()['job_id'])
+    
+    assert job['status'] == 'done'
+    assert (job['result']['scanned'], job['result']['updated']) == (10, 5)
+    assert job['rows_processed'] == 10
+    tagged = db.execute("SELECT COUNT(*) FROM internal_voc WHERE third_party_app = '카카오톡'").fetchone()[0]
+    assert tagged == 5
+
+def test_reproduction_backfill_runs_as_job(app_module, client, db):
+    insert_vocs(db, 6, case_code=lambda i: f'B{i}', title='일반 문의', problem='문제', created_date='2024-01-05')
+    db.execute("""UPDATE internal_voc SET reproduction_path =
+                  '[Model No.] SM-S918N [Build No.] S918NKSU1AWB1 [OS Ver.] 14 [Original Contents] 원문'
+                  WHERE case_code IN ('B0', 'B1', 'B2')""")
+    db.commit()
+    
+    response = client.post('/api/backfill/reproduction')
+    assert response.status_code == 202
+    job = wait_job(client, response.get_json()['job_id'])
+    
+    assert job['status'] == 'done'
+    assert (job['result']['scanned'], job['result']['updated']) == (6, 3)
+    row = db.execute("SELECT model_no, build_version, os_version, original_content FROM internal_voc "
+                     "WHERE case_code = 'B0'").fetchone()
+    assert row == ('SM-S918N', 'WB1', '14', '원문')
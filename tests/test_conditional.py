@@ -0,0 +1,79 @@
+"""
+조건부 GET (ETag / Last-Modified)
+- GET은 검증자를 보내고 일치하면 304
+- POST 조회는 검증자를 보내지 않고, If-None-Match가 와도 항상 본문 응답
+- 압축을 받는 요청은 200/304 모두 약한 ETag, 최종 수정과 같은 초에는 Last-Modified 생략
+"""
+from datetime import datetime, timezone
+
+from werkzeug.http import http_date
+
+from conftest import insert_vocs
+
+def test_get_statistics_not_modified(client, db):
+    insert_vocs(db, 1, model_name='SM-S918N')
+    response = client.get('/api/statistics/model')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    assert client.get('/api/statistics/model', headers={'If-None-Match': etag}).status_code == 304
+
+def test_post_models_monthly_has_no_validators(client, db):
+    insert_vocs(db, 2, model_name=lambda i: ['SM-S918N', 'SM-A546N'][i])
+    first = client.post('/api/statistics/models/monthly', json={'model_names': ['SM-S918N']})
+    assert first.status_code == 200
+    assert 'ETag' not in first.headers
+    assert 'Last-Modified' not in first.headers
+
+    # 다른 본문 + 이전 GET 응답의 ETag → 304가 아닌 해당 본문의 결과
+    etag = client.get('/api/statistics/model').headers['ETag']
+    second = client.post('/api/statistics/models/monthly', json={'model_names': ['SM-A546N']},
+                         headers={'If-None-Match': etag, 'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert second.status_code == 200
+    assert list(second.get_json()) == ['SM-A546N']
+
+def test_not_modified_keeps_weak_etag(client, db):
+    insert_vocs(db, 1, model_name='SM-S918N')
+    for accept, weak in (('gzip, br', True), ('identity', False)):
+        headers = {'Accept-Encoding': accept}
+        response = client.get('/api/statistics/model', headers=headers)
+        etag = response.headers['ETag']
+        assert etag.startswith('W/') is weak
+
+        # 304도 200과 같은 검증자 (압축 여부에 따라 W/ 유지)
+        not_modified = client.get('/api/statistics/model', headers={**headers, 'If-None-Match': etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers['ETag'] == etag
+        assert 'Accept-Encoding' in not_modified.headers['Vary']
+
+def test_last_modified_withheld_within_same_second(app_module, client, db, monkeypatch):
+    insert_vocs(db, 1, model_name='SM-S918N')
+    db.execute("UPDATE app_meta SET value = '2024-03-01 12:00:00.300000' WHERE key = 'data_updated_at'")
+    db.commit()
+    since = http_date(datetime(2024, 3, 1, 12, 0, 0).astimezone(timezone.utc))
+
+    class Clock(datetime):
+        current = datetime(2024, 3, 1, 12, 0, 0, 500000)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current.astimezone(tz) if tz else cls.current
+
+    monkeypatch.setattr(app_module, 'datetime', Clock)
+
+    # 수정과 같은 초: 이후 같은 초에 또 바뀔 수 있으므로 Last-Modified를 보내지 않고 날짜로 304도 주지 않음
+    response = client.get('/api/statistics/model')
+    assert 'Last-Modified' not in response.headers
+    assert client.get('/api/statistics/model', headers={'If-Modified-Since': since}).status_code == 200
+
+    # 그 초가 지나면 Last-Modified 전송, 같은 날짜로 재검증하면 304
+    Clock.current = datetime(2024, 3, 1, 12, 0, 1)
+    response = client.get('/api/statistics/model')
+    assert response.headers['Last-Modified'] == since
+    assert client.get('/api/statistics/model', headers={'If-Modified-Since': since}).status_code == 304
+
+def test_data_stamp_keeps_sub_second(app_module, db):
+    insert_vocs(db, 1)
+    stored = db.execute("SELECT value FROM app_meta WHERE key = 'data_updated_at'").fetchone()[0]
+    assert len(stored) == len('2024-03-01 12:00:00.000000')
+    assert app_module.get_data_stamp(db)[1] == datetime.fromisoformat(stored).astimezone(timezone.utc)
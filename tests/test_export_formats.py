@@ -0,0 +1,132 @@
+"""
+내보내기 형식별 왕복 확인 (exporters.py)
+- xlsx: 직접 만든 OOXML을 openpyxl / pandas로 다시 읽어 값과 셀 위치 확인
+- 내보내기 라우트: xlsx / csv / parquet 응답을 pandas로 다시 읽어 형태, 타입, 빈 값 확인
+"""
+import io
+from urllib.parse import quote
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import exporters
+from conftest import insert_vocs
+
+COLUMNS = [f'c{index}' for index in range(30)]   # AA~AD 열까지
+
+def sample_rows():
+    long_text = '가' * (exporters.XLSX_MAX_CELL_LENGTH + 100)
+    first = [None, 1, 2.5, True, False, float('nan'), 'a\x00b\x0bc\x1fd', '<tag attr="1">&amp; \'q\'</tag>',
+             long_text, '  앞뒤 공백  ', 2 ** 40, -0.125, float('inf'), '줄\n바꿈\t탭']
+    first += [f'r1-{index}' for index in range(len(first), len(COLUMNS))]
+    second = [f'r2-{index}' if index % 2 else None for index in range(len(COLUMNS))]
+    third = [index for index in range(len(COLUMNS))]
+    return [first, second, third]
+
+def xlsx_bytes(columns, batches):
+    return b''.join(exporters.stream_xlsx(columns, iter(batches)))
+
+def test_xlsx_round_trip_openpyxl():
+    rows = sample_rows()
+    data = xlsx_bytes(COLUMNS, [rows[:2], rows[2:]])   # 배치 경계에서도 행 번호 연속
+    ws = openpyxl.load_workbook(io.BytesIO(data)).active
+
+    assert (ws.max_row, ws.max_column) == (4, 30)
+    assert [cell.value for cell in ws[1]] == COLUMNS
+    assert ws['A1'].font.b
+
+    assert ws['A2'].value is None
+    assert ws['B2'].value == 1 and isinstance(ws['B2'].value, int)
+    assert ws['C2'].value == 2.5
+    assert ws['D2'].value is True and ws['E2'].value is False
+    assert ws['F2'].value is None                           # NaN → 빈 셀
+    assert ws['G2'].value == 'abcd'                         # XML 1.0 금지 제어 문자 제거
+    assert ws['H2'].value == '<tag attr="1">&amp; \'q\'</tag>'
+    assert len(ws['I2'].value) == exporters.XLSX_MAX_CELL_LENGTH
+    assert ws['J2'].value == '  앞뒤 공백  '                  # xml:space="preserve"
+    assert ws['K2'].value == 2 ** 40
+    assert ws['L2'].value == -0.125
+    assert ws['M2'].value is None                           # 무한대 → 빈 셀
+    assert ws['N2'].value == '줄\n바꿈\t탭'
+    assert ws['AA1'].value == 'c26' and ws['AA2'].value == 'r1-26' and ws['AD2'].value == 'r1-29'
+
+    assert ws['A3'].value is None and ws['B3'].value == 'r2-1' and ws['AD3'].value == 'r2-29'
+    assert [cell.value for cell in ws[4]] == list(range(30))
+
+def test_xlsx_round_trip_pandas():
+    rows = sample_rows()
+    df = pd.read_excel(io.BytesIO(xlsx_bytes(COLUMNS, [rows])))
+
+    assert df.shape == (3, 30)
+    assert list(df.columns) == COLUMNS
+    assert df['c1'].tolist()[0] == 1 and df['c2'].tolist()[0] == 2.5
+    assert pd.isna(df.loc[0, 'c0']) and pd.isna(df.loc[0, 'c5']) and pd.isna(df.loc[1, 'c0'])
+    assert df.loc[0, 'c7'] == rows[0][7]
+    assert df['c29'].tolist() == ['r1-29', 'r2-29', 29]
+
+def test_xlsx_header_only():
+    ws = openpyxl.load_workbook(io.BytesIO(xlsx_bytes(['case_code', '제목'], []))).active
+    assert [[cell.value for cell in row] for row in ws.iter_rows()] == [['case_code', '제목']]
+
+READERS = {
+    'xlsx': pd.read_excel,
+    'csv': lambda data: pd.read_csv(data, encoding='utf-8-sig'),
+    'parquet': pd.read_parquet,
+}
+
+@pytest.fixture
+def details_client(app_module, db):
+    import voc_details_app
+    return voc_details_app.app.test_client()
+
+def insert_export_vocs(db):
+    insert_vocs(db, 4, model_name='갤럭시 S24', title=lambda i: f'제목 {i}' if i % 2 else None,
+                created_date=lambda i: f'2024-03-0{i + 1}')
+
+@pytest.mark.parametrize('export_format', list(READERS))
+def test_export_read_back(client, db, export_format):
+    insert_export_vocs(db)
+    response = client.get('/api/export/excel', query_string={
+        'format': export_format, 'columns': 'id,case_code,title,created_date',
+        'start_date': '2024-03-01', 'end_date': '2024-03-31'})
+    assert response.status_code == 200
+    assert response.mimetype == exporters.EXPORT_FORMATS[export_format][1]
+    assert f'.{export_format}' in response.headers['Content-Disposition']
+
+    df = READERS[export_format](io.BytesIO(response.get_data()))
+    assert df.shape == (4, 4)
+    assert list(df.columns) == ['id', 'case_code', 'title', 'created_date']   # CSV BOM이 헤더에 남지 않음
+    assert df['id'].dtype == 'int64'
+    assert df['case_code'].tolist() == ['P000000', 'P000001', 'P000002', 'P000003']
+    assert df['title'].isna().tolist() == [True, False, True, False]        # None → 빈 셀
+    assert df['title'].dropna().tolist() == ['제목 1', '제목 3']
+    assert df['created_date'].astype(str).tolist() == ['2024-03-01', '2024-03-02', '2024-03-03', '2024-03-04']
+
+def test_parquet_without_pyarrow_is_400(client, details_client, db, monkeypatch):
+    monkeypatch.setattr(exporters, 'pq', None)
+    for http, url in ((client, '/api/export/excel'), (client, '/api/export/qdata/excel'),
+                      (details_client, '/api/voc/model/SM-S918N/export'),
+                      (details_client, '/api/voc/monthly/2024-03/export')):
+        response = http.get(url, query_string={'format': 'parquet'})
+        assert response.status_code == 400, url
+        assert 'pyarrow' in response.get_json()['error']
+    assert client.get('/api/export/excel', query_string={'format': 'xls'}).status_code == 400
+
+@pytest.mark.parametrize('url', ['/api/export/excel', '/api/export/qdata/excel',
+                                 '/api/voc/model/SM-S918N/export', '/api/voc/monthly/2024-03/export'])
+def test_export_unknown_column_is_400(client, details_client, db, url):
+    http = details_client if url.startswith('/api/voc/') else client
+    response = http.get(url, query_string={'columns': 'model_name,password'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == '알 수 없는 컬럼: password'
+
+def test_model_export_korean_filename(details_client, db):
+    insert_export_vocs(db)
+    response = details_client.get(f"/api/voc/model/{quote('갤럭시 S24')}/export", query_string={'format': 'csv'})
+    assert response.status_code == 200
+    disposition = response.headers['Content-Disposition']
+    assert disposition.startswith('attachment; filename="voc_ S24_')              # ASCII 대체 이름
+    assert f"filename*=UTF-8''{quote('voc_갤럭시 S24_')}" in disposition         # RFC 5987
+    assert disposition.endswith(".csv")
+    assert len(pd.read_csv(io.BytesIO(response.get_data()), encoding='utf-8-sig')) == 4
@@ -0,0 +1,35 @@
+"""
+내보내기 보관소: 같은 요청은 보관 파일 전송, ETag로 304 / Range 이어받기
+"""
+from conftest import insert_vocs
+
+URL = '/api/export/excel?format=csv&start_date=2024-03-01&end_date=2024-03-31'
+
+def test_stored_export_supports_range(app_module, client, db):
+    insert_vocs(db, 50, model_name='SM-S918N', title=lambda i: f'제목 {i}', created_date='2024-03-05')
+    miss = client.get(URL)
+    body = miss.get_data()
+    assert miss.headers['X-Export-Cache'] == 'miss'
+    etag = miss.headers['ETag']
+
+    hit = client.get(URL)
+    assert hit.headers['X-Export-Cache'] == 'hit'
+    assert hit.headers['ETag'] == etag
+    assert hit.headers['Accept-Ranges'] == 'bytes'
+    assert hit.get_data() == body
+
+    assert client.get(URL, headers={'If-None-Match': etag}).status_code == 304
+
+    # 끊긴 다운로드 이어받기
+    partial = client.get(URL, headers={'Range': 'bytes=10-', 'If-Range': etag})
+    assert partial.status_code == 206
+    assert partial.headers['Content-Range'] == f'bytes 10-{len(body) - 1}/{len(body)}'
+    assert partial.get_data() == body[10:]
+
+    # 데이터가 바뀌면 다른 키 → 이전 ETag로는 전체 파일
+    app_module.bump_data_version(db)
+    db.commit()
+    changed = client.get(URL, headers={'Range': 'bytes=10-', 'If-Range': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_data() == body
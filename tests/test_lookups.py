@@ -0,0 +1,39 @@
+"""칩셋 매핑 / 앱 키워드 / 모델명 별칭 조회 캐시"""
+import sqlite3
+
+from conftest import wait_job
+
+def test_lookups_reload_after_edit_from_another_worker(app_module, client):
+    client.post('/api/chipset-mapping/add', json={'model_name': 'SM-T001', 'chipset': 'CHIP-A'})
+    assert app_module.load_voc_lookups()['chipset_map']['SM-T001'] == 'CHIP-A'
+    
+    # 다른 워커 프로세스의 수정: 이 프로세스의 캐시는 건드리지 않고 DB만 변경
+    other = sqlite3.connect('voc_data.db')
+    other.execute("UPDATE chipset_mapping SET chipset = 'CHIP-B' WHERE model_name = 'SM-T001'")
+    other.execute("INSERT INTO model_aliases (alias, model_name) VALUES ('SM-T001X', 'T1')")
+    app_module.invalidate_voc_lookups(other)
+    other.commit()
+    other.close()
+    
+    lookups = app_module.load_voc_lookups()
+    assert lookups['chipset_map']['SM-T001'] == 'CHIP-B'
+    assert lookups['model_aliases']['SM-T001X'] == 'T1'
+
+def test_lookups_reused_while_version_unchanged(app_module, db):
+    assert app_module.load_voc_lookups() is app_module.load_voc_lookups()
+
+def test_alias_edits_bump_data_version(app_module, client, db):
+    # 별칭이 없는 VOC만 있어도 (재매핑 0건) 별칭 저장/삭제 자체로 데이터 버전 증가
+    requests = [
+        lambda: client.post('/api/model-aliases/add', json={'alias': 'sm-t002x', 'model_name': 'T2'}),
+        lambda: client.post('/api/model-aliases/batch', json={'aliases': [{'alias': 'SM-T003X', 'model_name': 'T3'}]}),
+        lambda: client.delete('/api/model-aliases/SM-T002X'),
+    ]
+    for send in requests:
+        before = app_module.get_data_version(db)
+        response = send()
+        assert response.status_code == 200, response.get_json()
+        assert app_module.get_data_version(db) > before
+        job_id = response.get_json().get('job_id')
+        if job_id:
+            assert wait_job(client, job_id)['status'] == 'done'
@@ -0,0 +1,40 @@
+"""
+모델명 재매핑: UPDATE ... FROM (SQLite 3.33+)과 이전 버전용 UPDATE가 같은 결과
+"""
+import sqlite3
+
+import pytest
+
+from conftest import insert_vocs
+
+TITLES = ['Galaxy Watch5 배터리', '갤럭시 워치6 문의', 'watch 연결 끊김', '카메라 오류', None, 'WATCH4 발열']
+MODELS = ['SM-S918N', 'galaxy-test', 'SM-R910N', 'Galaxy-Test', 'SM-A546N', 'WATCH4']
+
+@pytest.fixture
+def alias(db):
+    db.execute("INSERT INTO model_aliases (alias, model_name) VALUES ('GALAXY-TEST', 'SM-T000N')")
+    db.commit()
+    yield
+    db.execute("DELETE FROM model_aliases WHERE alias = 'GALAXY-TEST'")
+    db.commit()
+
+def remap(app_module, db, monkeypatch, version):
+    monkeypatch.setattr(sqlite3, 'sqlite_version_info', version)
+    db.execute("DELETE FROM internal_voc")
+    insert_vocs(db, 60, title=lambda i: TITLES[i % len(TITLES)], model_name=lambda i: MODELS[i % len(MODELS)])
+    watch = app_module.remap_watch_models(db)
+    mapping = app_module.remap_model_names(db)
+    rows = db.execute("SELECT case_code, model_name FROM internal_voc ORDER BY case_code").fetchall()
+    return watch, mapping, [tuple(row) for row in rows]
+
+def test_legacy_update_matches_update_from(app_module, db, alias, monkeypatch):
+    assert app_module.update_from_supported()
+    current = remap(app_module, db, monkeypatch, (3, 40, 1))
+    legacy = remap(app_module, db, monkeypatch, (3, 31, 1))
+    assert not app_module.update_from_supported()
+
+    assert legacy == current
+    watch, mapping, rows = current
+    assert watch[0] > 0 and mapping[0] > 0
+    assert ('P000000', 'WATCH5') in rows and ('P000001', '워치6') in rows
+    assert ('P000003', 'SM-T000N') in rows
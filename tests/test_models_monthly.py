@@ -0,0 +1,36 @@
+"""
+여러 모델 월별 통계 (POST): 잘못된 요청 본문은 400
+"""
+import pytest
+
+from conftest import insert_vocs
+
+ROUTES = ['/api/statistics/models/monthly', '/api/statistics/qdata/models/monthly']
+
+@pytest.mark.parametrize('route', ROUTES)
+@pytest.mark.parametrize('body', [
+    {'model_names': ['SM-S918N'], 'start_date': '2024-13-01', 'end_date': '2024-03-31'},
+    {'model_names': ['SM-S918N'], 'start_date': '20240101', 'end_date': '2024-03-31'},
+    {'model_names': ['SM-S918N'], 'start_date': 20240101, 'end_date': '2024-03-31'},
+    {'model_names': ['SM-S918N'], 'start_date': '2024-04-01', 'end_date': '2024-03-31'},
+    {'model_names': 'SM-S918N'},
+    ['SM-S918N'],
+])
+def test_bad_body_is_400(client, route, body):
+    response = client.post(route, json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+@pytest.mark.parametrize('route', ROUTES)
+def test_non_json_body_is_not_500(client, route):
+    # JSON이 아니면 빈 요청으로 처리 (모델 미선택 응답)
+    response = client.post(route, data='model_names=SM-S918N')
+    assert response.status_code in (200, 400)
+
+def test_date_range_fills_months(client, db):
+    insert_vocs(db, 1, model_name='SM-S918N', created_date='2024-02-10')
+    response = client.post(ROUTES[0], json={'model_names': ['SM-S918N'],
+                                            'start_date': '2024-01-01', 'end_date': '2024-03-31'})
+    assert response.status_code == 200
+    assert [(row['month'], row['count']) for row in response.get_json()['SM-S918N']] == \
+        [('2024-01', 0), ('2024-02', 1), ('2024-03', 0)]
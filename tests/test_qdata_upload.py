@@ -0,0 +1,67 @@
+"""
+Q-data 업로드: 숫자 S/N, log_id 정규화
+- 스트리밍 배치마다 열 타입(int/float)이 달라도 같은 문자열로 저장
+- 기존 방식으로 저장된 '123.0' 값은 마이그레이션 후 재업로드 시 중복으로 걸러짐
+"""
+import openpyxl
+import pandas as pd
+
+from conftest import wait_job
+
+def write_qdata_workbook(app, path, rows):
+    """Q-data 엑셀 형식 (9행 헤더, QDATA_USECOLS 위치에 값)"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    width = app.QDATA_USECOLS[-1] + 1
+    for _ in range(app.QDATA_HEADER_ROW):
+        ws.append([None] * width)
+    ws.append([f'col{i}' for i in range(width)])
+    for values in rows:
+        row = [None] * width
+        for index, value in zip(app.QDATA_USECOLS, values):
+            row[index] = value
+        ws.append(row)
+    wb.save(path)
+    return path
+
+def qdata_row(serial_number, log_id):
+    return [240315, '수리', '메인보드', '교체', '내용', 'SM-S918N',
+            serial_number, log_id, 'S918NKSU1AWB1', 'S918NKSU1AWB2']
+
+def test_numeric_codes_match_across_batches(app_module):
+    # 빈 칸이 있는 배치는 float 열, 없는 배치는 int 열로 추론됨
+    float_batch = app_module.clean_qdata_frame(pd.DataFrame(
+        [qdata_row(123, 7), qdata_row(None, None), qdata_row(456, None)], columns=app_module.QDATA_COLUMNS))
+    int_batch = app_module.clean_qdata_frame(pd.DataFrame(
+        [qdata_row(123, 7), qdata_row(456, 8)], columns=app_module.QDATA_COLUMNS))
+    mixed_batch = app_module.clean_qdata_frame(pd.DataFrame(
+        [qdata_row(' R3CT12 ', 'L1'), qdata_row(123.0, 7.0)], columns=app_module.QDATA_COLUMNS))
+
+    assert float_batch['serial_number'].tolist() == ['123', '456']
+    assert float_batch['log_id'].tolist() == ['7', None]
+    assert int_batch['serial_number'].tolist() == ['123', '456']
+    assert int_batch['log_id'].tolist() == ['7', '8']
+    assert mixed_batch['serial_number'].tolist() == ['R3CT12', '123']
+    assert mixed_batch['log_id'].tolist() == ['L1', '7']
+
+def test_legacy_float_codes_dedupe_after_migration(app_module, db, client, tmp_path):
+    # 기존 방식으로 저장된 행 ('123.0')
+    db.execute("""INSERT INTO q_data (service_date, model_name, serial_number, log_id, uploaded_date)
+                  VALUES ('2024-03-14', 'SM-S918N', '1001.0', '55.0', '2024-03-14 00:00:00'),
+                         ('2024-03-14', 'SM-S918N', 'R3CT.0', 'LOG.0', '2024-03-14 00:00:00')""")
+    db.execute("DELETE FROM app_meta WHERE key = 'qdata_codes_normalized'")
+    db.commit()
+    app_module.init_db()
+
+    rows = db.execute("SELECT serial_number, log_id FROM q_data ORDER BY id").fetchall()
+    assert [tuple(row) for row in rows] == [('1001', '55'), ('R3CT.0', 'LOG.0')]
+
+    path = write_qdata_workbook(app_module, tmp_path / 'qdata.xlsx',
+                                [qdata_row(1001, 55), qdata_row(1002, 56)])
+    with open(path, 'rb') as f:
+        response = client.post('/api/upload/qdata', data={'file': (f, 'qdata.xlsx')})
+    job = wait_job(client, response.get_json()['job_id'])
+
+    assert job['status'] == 'done', job
+    assert (job['result']['inserted'], job['result']['duplicates']) == (1, 1)
+    assert db.execute("SELECT COUNT(*) FROM q_data").fetchone()[0] == 3
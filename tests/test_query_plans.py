@@ -0,0 +1,87 @@
+"""
+통계 / 내보내기 조회 계획 (EXPLAIN QUERY PLAN)
+- 라우트가 실제로 실행한 SQL을 trace로 모아 계획 확인
+- 통계 API는 일별 집계 테이블을 인덱스 범위 검색, 내보내기는 created_date 인덱스 범위 검색
+- 원본 기간 집계는 (created_date, X) 커버링 인덱스만 읽음
+- 어떤 쿼리도 internal_voc / voc_daily_rollup 전체를 SCAN 하지 않아야 함
+"""
+import pytest
+
+from conftest import insert_vocs
+
+DATE_RANGE = 'start_date=2024-02-01&end_date=2024-05-31'
+
+STATISTICS_ROUTES = ['model', 'weekly', 'monthly', 'chipset', 'app']
+
+def insert_stat_vocs(db, count=500):
+    insert_vocs(db, count, model_name=lambda i: f'SM-S91{i % 5}N', chipset=lambda i: f'SM{i % 3}',
+                third_party_app=lambda i: f'앱{i % 4}', created_date=lambda i: f'2024-{i % 9 + 1:02d}-{i % 28 + 1:02d}')
+
+@pytest.fixture
+def traced_sql(app_module, db, monkeypatch):
+    """요청마다 get_db()가 돌려준 연결의 SQL 기록"""
+    statements = []
+    connections = []
+    get_db = app_module.get_db
+
+    def traced_get_db(*args):
+        conn = get_db(*args)
+        conn.set_trace_callback(statements.append)
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(app_module, 'get_db', traced_get_db)
+    yield statements
+    for conn in connections:
+        conn.set_trace_callback(None)
+
+def query_plans(db, statements, table):
+    """table을 읽는 SELECT마다 계획 상세 목록"""
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith('SELECT') and table in sql:
+            plans.append([row[3] for row in db.execute('EXPLAIN QUERY PLAN ' + sql)])
+    return plans
+
+def assert_no_table_scan(plans):
+    for plan in plans:
+        for detail in plan:
+            assert not detail.startswith(('SCAN internal_voc', 'SCAN voc_daily_rollup')), plan
+
+@pytest.mark.parametrize('route', STATISTICS_ROUTES)
+@pytest.mark.parametrize('query', ['', DATE_RANGE])
+def test_statistics_search_rollup_index(app_module, db, client, traced_sql, route, query):
+    insert_stat_vocs(db)
+    response = client.get(f'/api/statistics/{route}?{query}')
+    assert response.status_code == 200
+
+    plans = query_plans(db, traced_sql, 'voc_daily_rollup')
+    assert plans
+    assert_no_table_scan(plans)
+    assert all(plan[0].startswith('SEARCH voc_daily_rollup USING ') and 'INDEX idx_voc_daily_rollup_' in plan[0]
+               for plan in plans), plans
+    # 원본 테이블은 읽지 않음
+    assert not query_plans(db, traced_sql, 'internal_voc')
+
+def test_export_date_range_searches_created_index(app_module, db, client, traced_sql):
+    insert_stat_vocs(db)
+    response = client.get(f'/api/export/excel?format=csv&{DATE_RANGE}')
+    assert response.status_code == 200
+    response.get_data()
+
+    plans = query_plans(db, traced_sql, 'FROM internal_voc')
+    assert len(plans) == 1
+    assert_no_table_scan(plans)
+    assert plans[0][0].startswith('SEARCH internal_voc USING INDEX idx_internal_voc_created_')
+    assert '(created_date>? AND created_date<?)' in plans[0][0]
+
+@pytest.mark.parametrize('group_column', ['model_name', 'chipset', 'third_party_app'])
+def test_raw_range_grouping_uses_covering_index(app_module, db, group_column):
+    # 원본 테이블에서 직접 기간 + 분류 집계 (집계 테이블 도입 전 통계 쿼리 형태)
+    # INTERNAL_VOC_INDEXES의 (created_date, X) 인덱스만으로 처리되는지 확인
+    sql = f"""SELECT {group_column}, COUNT(*) FROM internal_voc
+              WHERE {app_module.CREATED_DATE_RANGE_SQL}
+              GROUP BY {group_column}"""
+    plan = [row[3] for row in db.execute('EXPLAIN QUERY PLAN ' + sql, ('2024-02-01', '2024-05-31'))]
+    assert_no_table_scan([plan])
+    assert plan[0].startswith('SEARCH internal_voc USING COVERING INDEX idx_internal_voc_created_'), plan
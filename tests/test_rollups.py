@@ -0,0 +1,68 @@
+"""
+일별 집계 테이블: 전체 삭제 / 중복 제거 후에도 원본과 일치하고 트리거가 복구되는지
+"""
+from conftest import insert_vocs
+
+def insert_qdata(db, count, serial_number=lambda i: f'SN{i}'):
+    db.executemany("""INSERT INTO q_data (service_date, model_name, process_type, serial_number, log_id, uploaded_date)
+                      VALUES (?, ?, '수리', ?, ?, '2024-03-01 00:00:00')""",
+                   [(f'2024-03-{i % 5 + 1:02d}', f'SM-S91{i % 3}N', serial_number(i), f'LOG{i}') for i in range(count)])
+    db.commit()
+
+def assert_consistent(client):
+    result = client.get('/api/rollups/check').get_json()
+    assert result['consistent'] is True, result
+
+def rollup_total(db, rollup):
+    return db.execute(f"SELECT COALESCE(SUM(count), 0) FROM {rollup}").fetchone()[0]
+
+def triggers(db, table):
+    return {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?",
+                                         (table,))}
+
+def test_reset_voc_data_clears_rollup(client, db):
+    insert_vocs(db, 30, model_name=lambda i: f'SM-S91{i % 3}N', created_date=lambda i: f'2024-03-{i % 7 + 1:02d}')
+    before = triggers(db, 'internal_voc')
+    assert_consistent(client)
+
+    response = client.post('/api/reset/data')
+    assert response.status_code == 200
+    assert 'VOC 30건' in response.get_json()['message']
+    assert rollup_total(db, 'voc_daily_rollup') == 0
+    assert triggers(db, 'internal_voc') == before
+    assert_consistent(client)
+
+    # 재생성된 트리거로 이후 저장분 집계
+    insert_vocs(db, 2, model_name='SM-A546N')
+    assert rollup_total(db, 'voc_daily_rollup') == 2
+    assert_consistent(client)
+
+def test_reset_qdata_clears_rollup(client, db):
+    insert_qdata(db, 20)
+    before = triggers(db, 'q_data')
+
+    response = client.post('/api/reset/qdata')
+    assert response.status_code == 200
+    assert '20건' in response.get_json()['message']
+    assert rollup_total(db, 'qdata_daily_rollup') == 0
+    assert triggers(db, 'q_data') == before
+    assert_consistent(client)
+
+    insert_qdata(db, 3)
+    assert rollup_total(db, 'qdata_daily_rollup') == 3
+    assert_consistent(client)
+
+def test_remove_qdata_duplicates_rebuilds_rollup(client, db):
+    # S/N 4종류 × 5건 → 4건만 남음
+    insert_qdata(db, 20, serial_number=lambda i: f'SN{i % 4}')
+    before = triggers(db, 'q_data')
+
+    response = client.post('/api/qdata/remove-duplicates')
+    assert response.get_json()['removed'] == 16
+    assert rollup_total(db, 'qdata_daily_rollup') == 4
+    assert triggers(db, 'q_data') == before
+    assert_consistent(client)
+
+    insert_qdata(db, 1, serial_number=lambda i: 'SN-NEW')
+    assert rollup_total(db, 'qdata_daily_rollup') == 5
+    assert_consistent(client)
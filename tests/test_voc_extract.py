@@ -0,0 +1,35 @@
+"""컬럼 단위 VOC 추출(extract_voc_frame) == 행 단위 추출(process_voc_row) (fixtures/voc_fixture.xlsx)"""
+import os
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'voc_fixture.xlsx')
+FILENAME = 'VOC_20240315.xlsx'  # 'P'가 아닌 사례코드는 파일명 날짜 사용
+
+def per_row_records(app_module, df, lookups):
+    records = []
+    for _, row in df.iterrows():
+        case_code, voc_data, is_unmapped = app_module.process_voc_row(row, FILENAME, lookups)
+        if case_code is None:
+            continue
+        records.append(tuple([case_code] + [voc_data[column] for column in app_module.VOC_OUTPUT_COLUMNS[1:-1]]
+                             + [is_unmapped]))
+    return records
+
+def test_extract_voc_frame_matches_process_voc_row(app_module, db):
+    db.execute("DELETE FROM chipset_mapping")
+    db.execute("INSERT INTO chipset_mapping (model_name, chipset) VALUES ('SM-S918N', 'SM8550'), ('워치7', 'W1000')")
+    db.execute("DELETE FROM app_keywords")
+    db.execute("INSERT INTO app_keywords (app_name, keywords) VALUES ('카카오톡', '카톡'), ('Naver', '네이버')")
+    app_module.invalidate_voc_lookups(db)
+    db.commit()
+    lookups = app_module.load_voc_lookups()
+    
+    with open(FIXTURE, 'rb') as f:
+        df = app_module.read_excel_with_drm(app_module.FileStorage(stream=f, filename=FILENAME))
+    
+    expected = per_row_records(app_module, df, lookups)
+    frame = app_module.extract_voc_frame(df, FILENAME, lookups)
+    actual = [tuple(record) for record in frame.itertuples(index=False)]
+    
+    assert len(expected) > 250
+    # 값과 타입까지 같은지: repr 바이트 비교 (1 != '1', 1.0 != 1, None != nan)
+    assert repr(actual).encode('utf-8') == repr(expected).encode('utf-8')
@@ -0,0 +1,56 @@
+"""
+VOC 목록 API (voc_details_app): columns 검증은 내보내기와 같은 규칙
+- 월별 목록/페이지의 month는 YYYY-MM만 허용, 페이지 스크립트에는 JS 문자열로 삽입
+"""
+import os
+from urllib.parse import quote
+
+import pytest
+
+from conftest import insert_vocs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def details_client(app_module, db):
+    import voc_details_app
+    return voc_details_app.app.test_client()
+
+@pytest.mark.parametrize('url', ['/api/voc/model/SM-S918N/list', '/api/voc/monthly/2024-03/list'])
+def test_unknown_column_is_400(details_client, db, url):
+    response = details_client.get(url, query_string={'columns': 'case_code,password'})
+    assert response.status_code == 400
+    assert 'password' in response.get_json()['error']
+
+    assert details_client.get(url, query_string={'columns': ','}).status_code == 400
+
+def test_selected_columns(details_client, db):
+    insert_vocs(db, 3, model_name='SM-S918N', title=lambda i: f'제목 {i}', created_date=lambda i: f'2024-03-{i + 1:02d}')
+    response = details_client.get('/api/voc/model/SM-S918N/list',
+                                  query_string={'columns': 'case_code, title', 'limit': 2})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['vocs'] == [{'id': data['vocs'][0]['id'], 'case_code': 'P000002', 'title': '제목 2'},
+                            {'id': data['vocs'][1]['id'], 'case_code': 'P000001', 'title': '제목 1'}]
+    assert data['next_cursor']
+
+@pytest.mark.parametrize('month', ["2024-03';alert(1)", '2024-3', '2024-03\n'])
+def test_monthly_rejects_malformed_month(details_client, db, month):
+    for url in (f'/voc/monthly/{quote(month)}', f'/api/voc/monthly/{quote(month)}/list'):
+        response = details_client.get(url)
+        assert response.status_code == 400, url
+        assert 'YYYY-MM' in response.get_json()['error']
+
+def test_monthly_page_list_url_is_js_string(app_module):
+    import voc_details_app
+    with open(os.path.join(ROOT, 'voc_monthly_list.html'), encoding='utf-8') as f:
+        template = voc_details_app.app.jinja_env.from_string(f.read())
+
+    def render(month):
+        with voc_details_app.app.test_request_context():
+            return template.render(month=month, model_stats=[], consecutive_models=[])
+
+    assert 'const LIST_URL = "/api/voc/monthly/2024-03/list";' in render('2024-03')
+    html = render("x';</script><script>alert(1)//")
+    assert '<script>alert(1)' not in html
+    assert 'const LIST_URL = "/api/voc/monthly/x%27%3B%3C/script%3E%3Cscript%3Ealert%281%29///list";' in html
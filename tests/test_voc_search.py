@@ -0,0 +1,71 @@
+"""
+VOC 검색
+- 관련도순은 최근 일치 VOC_SEARCH_RANK_WINDOW건 안에서 정렬, 넘치면 truncated
+- 전문 검색 색인을 쓸 수 없는 SQLite에서는 LIKE 검색으로 동작
+"""
+import sqlite3
+
+import pytest
+
+from conftest import insert_vocs
+
+def insert_search_vocs(db, count):
+    insert_vocs(db, count, model_name='SM-S918N', title=lambda i: f'배터리 발열 문의 {i}')
+
+def search(client, **params):
+    response = client.get('/api/voc/search', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def test_rank_window_truncated(app_module, client, db, monkeypatch):
+    insert_search_vocs(db, 5)
+    monkeypatch.setattr(app_module, 'VOC_SEARCH_RANK_WINDOW', 3)
+    result = search(client, q='배터리')
+    assert result['fulltext'] is True
+    assert (result['sort'], result['rank_window'], result['truncated']) == ('rank', 3, True)
+    assert len(result['results']) == 3
+
+    monkeypatch.setattr(app_module, 'VOC_SEARCH_RANK_WINDOW', 5)
+    assert search(client, q='배터리')['truncated'] is False
+    assert search(client, q='배터리', sort='recent')['truncated'] is False
+
+@pytest.fixture
+def without_fulltext(app_module, db, monkeypatch):
+    """trigram을 지원하지 않는 SQLite처럼 검색 테이블/트리거 없이 실행"""
+    monkeypatch.setattr(sqlite3, 'sqlite_version_info', (3, 31, 1))
+    c = db.cursor()
+    for trigger in ('trg_voc_fts_insert', 'trg_voc_fts_delete', 'trg_voc_fts_update'):
+        c.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    c.execute("DROP TABLE IF EXISTS voc_fts")
+    db.commit()
+    assert app_module.init_voc_search(c) is False
+    assert not app_module.voc_search_available(c)
+    yield
+    monkeypatch.undo()
+    assert app_module.init_voc_search(c) is True
+    db.commit()
+
+def test_like_fallback_without_fulltext(client, db, without_fulltext):
+    insert_search_vocs(db, 4)
+    result = search(client, q='배터리 발열', limit=3)
+    assert (result['fulltext'], result['sort'], result['truncated']) == (False, 'recent', False)
+    assert [item['case_code'] for item in result['results']] == ['P000003', 'P000002', 'P000001']
+
+    result = search(client, q='배터리 발열', limit=3, cursor=result['next_cursor'])
+    assert [item['case_code'] for item in result['results']] == ['P000000']
+    assert result['next_cursor'] is None
+
+def test_reset_clears_index(client, db):
+    insert_search_vocs(db, 5)
+    assert len(search(client, q='배터리')['results']) == 5
+
+    assert client.post('/api/reset/data').status_code == 200
+    assert search(client, q='배터리')['results'] == []
+    assert search(client, q='배터리', sort='recent')['results'] == []
+    # 색인과 internal_voc(외부 콘텐츠) 일치 확인 (불일치면 OperationalError)
+    db.execute("INSERT INTO voc_fts (voc_fts, rank) VALUES ('integrity-check', 1)")
+
+    # 재생성된 트리거로 이후 저장분 색인
+    insert_vocs(db, 1, case_code='P900000', title='배터리 급속 소모')
+    assert [item['case_code'] for item in search(client, q='배터리')['results']] == ['P900000']
+    db.execute("INSERT INTO voc_fts (voc_fts, rank) VALUES ('integrity-check', 1)")
@@ -0,0 +1,33 @@
+"""사내 VOC 업로드 저장 (청크 일괄 저장 / 실패 행만 제외)"""
+from conftest import voc_workbook_rows, write_voc_workbook
+
+def run_upload(app_module, path):
+    job_id = app_module._register_job('internal_voc', path.name)
+    return app_module.run_internal_voc_upload(job_id, str(path), path.name)
+
+def test_upload_counts_inserted_and_updated(app_module, db, tmp_path):
+    path = write_voc_workbook(tmp_path / 'VOC_20240315.xlsx', voc_workbook_rows(30))
+    
+    first = run_upload(app_module, path)
+    assert (first['inserted'], first['updated'], first['errors']) == (30, 0, 0)
+    
+    second = run_upload(app_module, path)
+    assert (second['inserted'], second['updated'], second['errors']) == (0, 30, 0)
+    assert db.execute("SELECT COUNT(*) FROM internal_voc").fetchone()[0] == 30
+
+def test_bad_row_fails_alone(app_module, db, tmp_path, monkeypatch):
+    """청크 안의 한 행이 실패해도 나머지 행은 저장"""
+    extract_voc_frame = app_module.extract_voc_frame
+    
+    def extract_with_bad_row(df, file_filename, lookups=None):
+        out = extract_voc_frame(df, file_filename, lookups)
+        out.at[5, 'title'] = {'not': 'bindable'}  # SQLite가 저장할 수 없는 값
+        return out
+    
+    monkeypatch.setattr(app_module, 'extract_voc_frame', extract_with_bad_row)
+    path = write_voc_workbook(tmp_path / 'VOC_20240315.xlsx', voc_workbook_rows(20))
+    
+    result = run_upload(app_module, path)
+    
+    assert (result['inserted'], result['updated'], result['errors']) == (19, 0, 1)
+    assert db.execute("SELECT COUNT(*) FROM internal_voc").fetchone()[0] == 19
@@ -3,6 +3,11 @@ import sqlite3
 import pandas as pd
 from datetime import datetime, timedelta
 import os
+import re
+
+import database
+from database import get_db, get_data_version
+from exporters import parse_export_columns, parse_export_format, export_store_key, stored_export_response
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
@@ -10,39 +15,164 @@ app.config['SECRET_KEY'] = 'voc-details-secret-key'
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
+# DB 연결 풀 (요청 종료 시 연결 반납)
+database.init_app(app)
+
 # 업로드 폴더 생성
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-@app.route('/voc/model/<model_name>')
-def show_model_vocs(model_name):
-    """모델별 VOC 목록 페이지"""
-    conn = sqlite3.connect('voc_data.db')
+# 내보내기 파일 보관소 (app.py와 같은 폴더/키 규칙)
+EXPORT_STORE_FOLDER = os.path.join(app.config['UPLOAD_FOLDER'], 'exports')
+
+def export_data_version(conn):
+    """보관소 키용 데이터 버전 (app.py가 초기화하지 않은 DB면 None → 보관소 사용 안 함)"""
+    try:
+        return get_data_version(conn)
+    except sqlite3.OperationalError:
+        return None
+
+# ========== VOC 목록 (키셋 페이지) ==========
+# 페이지는 목록 없이 먼저 그리고, VOC 목록은 JSON API로 limit건씩 이어서 불러옴
+# - 정렬/커서 기준: (created_date, id) → (model_name, created_date) 인덱스 범위만 읽고 멈춤 (OFFSET 없음)
+# - created_date가 NULL인 VOC는 행 값 비교가 안 되므로 따로 이어 붙임 (내림차순: 마지막, 오름차순: 처음)
+VOC_LIST_COLUMNS = ['case_code', 'model_name', 'title', 'problem', 'cause', 'solution',
+                    'chipset', 'issue_type', 'third_party_app', 'created_date']
+VOC_LIST_DEFAULT_COLUMNS = ['case_code', 'model_name', 'cause', 'solution', 'created_date', 'title', 'problem']
+VOC_LIST_PAGE_SIZE = 50
+VOC_LIST_MAX_PAGE_SIZE = 200
+
+def parse_voc_list_args():
+    """
+    목록 API 공통 파라미터 (columns, order, limit, cursor)
+    - columns는 내보내기와 같은 검증 (알 수 없는 컬럼이면 ValueError → 400)
+    """
+    columns = parse_export_columns(request.args.get('columns'), VOC_LIST_COLUMNS, VOC_LIST_DEFAULT_COLUMNS)
     
-    # 모델별 VOC 조회
-    query = """
-        SELECT case_code, model_name, cause, solution, created_date, title, problem
-        FROM internal_voc
-        WHERE model_name = ?
-        ORDER BY created_date DESC
+    order = request.args.get('order', 'desc')
+    if order not in ('asc', 'desc'):
+        raise ValueError('order는 asc 또는 desc만 가능합니다.')
+    
+    limit = request.args.get('limit', VOC_LIST_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, VOC_LIST_MAX_PAGE_SIZE))
+    
+    # cursor = "created_date|id" (created_date가 NULL이면 빈 문자열)
+    cursor = request.args.get('cursor')
+    if cursor:
+        last_date, _, last_id = cursor.rpartition('|')
+        cursor = (last_date or None, int(last_id))
+    
+    return columns, order, limit, cursor
+
+def fetch_voc_page(conn, where, params, columns, order, limit, cursor=None):
+    """
+    (created_date, id) 키셋 페이지 조회
+    반환: (rows, next_cursor)
     """
-    df = pd.read_sql_query(query, conn, params=(model_name,))
+    select_columns = ', '.join(['id'] + [column for column in columns if column != 'id'])
+    if 'created_date' not in columns:
+        select_columns += ', created_date'
+    direction = 'DESC' if order == 'desc' else 'ASC'
+    compare = '<' if order == 'desc' else '>'
     
-    conn.close()
+    def dated(remaining, after=None):
+        query = f"SELECT {select_columns} FROM internal_voc WHERE {where} AND created_date IS NOT NULL"
+        query_params = list(params)
+        if after:
+            query += f" AND (created_date, id) {compare} (?, ?)"
+            query_params.extend(after)
+        query += f" ORDER BY created_date {direction}, id {direction} LIMIT ?"
+        return conn.execute(query, query_params + [remaining]).fetchall()
     
+    def undated(remaining, after_id=None):
+        query = f"SELECT {select_columns} FROM internal_voc WHERE {where} AND created_date IS NULL"
+        query_params = list(params)
+        if after_id is not None:
+            query += f" AND id {compare} ?"
+            query_params.append(after_id)
+        query += f" ORDER BY id {direction} LIMIT ?"
+        return conn.execute(query, query_params + [remaining]).fetchall()
+    
+    # limit + 1건까지 읽어 다음 페이지 존재 여부 확인
+    wanted = limit + 1
+    if order == 'desc':
+        if cursor is None or cursor[0] is not None:
+            rows = dated(wanted, cursor)
+            if len(rows) < wanted:
+                rows += undated(wanted - len(rows))
+        else:
+            rows = undated(wanted, cursor[1])
+    else:
+        if cursor is None or cursor[0] is None:
+            rows = undated(wanted, cursor[1] if cursor else None)
+            if len(rows) < wanted:
+                rows += dated(wanted - len(rows))
+        else:
+            rows = dated(wanted, cursor)
+    
+    names = [name.strip() for name in select_columns.split(',')]
+    rows = [dict(zip(names, row)) for row in rows]
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = f"{last['created_date'] or ''}|{last['id']}"
+    
+    return [{column: row[column] for column in ['id'] + columns} for row in rows], next_cursor
+
+MONTH_PATTERN = re.compile(r'\d{4}-\d{2}')
+
+def month_bounds(month):
+    """'YYYY-MM' → (해당 월 1일, 다음 달 1일), 형식이 다르면 ValueError"""
+    if not MONTH_PATTERN.fullmatch(month):
+        raise ValueError(f"월은 YYYY-MM 형식이어야 합니다: {month}")
+    first = datetime.strptime(month, '%Y-%m')
+    next_month = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first.strftime('%Y-%m-%d'), next_month.strftime('%Y-%m-%d')
+
+@app.route('/voc/model/<model_name>')
+def show_model_vocs(model_name):
+    """모델별 VOC 목록 페이지 (목록은 /api/voc/model/<model_name>/list 에서 페이지 단위로 로드)"""
     return render_template('voc_model_list.html', 
-                          vocs=df.to_dict('records'), 
                           model_name=model_name)
 
+@app.route('/api/voc/model/<model_name>/list')
+def list_model_vocs(model_name):
+    """
+    모델별 VOC 목록 (키셋 페이지)
+    - columns: 반환할 컬럼 (쉼표 구분, 선택)
+    - order: created_date 기준 desc(기본) / asc
+    - limit + cursor: 응답의 next_cursor를 그대로 전달하면 다음 페이지
+    """
+    try:
+        columns, order, limit, cursor = parse_voc_list_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        conn = get_db()
+        rows, next_cursor = fetch_voc_page(conn, "model_name = ?", [model_name],
+                                           columns, order, limit, cursor)
+        return jsonify({'vocs': rows, 'next_cursor': next_cursor})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/voc/monthly/<month>')
 def show_monthly_vocs(month):
     """월별 VOC 목록 페이지"""
-    conn = sqlite3.connect('voc_data.db')
+    # month는 페이지 스크립트의 API 주소에도 들어가므로 YYYY-MM만 허용
+    try:
+        month_bounds(month)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    conn = get_db()
     
     # 월별 모델별 VOC 건수 조회
     query = """
         SELECT model_name, COUNT(*) as count
         FROM internal_voc
-        WHERE strftime('%Y-%m', created_date) = ?
+        WHERE created_month = ?
         GROUP BY model_name
         ORDER BY count DESC
     """
@@ -65,7 +195,7 @@ def show_monthly_vocs(month):
         query = """
             SELECT model_name, COUNT(*) as count
             FROM internal_voc
-            WHERE strftime('%Y-%m', created_date) = ?
+            WHERE created_month = ?
             GROUP BY model_name
             ORDER BY count DESC
             LIMIT 5
@@ -84,7 +214,7 @@ def show_monthly_vocs(month):
     query_prev = """
         SELECT model_name, COUNT(*) as count
         FROM internal_voc
-        WHERE strftime('%Y-%m', created_date) = ?
+        WHERE created_month = ?
         GROUP BY model_name
     """
     df_prev = pd.read_sql_query(query_prev, conn, params=(prev_month,))
@@ -96,23 +226,40 @@ def show_monthly_vocs(month):
     total_count = df['count'].sum()
     df['percentage'] = df.apply(lambda row: round((row['count'] / total_count) * 100, 1) if total_count > 0 else 0.0, axis=1)
     
-    # 월별 VOC 조회 (모델별로 그룹화)
-    query = """
-        SELECT case_code, model_name, cause, solution, created_date, title, problem
-        FROM internal_voc
-        WHERE strftime('%Y-%m', created_date) = ?
-        ORDER BY model_name, created_date DESC
-    """
-    df_vocs = pd.read_sql_query(query, conn, params=(month,))
-    
-    conn.close()
-    
+    # VOC 목록은 /api/voc/monthly/<month>/list 에서 페이지 단위로 로드
     return render_template('voc_monthly_list.html',
-                          vocs=df_vocs.to_dict('records'),
                           model_stats=df.to_dict('records'),
                           month=month,
                           consecutive_models=list(consecutive_models))
 
+@app.route('/api/voc/monthly/<month>/list')
+def list_monthly_vocs(month):
+    """
+    월별 VOC 목록 (키셋 페이지)
+    - model_name: 특정 모델만 (선택)
+    - columns / order / limit / cursor: 모델별 목록과 동일
+    """
+    try:
+        columns, order, limit, cursor = parse_voc_list_args()
+        start, end = month_bounds(month)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        # created_month 대신 날짜 범위 → (created_date, ...) 인덱스 순서대로 읽음
+        where = "created_date >= ? AND created_date < ?"
+        params = [start, end]
+        model_name = request.args.get('model_name')
+        if model_name:
+            where += " AND model_name = ?"
+            params.append(model_name)
+        
+        conn = get_db()
+        rows, next_cursor = fetch_voc_page(conn, where, params, columns, order, limit, cursor)
+        return jsonify({'vocs': rows, 'next_cursor': next_cursor})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 def calculate_growth_rate(model_name, current_count, df_prev):
     """전달대비 증가율 계산"""
     prev_row = df_prev[df_prev['model_name'] == model_name]
@@ -125,59 +272,66 @@ def calculate_growth_rate(model_name, current_count, df_prev):
 
 @app.route('/api/voc/model/<model_name>/export')
 def export_model_vocs(model_name):
-    """모델별 VOC 엑셀 다운로드"""
+    """
+    모델별 VOC 다운로드
+    - format: xlsx(기본) / csv / parquet
+    - columns: 내보낼 컬럼 (쉼표 구분, 선택)
+    """
     try:
-        conn = sqlite3.connect('voc_data.db')
+        try:
+            export_format = parse_export_format(request.args.get('format'))
+            columns = parse_export_columns(request.args.get('columns'), VOC_LIST_COLUMNS,
+                                           VOC_LIST_DEFAULT_COLUMNS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        query = """
-            SELECT case_code, model_name, cause, solution, created_date, title, problem
+        conn = get_db()
+        
+        query = f"""
+            SELECT {', '.join(columns)}
             FROM internal_voc
             WHERE model_name = ?
             ORDER BY created_date DESC
         """
-        df = pd.read_sql_query(query, conn, params=(model_name,))
-        
-        conn.close()
-        
-        # 엑셀 파일 생성
-        filename = f"voc_{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        df.to_excel(filepath, index=False)
+        version = export_data_version(conn)
+        key = None if version is None else export_store_key(
+            'internal_voc/model', {'model_name': model_name}, columns, export_format, version)
         
-        # 파일 존재 여부 확인
-        if os.path.exists(filepath):
-            return send_file(filepath, as_attachment=True, download_name=filename)
-        else:
-            return jsonify({'error': '파일 생성 실패'}), 500
+        filename = f"voc_{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return stored_export_response(EXPORT_STORE_FOLDER, key, export_format, columns,
+                                      lambda: conn.execute(query, (model_name,)), filename)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/voc/monthly/<month>/export')
 def export_monthly_vocs(month):
-    """월별 VOC 엑셀 다운로드"""
+    """
+    월별 VOC 다운로드
+    - format / columns: 모델별 다운로드와 동일
+    """
     try:
-        conn = sqlite3.connect('voc_data.db')
+        try:
+            export_format = parse_export_format(request.args.get('format'))
+            columns = parse_export_columns(request.args.get('columns'), VOC_LIST_COLUMNS,
+                                           VOC_LIST_DEFAULT_COLUMNS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        query = """
-            SELECT case_code, model_name, cause, solution, created_date, title, problem
+        conn = get_db()
+        
+        query = f"""
+            SELECT {', '.join(columns)}
             FROM internal_voc
-            WHERE strftime('%Y-%m', created_date) = ?
+            WHERE created_month = ?
             ORDER BY model_name, created_date DESC
         """
-        df = pd.read_sql_query(query, conn, params=(month,))
-        
-        conn.close()
+        version = export_data_version(conn)
+        key = None if version is None else export_store_key(
+            'internal_voc/monthly', {'created_month': month}, columns, export_format, version)
         
-        # 엑셀 파일 생성
-        filename = f"voc_monthly_{month}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        df.to_excel(filepath, index=False)
-        
-        # 파일 존재 여부 확인
-        if os.path.exists(filepath):
-            return send_file(filepath, as_attachment=True, download_name=filename)
-        else:
-            return jsonify({'error': '파일 생성 실패'}), 500
+        filename = f"voc_monthly_{month}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return stored_export_response(EXPORT_STORE_FOLDER, key, export_format, columns,
+                                      lambda: conn.execute(query, (month,)), filename)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 